@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from analytics.related import build_related_books, np
+
+
+class Command(BaseCommand):
+    """Django command to build the related books from the borrowing history."""
+
+    help = (
+        "Update the related books served by /api/books/<id>/related/ for books "
+        "borrowed since the last build."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the related books of every book.",
+        )
+
+    def handle(self, *args, **options):
+        if np is None:
+            self.stderr.write("numpy and scipy aren't installed, building slowly.")
+
+        build = build_related_books(full=options["full"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated the related books of {build.books} books "
+                f"in {build.duration_ms / 1000:.1f}s."
+            )
+        )
@@ -0,0 +1,31 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from analytics.rollup import first_activity_date, refresh_rollup
+
+
+class Command(BaseCommand):
+    """Django command to refresh the daily borrowing rollup."""
+
+    help = "Incrementally refresh the daily borrowing rollup used by /api/analytics/."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--since",
+            type=date.fromisoformat,
+            help="Recompute from this date (YYYY-MM-DD) instead of the last rolled-up day.",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Rebuild the whole rollup from the first borrowing.",
+        )
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        if options["full"]:
+            since = first_activity_date()
+
+        rows = refresh_rollup(since)
+        self.stdout.write(self.style.SUCCESS(f"Wrote {rows} rollup rows."))
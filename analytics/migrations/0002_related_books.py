@@ -0,0 +1,84 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0001_initial"),
+        ("books", "0003_branch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RelatedBooksBuild",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("full", models.BooleanField(default=False)),
+                (
+                    "last_borrowing_id",
+                    models.PositiveBigIntegerField(
+                        help_text="Borrowings up to this id are included."
+                    ),
+                ),
+                (
+                    "books",
+                    models.PositiveIntegerField(default=0, help_text="Books updated."),
+                ),
+                ("duration_ms", models.FloatField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="RelatedBook",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.FloatField()),
+                (
+                    "readers",
+                    models.PositiveIntegerField(help_text="Readers of both books."),
+                ),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="books.book",
+                    ),
+                ),
+                (
+                    "related",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="books.book",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["book", "-score"], name="relatedbook_book_score_idx"
+                    )
+                ],
+            },
+        ),
+    ]
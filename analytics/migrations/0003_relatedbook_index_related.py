@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("analytics", "0002_related_books"),
+        ("books", "0003_branch"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="relatedbook",
+            name="relatedbook_book_score_idx",
+        ),
+        migrations.AddIndex(
+            model_name="relatedbook",
+            index=models.Index(
+                fields=["book", "-score", "related"], name="relatedbook_book_score_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import models
+
+from books.models import Book
+
+
+class DailyBorrowingRollup(models.Model):
+    """Borrowing activity of one book on one day, kept by `refresh_analytics`."""
+
+    date = models.DateField()
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="daily_rollups"
+    )
+    borrowed = models.PositiveIntegerField(default=0)
+    returned = models.PositiveIntegerField(default=0)
+    returned_late = models.PositiveIntegerField(default=0)
+    loan_days = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "book"], name="unique_daily_rollup_per_book"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.book} on {self.date}"
+
+
+class RelatedBook(models.Model):
+    """A book often borrowed by the readers of another, kept by `build_related_books`."""
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+")
+    related = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="+")
+    # Readers of both books over the geometric mean of their readers (cosine)
+    score = models.FloatField()
+    readers = models.PositiveIntegerField(help_text="Readers of both books.")
+
+    class Meta:
+        indexes = [
+            # A book's neighbours in score order are one index range
+            models.Index(
+                fields=["book", "-score", "related"],
+                name="relatedbook_book_score_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.related} for {self.book}"
+
+
+class RelatedBooksBuild(models.Model):
+    """One build of the related books, the last one is the incremental watermark."""
+
+    started_at = models.DateTimeField(auto_now_add=True)
+    full = models.BooleanField(default=False)
+    last_borrowing_id = models.PositiveBigIntegerField(
+        help_text="Borrowings up to this id are included."
+    )
+    books = models.PositiveIntegerField(default=0, help_text="Books updated.")
+    duration_ms = models.FloatField(default=0)
+
+    def __str__(self):
+        return f"Related books build at {self.started_at}"
@@ -0,0 +1,184 @@
+import math
+import time
+from collections import Counter, defaultdict
+from itertools import chain, islice
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+
+from analytics.models import RelatedBook, RelatedBooksBuild
+from borrowings.models import ArchivedBorrowing, Borrowing
+
+try:
+    import numpy as np
+    from scipy import sparse
+except ImportError:  # numpy and scipy are optional, without them builds are slower
+    np = sparse = None
+
+
+def borrowed_pairs():
+    """(user_id, book_id) of every hot and archived borrowing, with repeats."""
+    return chain.from_iterable(
+        model.objects.order_by().values_list("user_id", "book_id").iterator(10000)
+        for model in (Borrowing, ArchivedBorrowing)
+    )
+
+
+def top_related(pairs, book_ids=None, limit=20, min_readers=2):
+    """
+    Yield (book_id, [(related_id, score, readers), ...]) for the given books,
+    or all borrowed ones, best first. Readers counts users who borrowed both
+    books, the score divides it by the geometric mean of both books' readers.
+    """
+    readers_of = defaultdict(set)
+    books_of = defaultdict(set)
+    for user_id, book_id in pairs:
+        readers_of[book_id].add(user_id)
+        books_of[user_id].add(book_id)
+
+    targets = readers_of if book_ids is None else set(book_ids) & readers_of.keys()
+    for book_id in sorted(targets):
+        together = Counter()
+        for user_id in readers_of[book_id]:
+            together.update(books_of[user_id])
+        del together[book_id]
+
+        related = [
+            (
+                other,
+                count / math.sqrt(len(readers_of[book_id]) * len(readers_of[other])),
+                count,
+            )
+            for other, count in together.items()
+            if count >= min_readers
+        ]
+        related.sort(key=lambda item: (-item[1], item[0]))
+        yield book_id, related[:limit]
+
+
+def top_related_sparse(pairs, book_ids=None, limit=20, min_readers=2, chunk=500):
+    """
+    top_related computed with sparse matrices: the readers x books matrix
+    times its transpose gives the readers in common of every book pair, it
+    is multiplied `chunk` books at a time to bound memory.
+    """
+    flat = np.fromiter(chain.from_iterable(pairs), dtype=np.int64)
+    users, books = flat[0::2], flat[1::2]
+    book_index, columns = np.unique(books, return_inverse=True)
+    user_index, rows = np.unique(users, return_inverse=True)
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.int32), (rows, columns)),
+        shape=(len(user_index), len(book_index)),
+    )
+    matrix.data[:] = 1  # repeated borrowings were summed, a reader counts once
+    readers = np.asarray(matrix.sum(axis=0)).ravel().astype(np.float64)
+    by_book = matrix.T.tocsr()
+
+    if book_ids is None:
+        targets = np.arange(len(book_index))
+    else:
+        wanted = np.asarray(sorted(book_ids), dtype=np.int64)
+        positions = np.searchsorted(book_index, wanted)
+        found = positions < len(book_index)
+        found[found] = book_index[positions[found]] == wanted[found]
+        targets = positions[found]
+
+    for start in range(0, len(targets), chunk):
+        block = targets[start : start + chunk]
+        together = (by_book[block] @ matrix).tocsr()
+        for row, book in enumerate(block):
+            span = slice(together.indptr[row], together.indptr[row + 1])
+            others, counts = together.indices[span], together.data[span]
+            keep = (others != book) & (counts >= min_readers)
+            others, counts = others[keep], counts[keep]
+            scores = counts / np.sqrt(readers[book] * readers[others])
+            if len(scores) > limit:
+                # Keep every book tied with the limit-th score, ids break the ties
+                threshold = -np.partition(-scores, limit - 1)[limit - 1]
+                best = scores >= threshold
+                others, counts, scores = others[best], counts[best], scores[best]
+            order = np.lexsort((book_index[others], -scores))[:limit]
+            yield int(book_index[book]), [
+                (int(book_index[other]), float(score), int(count))
+                for other, score, count in zip(
+                    others[order], scores[order], counts[order]
+                )
+            ]
+
+
+def changed_books(after_id):
+    """Books borrowed by the readers who borrowed something after `after_id`."""
+    readers = Borrowing.objects.filter(id__gt=after_id).values("user_id")
+    return set(
+        chain.from_iterable(
+            model.objects.filter(user_id__in=readers)
+            .order_by()
+            .values_list("book_id", flat=True)
+            .distinct()
+            for model in (Borrowing, ArchivedBorrowing)
+        )
+    )
+
+
+def save_related(results, batch_size=1000):
+    """Replace the stored neighbours of each computed book, return the count."""
+    saved = 0
+    results = iter(results)
+    while batch := list(islice(results, batch_size)):
+        with transaction.atomic():
+            RelatedBook.objects.filter(
+                book_id__in=[book_id for book_id, _ in batch]
+            ).delete()
+            RelatedBook.objects.bulk_create(
+                [
+                    RelatedBook(
+                        book_id=book_id,
+                        related_id=related_id,
+                        score=round(score, 6),
+                        readers=readers,
+                    )
+                    for book_id, related in batch
+                    for related_id, score, readers in related
+                ],
+                batch_size=5000,
+            )
+        saved += len(batch)
+    return saved
+
+
+def build_related_books(full=False):
+    """
+    Recompute the related books of the books whose co-borrowings changed
+    since the last build, or of every book. Borrowings committed late with
+    a lower id than the watermark wait for the next full build. Return the
+    build.
+    """
+    start = time.perf_counter()
+    last = RelatedBooksBuild.objects.order_by("-id").first()
+    watermark = Borrowing.objects.aggregate(last=Max("id"))["last"] or 0
+    full = full or last is None
+
+    book_ids = None
+    if not full:
+        book_ids = changed_books(last.last_borrowing_id)
+
+    books = 0
+    if full or book_ids:
+        compute = top_related if np is None else top_related_sparse
+        books = save_related(
+            compute(
+                borrowed_pairs(),
+                book_ids,
+                limit=settings.RELATED_BOOKS_LIMIT,
+                min_readers=settings.RELATED_BOOKS_MIN_READERS,
+            )
+        )
+
+    return RelatedBooksBuild.objects.create(
+        full=full,
+        last_borrowing_id=max(watermark, last.last_borrowing_id if last else 0),
+        books=books,
+        duration_ms=round((time.perf_counter() - start) * 1000, 2),
+    )
@@ -0,0 +1,98 @@
+import time
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Min,
+    Max,
+    Q,
+    Sum,
+)
+
+from analytics.models import DailyBorrowingRollup
+from borrowings.models import ArchivedBorrowing, Borrowing
+
+LOAN_DURATION = ExpressionWrapper(
+    F("actual_return_date") - F("borrow_date"), output_field=DurationField()
+)
+
+# Changes on every refresh, cached dashboards are keyed by it
+ROLLUP_VERSION_KEY = "analytics:rollup-version"
+
+
+def rollup_version():
+    return cache.get(ROLLUP_VERSION_KEY, 0)
+
+
+def first_activity_date():
+    """Return the earliest borrow date over the hot and archived borrowings."""
+    dates = [
+        model.objects.aggregate(first=Min("borrow_date"))["first"]
+        for model in (Borrowing, ArchivedBorrowing)
+    ]
+    dates = [value for value in dates if value is not None]
+    return min(dates) if dates else None
+
+
+def refresh_rollup(since=None):
+    """
+    Recompute the daily rollup from `since` on. By default the refresh is
+    incremental: it starts at the last rolled-up day, which may have been
+    partial. Cached dashboards are invalidated. Return the number of rollup
+    rows written.
+    """
+    if since is None:
+        since = DailyBorrowingRollup.objects.aggregate(last=Max("date"))["last"]
+    if since is None:
+        since = first_activity_date()
+    if since is None:
+        return 0
+
+    rows = defaultdict(
+        lambda: {"borrowed": 0, "returned": 0, "returned_late": 0, "loan_days": 0}
+    )
+
+    for model in (Borrowing, ArchivedBorrowing):
+        borrowed = (
+            model.objects.filter(borrow_date__gte=since)
+            .values("borrow_date", "book_id")
+            .annotate(count=Count("id"))
+        )
+        for row in borrowed:
+            rows[row["borrow_date"], row["book_id"]]["borrowed"] += row["count"]
+
+        returned = (
+            model.objects.filter(actual_return_date__gte=since)
+            .values("actual_return_date", "book_id")
+            .annotate(
+                count=Count("id"),
+                late=Count(
+                    "id", filter=Q(actual_return_date__gt=F("expected_return_date"))
+                ),
+                duration=Sum(LOAN_DURATION),
+            )
+        )
+        for row in returned:
+            rollup = rows[row["actual_return_date"], row["book_id"]]
+            rollup["returned"] += row["count"]
+            rollup["returned_late"] += row["late"]
+            rollup["loan_days"] += (row["duration"] or timedelta()).days
+
+    with transaction.atomic():
+        DailyBorrowingRollup.objects.filter(date__gte=since).delete()
+        DailyBorrowingRollup.objects.bulk_create(
+            [
+                DailyBorrowingRollup(date=day, book_id=book_id, **values)
+                for (day, book_id), values in rows.items()
+            ],
+            batch_size=1000,
+        )
+    cache.set(ROLLUP_VERSION_KEY, time.time_ns(), None)
+
+    return len(rows)
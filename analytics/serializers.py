@@ -0,0 +1,35 @@
+from rest_framework import serializers
+
+
+class AnalyticsQuerySerializer(serializers.Serializer):
+    """Query parameters shared by the analytics endpoints."""
+
+    days = serializers.IntegerField(min_value=1, max_value=3650, default=30)
+    limit = serializers.IntegerField(min_value=1, max_value=100, default=10)
+
+
+class TopBookSerializer(serializers.Serializer):
+    book_id = serializers.IntegerField()
+    title = serializers.CharField(source="book__title")
+    author = serializers.CharField(source="book__author")
+    borrowed = serializers.IntegerField()
+
+
+class LoanDurationSerializer(serializers.Serializer):
+    returned = serializers.IntegerField()
+    average_loan_days = serializers.FloatField(allow_null=True)
+
+
+class OverdueRateSerializer(serializers.Serializer):
+    returned = serializers.IntegerField()
+    returned_late = serializers.IntegerField()
+    late_return_rate = serializers.FloatField(allow_null=True)
+    active = serializers.IntegerField()
+    overdue = serializers.IntegerField()
+    overdue_rate = serializers.FloatField(allow_null=True)
+
+
+class DailyVolumeSerializer(serializers.Serializer):
+    date = serializers.DateField()
+    borrowed = serializers.IntegerField()
+    returned = serializers.IntegerField()
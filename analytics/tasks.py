@@ -0,0 +1,23 @@
+from analytics.related import build_related_books
+from analytics.rollup import refresh_rollup
+from analytics.views import warm_dashboards
+from tasks.schedule import periodic
+
+
+@periodic("*/30 * * * *")
+def refresh_analytics():
+    """Refresh the daily rollup, then cache the default dashboards."""
+    refresh_rollup()
+    warm_dashboards()
+
+
+@periodic("45 * * * *")
+def refresh_related_books():
+    """Update the related books of books borrowed since the last build."""
+    build_related_books()
+
+
+@periodic("0 4 * * 0")
+def rebuild_related_books():
+    """Rebuild every book's related books, scores drift between full builds."""
+    build_related_books(full=True)
@@ -0,0 +1,163 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from analytics.models import DailyBorrowingRollup
+from analytics.rollup import refresh_rollup
+from analytics.views import warm_dashboards
+from books.models import Book
+from borrowings.models import Borrowing
+
+TODAY = date.today()
+
+
+def sample_borrowing(user, book, borrowed_days_ago, loan_days=7, returned_after=None):
+    """Create a borrowing in the past, returned after `returned_after` days."""
+    borrowing = Borrowing.objects.create(
+        user=user, book=book, expected_return_date=TODAY + timedelta(days=1)
+    )
+    borrow_date = TODAY - timedelta(days=borrowed_days_ago)
+    Borrowing.objects.filter(pk=borrowing.pk).update(
+        borrow_date=borrow_date,
+        expected_return_date=borrow_date + timedelta(days=loan_days),
+        actual_return_date=(
+            None if returned_after is None else borrow_date + timedelta(returned_after)
+        ),
+    )
+    return borrowing
+
+
+class AnalyticsTestCase(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@admin.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+        self.popular = Book.objects.create(title="Popular", author="A", inventory=10)
+        self.rare = Book.objects.create(title="Rare", author="B", inventory=10)
+
+        # Three returns of the popular book: on time, on time, late
+        sample_borrowing(self.admin, self.popular, 10, returned_after=4)
+        sample_borrowing(self.admin, self.popular, 10, returned_after=6)
+        sample_borrowing(self.admin, self.popular, 9, returned_after=8)
+        # One active, overdue borrowing of the rare book
+        sample_borrowing(self.admin, self.rare, 9)
+        refresh_rollup()
+
+
+class RollupTests(AnalyticsTestCase):
+    def test_rollup_counts(self):
+        """Test that the rollup aggregates borrowings per book and day."""
+        rollup = DailyBorrowingRollup.objects.filter(book=self.popular)
+
+        self.assertEqual(sum(row.borrowed for row in rollup), 3)
+        self.assertEqual(sum(row.returned for row in rollup), 3)
+        self.assertEqual(sum(row.returned_late for row in rollup), 1)
+        self.assertEqual(sum(row.loan_days for row in rollup), 4 + 6 + 8)
+
+    def test_incremental_refresh_is_idempotent(self):
+        """Test that refreshing again does not count borrowings twice."""
+        refresh_rollup()
+        call_command("refresh_analytics", stdout=StringIO())
+
+        rollup = DailyBorrowingRollup.objects.filter(book=self.popular)
+        self.assertEqual(sum(row.borrowed for row in rollup), 3)
+
+    def test_incremental_refresh_picks_up_new_borrowings(self):
+        """Test that new activity since the last rolled-up day is added."""
+        sample_borrowing(self.admin, self.rare, 0)
+
+        refresh_rollup()
+
+        rollup = DailyBorrowingRollup.objects.filter(book=self.rare)
+        self.assertEqual(sum(row.borrowed for row in rollup), 2)
+
+
+class AnalyticsApiTests(AnalyticsTestCase):
+    def test_top_books(self):
+        """Test that books are ranked by borrowings."""
+        res = self.client.get(reverse("analytics:top-books"), {"days": 30})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(book["title"], book["borrowed"]) for book in res.data],
+            [("Popular", 3), ("Rare", 1)],
+        )
+
+    def test_loan_duration(self):
+        """Test the average duration of returned loans."""
+        res = self.client.get(reverse("analytics:loan-duration"))
+
+        self.assertEqual(res.data, {"returned": 3, "average_loan_days": 6.0})
+
+    def test_overdue_rate(self):
+        """Test late return and overdue rates."""
+        res = self.client.get(reverse("analytics:overdue-rate"))
+
+        self.assertEqual(res.data["late_return_rate"], round(1 / 3, 4))
+        self.assertEqual(res.data["active"], 1)
+        self.assertEqual(res.data["overdue_rate"], 1.0)
+
+    def test_daily_volume(self):
+        """Test borrowings and returns per day."""
+        res = self.client.get(reverse("analytics:daily-volume"), {"days": 30})
+
+        self.assertEqual(sum(day["borrowed"] for day in res.data), 4)
+        self.assertEqual(sum(day["returned"] for day in res.data), 3)
+
+    def test_invalid_days_rejected(self):
+        """Test that query parameters are validated."""
+        res = self.client.get(reverse("analytics:top-books"), {"days": 0})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_admin_only(self):
+        """Test that regular users can't see analytics."""
+        user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(user)
+
+        res = self.client.get(reverse("analytics:top-books"))
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class DashboardCacheTests(AnalyticsTestCase):
+    def test_cached_until_refresh(self):
+        """Test that a dashboard is cached until the rollup is refreshed."""
+        url = reverse("analytics:loan-duration")
+        self.client.get(url)
+        sample_borrowing(self.admin, self.rare, 2, returned_after=2)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(url)
+        self.assertEqual(res.data["returned"], 3)
+
+        refresh_rollup()
+        res = self.client.get(url)
+        self.assertEqual(res.data["returned"], 4)
+
+    def test_warm_dashboards(self):
+        """Test that warming caches the dashboards for the default parameters."""
+        warm_dashboards()
+
+        with self.assertNumQueries(0):
+            res = self.client.get(reverse("analytics:top-books"))
+        self.assertEqual(len(res.data), 2)
+
+    def test_overdue_counts_stay_live(self):
+        """Test that active borrowings are counted on every request."""
+        url = reverse("analytics:overdue-rate")
+        self.client.get(url)
+        sample_borrowing(self.admin, self.popular, 1)
+
+        res = self.client.get(url)
+
+        self.assertEqual(res.data["active"], 2)
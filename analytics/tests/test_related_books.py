@@ -0,0 +1,162 @@
+from datetime import date, timedelta
+from io import StringIO
+from unittest import skipIf
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from analytics.models import RelatedBook, RelatedBooksBuild
+from analytics.related import (
+    borrowed_pairs,
+    build_related_books,
+    np,
+    top_related,
+    top_related_sparse,
+)
+from books.models import Book
+from borrowings.models import Borrowing
+
+
+def related_url(book_id):
+    return reverse("books:book-related", args=[book_id])
+
+
+class RelatedBooksTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.books = {
+            title: Book.objects.create(title=title, author="A", inventory=10)
+            for title in "ABCD"
+        }
+        self.users = [
+            get_user_model().objects.create_user(f"reader{index}@test.com", "pass")
+            for index in range(4)
+        ]
+        # A and B share two readers, A and C too, B and C only one
+        for user, titles in zip(self.users, ("AB", "ABC", "AC", "D")):
+            for title in titles:
+                self.borrow(user, title)
+
+    def borrow(self, user, title):
+        Borrowing.objects.create(
+            user=user,
+            book=self.books[title],
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+
+    def related_titles(self, title):
+        res = self.client.get(related_url(self.books[title].id))
+        return [book["title"] for book in res.data]
+
+    def test_related_books(self):
+        """Test that books sharing enough readers are related, best first."""
+        build_related_books()
+
+        res = self.client.get(related_url(self.books["A"].id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([book["title"] for book in res.data], ["B", "C"])
+        self.assertEqual(res.data[0]["readers"], 2)
+        self.assertAlmostEqual(res.data[0]["score"], 2 / 6**0.5, places=5)
+        self.assertEqual(self.related_titles("B"), ["A"])
+        self.assertEqual(self.related_titles("D"), [])
+
+    def test_related_books_one_query(self):
+        """Test that the related books are read with a single query."""
+        build_related_books()
+
+        with self.assertNumQueries(1):
+            self.client.get(related_url(self.books["A"].id))
+
+    def test_related_books_limit(self):
+        """Test that ?limit= caps the number of related books."""
+        build_related_books()
+
+        res = self.client.get(related_url(self.books["A"].id), {"limit": 1})
+
+        self.assertEqual(len(res.data), 1)
+
+    def test_related_books_limit_ties(self):
+        """Test that books tied at the limit are picked by id."""
+        book, *others = self.books.values()
+        for other in reversed(others):
+            RelatedBook.objects.create(book=book, related=other, score=0.5, readers=1)
+
+        res = self.client.get(related_url(book.id), {"limit": 2})
+
+        self.assertEqual([row["id"] for row in res.data], [others[0].id, others[1].id])
+
+    def test_unknown_book(self):
+        """Test that an unknown book is a 404."""
+        res = self.client.get(related_url(999999))
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_incremental_build(self):
+        """Test that a build only updates books touched by new borrowings."""
+        build_related_books()
+        self.borrow(self.users[2], "B")  # B and C now share two readers
+
+        build = build_related_books()
+
+        self.assertFalse(build.full)
+        self.assertEqual(build.books, 3)  # the reader's books A, B and C
+        self.assertEqual(self.related_titles("B"), ["A", "C"])
+        self.assertEqual(build_related_books().books, 0)
+        self.assertEqual(RelatedBooksBuild.objects.count(), 3)
+
+    @patch("analytics.related.np", None)
+    def test_build_without_numpy(self):
+        """Test that the pure Python build is used without numpy."""
+        build_related_books()
+
+        self.assertEqual(self.related_titles("A"), ["B", "C"])
+
+    @skipIf(np is None, "numpy and scipy are not installed")
+    def test_sparse_build_matches(self):
+        """Test that the sparse matrix build gives the pure Python results."""
+        pairs = list(borrowed_pairs())
+        book_ids = [self.books["A"].id, self.books["C"].id, 999999]
+
+        for ids in (None, book_ids):
+            expected = list(top_related(pairs, ids, min_readers=1))
+            actual = list(top_related_sparse(pairs, ids, min_readers=1))
+            self.assertEqual(
+                [(book, [other for other, _, _ in rows]) for book, rows in actual],
+                [(book, [other for other, _, _ in rows]) for book, rows in expected],
+            )
+            for (_, rows), (_, expected_rows) in zip(actual, expected):
+                for (_, score, _), (_, expected_score, _) in zip(rows, expected_rows):
+                    self.assertAlmostEqual(score, expected_score)
+
+    def test_command(self):
+        """Test that the command reports the updated books."""
+        out = StringIO()
+
+        call_command("build_related_books", "--full", stdout=out, stderr=StringIO())
+
+        self.assertIn("Updated the related books of 4 books", out.getvalue())
+
+
+class TopRelatedTiesTests(SimpleTestCase):
+    # One reader borrowed every book, so all of them are related with score 1
+    pairs = [(1, book_id) for book_id in (50, 40, 30, 20, 10, 60)]
+
+    def assert_lowest_ids_kept(self, compute):
+        related = dict(compute(self.pairs, [60], limit=2, min_readers=1))
+
+        self.assertEqual([other for other, _, _ in related[60]], [10, 20])
+
+    def test_ties_broken_by_id(self):
+        """Test that books tied at the limit are kept by lowest id."""
+        self.assert_lowest_ids_kept(top_related)
+
+    @skipIf(np is None, "numpy and scipy are not installed")
+    def test_sparse_ties_broken_by_id(self):
+        """Test that the sparse build breaks ties at the limit by id too."""
+        self.assert_lowest_ids_kept(top_related_sparse)
@@ -0,0 +1,17 @@
+from django.urls import path
+
+from analytics.views import (
+    TopBooksView,
+    LoanDurationView,
+    OverdueRateView,
+    DailyVolumeView,
+)
+
+urlpatterns = [
+    path("top-books/", TopBooksView.as_view(), name="top-books"),
+    path("loan-duration/", LoanDurationView.as_view(), name="loan-duration"),
+    path("overdue-rate/", OverdueRateView.as_view(), name="overdue-rate"),
+    path("daily-volume/", DailyVolumeView.as_view(), name="daily-volume"),
+]
+
+app_name = "analytics"
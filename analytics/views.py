@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+
+from analytics.models import DailyBorrowingRollup
+from analytics.rollup import rollup_version
+from analytics.serializers import (
+    AnalyticsQuerySerializer,
+    TopBookSerializer,
+    LoanDurationSerializer,
+    OverdueRateSerializer,
+    DailyVolumeSerializer,
+)
+from borrowings.models import Borrowing
+from utils.schema import extend_schema
+
+
+def ratio(part, whole):
+    return round(part / whole, 4) if whole else None
+
+
+class AnalyticsView(generics.GenericAPIView):
+    """
+    Base view for admin dashboards served from the daily rollup. Subclasses
+    implement `get_data`, whose result is cached until the rollup changes.
+    """
+
+    permission_classes = [permissions.IsAdminUser]
+    many = False
+
+    def get(self, request):
+        data = self.cached_data(self.get_params())
+        return Response(self.get_serializer(data, many=self.many).data)
+
+    def get_params(self):
+        params = AnalyticsQuerySerializer(data=self.request.query_params)
+        params.is_valid(raise_exception=True)
+        return params.validated_data
+
+    def get_rollup(self, days):
+        since = date.today() - timedelta(days=days - 1)
+        return DailyBorrowingRollup.objects.filter(date__gte=since)
+
+    def get_data(self, params):
+        raise NotImplementedError
+
+    def cached_data(self, params):
+        key = (
+            f"analytics:{rollup_version()}:{type(self).__name__}:"
+            f"{date.today()}:{params['days']}:{params['limit']}"
+        )
+        return cache.get_or_set(
+            key, lambda: self.get_data(params), settings.ANALYTICS_CACHE_SECONDS
+        )
+
+
+@extend_schema(parameters=[AnalyticsQuerySerializer])
+class TopBooksView(AnalyticsView):
+    """Most borrowed books over the last `days` days."""
+
+    serializer_class = TopBookSerializer
+    many = True
+
+    def get_data(self, params):
+        return list(
+            self.get_rollup(params["days"])
+            .values("book_id", "book__title", "book__author")
+            .annotate(borrowed=Sum("borrowed"))
+            .filter(borrowed__gt=0)
+            .order_by("-borrowed", "book_id")[: params["limit"]]
+        )
+
+
+@extend_schema(parameters=[AnalyticsQuerySerializer])
+class LoanDurationView(AnalyticsView):
+    """Average loan duration of borrowings returned in the last `days` days."""
+
+    serializer_class = LoanDurationSerializer
+
+    def get_data(self, params):
+        totals = self.get_rollup(params["days"]).aggregate(
+            returned=Sum("returned", default=0), loan_days=Sum("loan_days", default=0)
+        )
+        return {
+            "returned": totals["returned"],
+            "average_loan_days": ratio(totals["loan_days"], totals["returned"]),
+        }
+
+
+@extend_schema(parameters=[AnalyticsQuerySerializer])
+class OverdueRateView(AnalyticsView):
+    """Late returns over the last `days` days and currently overdue borrowings."""
+
+    serializer_class = OverdueRateSerializer
+
+    def get(self, request):
+        totals = self.cached_data(self.get_params())
+        # Active borrowings are the small hot set, counted live
+        active = Borrowing.objects.filter(actual_return_date__isnull=True).aggregate(
+            active=Count("id"),
+            overdue=Count("id", filter=Q(expected_return_date__lt=date.today())),
+        )
+        data = {
+            **totals,
+            **active,
+            "overdue_rate": ratio(active["overdue"], active["active"]),
+        }
+        return Response(self.get_serializer(data).data)
+
+    def get_data(self, params):
+        totals = self.get_rollup(params["days"]).aggregate(
+            returned=Sum("returned", default=0),
+            returned_late=Sum("returned_late", default=0),
+        )
+        return {
+            **totals,
+            "late_return_rate": ratio(totals["returned_late"], totals["returned"]),
+        }
+
+
+@extend_schema(parameters=[AnalyticsQuerySerializer])
+class DailyVolumeView(AnalyticsView):
+    """Borrowings and returns per day over the last `days` days."""
+
+    serializer_class = DailyVolumeSerializer
+    many = True
+
+    def get_data(self, params):
+        return list(
+            self.get_rollup(params["days"])
+            .values("date")
+            .annotate(borrowed=Sum("borrowed"), returned=Sum("returned"))
+            .order_by("date")
+        )
+
+
+DASHBOARDS = (TopBooksView, LoanDurationView, OverdueRateView, DailyVolumeView)
+
+
+def warm_dashboards():
+    """Cache every dashboard for the default query parameters."""
+    params = AnalyticsQuerySerializer(data={})
+    params.is_valid(raise_exception=True)
+    for view_class in DASHBOARDS:
+        view_class().cached_data(params.validated_data)
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from api_docs.schema import generate_schema, read_artifact, write_artifacts
+
+
+class Command(BaseCommand):
+    """Django command to build the stored OpenAPI schema artifact."""
+
+    help = "Generate the OpenAPI schema and store it with its compressed variants."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if the stored schema differs from the code instead of writing it.",
+        )
+
+    def handle(self, *args, **options):
+        content = generate_schema()
+
+        if options["check"]:
+            if read_artifact() != content:
+                raise CommandError(
+                    "The stored OpenAPI schema is out of date, "
+                    "run `python manage.py build_schema`."
+                )
+            self.stdout.write(self.style.SUCCESS("OpenAPI schema is up to date."))
+            return
+
+        for path in write_artifacts(content):
+            self.stdout.write(f"Wrote {path}")
+        self.stdout.write(self.style.SUCCESS("OpenAPI schema built."))
@@ -0,0 +1,89 @@
+import gzip
+import hashlib
+from pathlib import Path
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+SCHEMA_FILE = "openapi.json"
+
+# Content-Encoding -> suffix of the pre-compressed artifact
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+
+def generate_schema():
+    """Generate the OpenAPI schema of the API as JSON bytes."""
+    from drf_spectacular.renderers import OpenApiJsonRenderer
+    from drf_spectacular.settings import spectacular_settings
+
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS()
+    schema = generator.get_schema(request=None, public=True)
+    return OpenApiJsonRenderer().render(schema, renderer_context={})
+
+
+def compress(content):
+    """Return the pre-compressed variants of content by Content-Encoding."""
+    variants = {"gzip": gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(content, quality=11)
+    return variants
+
+
+def write_artifacts(content, directory=None):
+    """Store the schema and its compressed variants, return the written paths."""
+    directory = Path(directory or settings.API_SCHEMA_ARTIFACT_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    path = directory / SCHEMA_FILE
+    path.write_bytes(content)
+    paths = [path]
+    variants = compress(content)
+    for encoding, suffix in ENCODINGS.items():
+        variant = path.with_name(SCHEMA_FILE + suffix)
+        if encoding in variants:
+            variant.write_bytes(variants[encoding])
+            paths.append(variant)
+        else:
+            # Never leave a stale variant of an older schema behind
+            variant.unlink(missing_ok=True)
+    return paths
+
+
+def read_artifact(directory=None):
+    """Return the stored schema bytes, or None when it was never built."""
+    path = Path(directory or settings.API_SCHEMA_ARTIFACT_DIR) / SCHEMA_FILE
+    return path.read_bytes() if path.exists() else None
+
+
+class SchemaArtifact:
+    """The schema with its pre-compressed variants and their ETags."""
+
+    def __init__(self, content, variants=None):
+        self.digest = hashlib.sha256(content).hexdigest()[:32]
+        self.variants = {"identity": content, **(variants or compress(content))}
+
+    @classmethod
+    def load(cls):
+        """
+        Load the stored artifact, or generate it when it is missing.
+        In DEBUG the schema is always generated so it follows the code.
+        """
+        content = None if settings.DEBUG else read_artifact()
+        if content is None:
+            return cls(generate_schema())
+
+        directory = Path(settings.API_SCHEMA_ARTIFACT_DIR)
+        variants = {}
+        for encoding, suffix in ENCODINGS.items():
+            path = directory / (SCHEMA_FILE + suffix)
+            if path.exists():
+                variants[encoding] = path.read_bytes()
+        return cls(content, variants or None)
+
+    def etag(self, encoding):
+        suffix = "" if encoding == "identity" else f"-{encoding}"
+        return f'"{self.digest}{suffix}"'
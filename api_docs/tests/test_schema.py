@@ -0,0 +1,61 @@
+import gzip
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+
+from api_docs.schema import brotli, read_artifact
+
+SCHEMA_URL = reverse("schema")
+
+
+class StoredSchemaTests(TestCase):
+    def test_stored_schema_is_up_to_date(self):
+        """Test that the stored artifact matches the schema of the code."""
+        call_command("build_schema", "--check", stdout=StringIO())
+
+
+class CachedSchemaViewTests(TestCase):
+    def test_serves_stored_schema(self):
+        """Test that the schema is served from the artifact with an ETag."""
+        res = self.client.get(SCHEMA_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.content, read_artifact())
+        self.assertIn("ETag", res)
+        self.assertIn("Accept-Encoding", res["Vary"])
+
+    def test_serves_gzip_variant(self):
+        """Test that gzip clients get the pre-compressed artifact."""
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(res.content), read_artifact())
+
+    def test_prefers_brotli_variant(self):
+        """Test that brotli is preferred when the client accepts it."""
+        if brotli is None:
+            self.skipTest("brotli is not installed")
+
+        res = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip, br")
+
+        self.assertEqual(res["Content-Encoding"], "br")
+        self.assertEqual(brotli.decompress(res.content), read_artifact())
+
+    def test_not_modified_for_matching_etag(self):
+        """Test that a matching If-None-Match gets an empty 304."""
+        etag = self.client.get(SCHEMA_URL)["ETag"]
+
+        res = self.client.get(SCHEMA_URL, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(res.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(res.content, b"")
+
+    def test_etag_differs_per_encoding(self):
+        """Test that each encoding has its own ETag."""
+        identity = self.client.get(SCHEMA_URL)["ETag"]
+        gzipped = self.client.get(SCHEMA_URL, HTTP_ACCEPT_ENCODING="gzip")["ETag"]
+
+        self.assertNotEqual(identity, gzipped)
@@ -0,0 +1,58 @@
+import re
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.views import View
+
+from api_docs.schema import SchemaArtifact
+
+ACCEPT_ENCODING_RE = re.compile(r"\b(br|gzip)\b")
+
+
+class CachedSchemaView(View):
+    """Serve the OpenAPI schema from a pre-built, pre-compressed artifact."""
+
+    http_method_names = ["get", "head"]
+
+    # Loaded once per process, on the first request
+    artifact = None
+
+    @classmethod
+    def get_artifact(cls):
+        if cls.artifact is None:
+            cls.artifact = SchemaArtifact.load()
+        return cls.artifact
+
+    def get(self, request, *args, **kwargs):
+        artifact = self.get_artifact()
+        encoding = self.choose_encoding(request, artifact)
+        etag = artifact.etag(encoding)
+
+        if_none_match = request.headers.get("If-None-Match", "")
+        if etag in if_none_match or if_none_match.strip() == "*":
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(
+                artifact.variants[encoding],
+                content_type="application/vnd.oai.openapi+json",
+            )
+            response["Content-Disposition"] = 'inline; filename="openapi.json"'
+            if encoding != "identity":
+                response["Content-Encoding"] = encoding
+
+        response["ETag"] = etag
+        patch_vary_headers(response, ("Accept-Encoding",))
+        patch_cache_control(response, public=True, max_age=settings.API_SCHEMA_MAX_AGE)
+        return response
+
+    @staticmethod
+    def choose_encoding(request, artifact):
+        """Prefer brotli over gzip when the client accepts it and it was built."""
+        accepted = set(
+            ACCEPT_ENCODING_RE.findall(request.headers.get("Accept-Encoding", ""))
+        )
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in artifact.variants:
+                return encoding
+        return "identity"
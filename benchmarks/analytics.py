@@ -0,0 +1,66 @@
+"""
+Admin dashboard queries: raw scans of borrowings against the daily rollup.
+
+Run against a seeded database after `python manage.py refresh_analytics`:
+
+    python -m benchmarks.analytics --days 90 --iterations 20
+"""
+
+import argparse
+from datetime import date, timedelta
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.db.models import Count, F, Q, Sum  # noqa: E402
+
+from analytics.models import DailyBorrowingRollup  # noqa: E402
+from analytics.rollup import LOAN_DURATION  # noqa: E402
+from borrowings.models import Borrowing  # noqa: E402
+
+
+def raw_queries(since):
+    borrowed = Borrowing.objects.filter(borrow_date__gte=since)
+    returned = Borrowing.objects.filter(actual_return_date__gte=since)
+    list(borrowed.values("book_id").annotate(n=Count("id")).order_by("-n")[:10])
+    returned.aggregate(
+        n=Count("id"),
+        late=Count("id", filter=Q(actual_return_date__gt=F("expected_return_date"))),
+        duration=Sum(LOAN_DURATION),
+    )
+    list(borrowed.values("borrow_date").annotate(n=Count("id")).order_by("borrow_date"))
+
+
+def rollup_queries(since):
+    rollup = DailyBorrowingRollup.objects.filter(date__gte=since)
+    list(rollup.values("book_id").annotate(n=Sum("borrowed")).order_by("-n")[:10])
+    rollup.aggregate(
+        n=Sum("returned"), late=Sum("returned_late"), duration=Sum("loan_days")
+    )
+    list(
+        rollup.values("date")
+        .annotate(b=Sum("borrowed"), r=Sum("returned"))
+        .order_by("date")
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    since = date.today() - timedelta(days=args.days - 1)
+    print(
+        f"{Borrowing.objects.count()} borrowings, "
+        f"{DailyBorrowingRollup.objects.count()} rollup rows, last {args.days} days"
+    )
+    report(
+        "raw borrowings scan", measure(lambda: raw_queries(since), args.iterations, 2)
+    )
+    report("daily rollup", measure(lambda: rollup_queries(since), args.iterations, 2))
+
+
+if __name__ == "__main__":
+    main()
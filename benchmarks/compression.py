@@ -0,0 +1,68 @@
+"""
+Bandwidth and latency of compressing full-catalog responses.
+
+Renders a BookViewSet.list payload for N books and reports, per encoding,
+the compressed size, the compression time and the time to transfer it over
+a link of the given bandwidth:
+
+    python -m benchmarks.compression --books 5000 --mbps 20
+"""
+
+import argparse
+from decimal import Decimal
+
+from benchmarks.utils import measure, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from books.models import Book  # noqa: E402
+from books.serializers import BookSerializer  # noqa: E402
+from utils.compression import available_encodings, compress  # noqa: E402
+
+
+def catalog_payload(count):
+    books = [
+        Book(
+            id=index,
+            title=f"Book title number {index}",
+            author=f"Author {index % 500}",
+            cover="HARD" if index % 3 else "SOFT",
+            inventory=index % 20,
+            daily_fee=Decimal("1.50"),
+        )
+        for index in range(1, count + 1)
+    ]
+    return JSONRenderer().render(BookSerializer(books, many=True).data)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--books", type=int, default=5000)
+    parser.add_argument("--mbps", type=float, default=20.0)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    content = catalog_payload(args.books)
+    bytes_per_ms = args.mbps * 1_000_000 / 8 / 1000
+
+    print(f"{args.books} books, {len(content) / 1024:.1f} KiB, {args.mbps} Mbit/s")
+    print(
+        f"{'identity':<10} {len(content) / 1024:9.1f} KiB  compress    0.000 ms"
+        f"  transfer {len(content) / bytes_per_ms:9.3f} ms"
+    )
+    for encoding in available_encodings(settings.COMPRESSION_ENCODINGS):
+        level = settings.COMPRESSION_LEVELS[encoding]
+        compressed = compress(content, encoding, level)
+        timings = measure(lambda: compress(content, encoding, level), args.iterations)
+        print(
+            f"{encoding:<10} {len(compressed) / 1024:9.1f} KiB"
+            f"  compress {sorted(timings)[len(timings) // 2]:8.3f} ms"
+            f"  transfer {len(compressed) / bytes_per_ms:9.3f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Borrowing throughput when many requests borrow the same book at once.
+
+Threads borrow one popular book concurrently, once with the inventory
+counter (every borrowing locks the book row until it commits) and once with
+tracked copies (each borrowing locks a different copy row with SKIP LOCKED).
+The books, copies and borrowings are removed at the end. Needs Postgres:
+
+    python -m benchmarks.copy_allocation --threads 16 --borrows 50
+"""
+
+import argparse
+import threading
+import time
+from datetime import date, timedelta
+
+from benchmarks.utils import report, setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from books.models import Book, BookCopy  # noqa: E402
+from borrowings.models import Borrowing  # noqa: E402
+
+PREFIX = "benchmark-"
+
+
+def borrow_concurrently(book, user, threads, borrows):
+    """Run `borrows` borrowings in each thread, return timings and wall time."""
+    expected = date.today() + timedelta(days=7)
+    timings = []
+    start_together = threading.Barrier(threads)
+
+    def worker():
+        start_together.wait()
+        for _ in range(borrows):
+            start = time.perf_counter()
+            Borrowing.objects.create(
+                user=user, book=book, expected_return_date=expected
+            )
+            timings.append((time.perf_counter() - start) * 1000)
+        connection.close()
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return timings, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--borrows", type=int, default=50)
+    args = parser.parse_args()
+
+    total = args.threads * args.borrows
+    user, _ = get_user_model().objects.get_or_create(
+        email=f"{PREFIX}reader@example.com"
+    )
+    counter_book = Book.objects.create(title=f"{PREFIX}counter", inventory=total)
+    copies_book = Book.objects.create(
+        title=f"{PREFIX}copies", inventory=total, tracks_copies=True
+    )
+    BookCopy.objects.bulk_create(
+        BookCopy(book=copies_book, barcode=f"{PREFIX}{index}") for index in range(total)
+    )
+
+    try:
+        for label, book in (
+            ("inventory counter", counter_book),
+            ("tracked copies", copies_book),
+        ):
+            timings, elapsed = borrow_concurrently(
+                book, user, args.threads, args.borrows
+            )
+            report(label, timings)
+            print(f"{'':<32} {total / elapsed:8.0f} borrowings/s")
+    finally:
+        Book.objects.filter(title__startswith=PREFIX).delete()
+        user.delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Per-request cost of getting a database connection.
+
+Simulates the request cycle (connect, run a query, request_finished cleanup)
+with a new connection per request, a persistent connection and a psycopg pool.
+Uses the Postgres database configured in .env:
+
+    python -m benchmarks.db_connections --iterations 500
+"""
+
+import argparse
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.db import connections  # noqa: E402
+
+PROFILES = {
+    "new connection per request": {"CONN_MAX_AGE": 0},
+    "persistent connection": {"CONN_MAX_AGE": 60},
+    "psycopg pool": {
+        "CONN_MAX_AGE": 0,
+        "OPTIONS": {"pool": {"min_size": 1, "max_size": 1}},
+    },
+}
+
+
+def add_alias(alias, overrides):
+    base = {
+        key: value
+        for key, value in connections.settings["default"].items()
+        if key != "OPTIONS"
+    }
+    configured = connections.configure_settings({alias: {**base, **overrides}})
+    connections.settings[alias] = configured[alias]
+
+
+def simulate_request(alias):
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+    # What the request_finished signal does at the end of every request
+    connection.close_if_unusable_or_obsolete()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    for index, (label, overrides) in enumerate(PROFILES.items()):
+        alias = f"bench_{index}"
+        add_alias(alias, overrides)
+        timings = measure(lambda: simulate_request(alias), args.iterations)
+        report(label, timings)
+        connections[alias].close()
+        connections[alias].close_pool()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+HTTP throughput of a running deployment.
+
+Compare the development server with the production profile:
+
+    docker compose up --build
+    python -m benchmarks.http_throughput http://localhost:8000/api/books/
+
+    docker compose --profile prod up --build lb
+    python -m benchmarks.http_throughput http://localhost:8080/api/books/
+
+Requests are throttled, raise DEFAULT_THROTTLE_RATES before measuring.
+"""
+
+import argparse
+import threading
+import time
+
+import requests
+
+from benchmarks.utils import report
+
+
+def worker(url, deadline, timings, errors, headers):
+    session = requests.Session()
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            response = session.get(url, headers=headers, timeout=10)
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        if ok:
+            timings.append(elapsed)
+        else:
+            errors.append(elapsed)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("url")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--token", help="JWT access token for protected endpoints")
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    deadline = time.perf_counter() + args.duration
+    timings, errors = [], []
+    threads = [
+        threading.Thread(
+            target=worker, args=(args.url, deadline, timings, errors, headers)
+        )
+        for _ in range(args.concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    print(f"{len(timings) / args.duration:.1f} requests/s, {len(errors)} errors")
+    if timings:
+        report(f"latency at concurrency {args.concurrency}", timings)
+
+
+if __name__ == "__main__":
+    main()
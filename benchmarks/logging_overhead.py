@@ -0,0 +1,84 @@
+"""
+Cost of access logging on the request thread.
+
+Logs one access record per call through a plain StreamHandler and through
+the queued handler, to a sink that takes `--sink-ms` per write (a slow disk
+or pipe), then times AccessLogMiddleware around a trivial view:
+
+    python -m benchmarks.logging_overhead --sink-ms 0.2
+"""
+
+import argparse
+import io
+import logging
+import time
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.http import HttpResponse  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from library_service.middleware import AccessLogMiddleware  # noqa: E402
+from utils.log import JsonFormatter, QueueStreamHandler  # noqa: E402
+
+EXTRA = {
+    "method": "GET",
+    "path": "/api/borrowings/",
+    "view": "borrowings:borrowing-list",
+    "user_id": 42,
+    "status": 200,
+    "latency_ms": 12.5,
+    "queries": 3,
+}
+
+
+class SlowSink(io.StringIO):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def write(self, text):
+        time.sleep(self.delay)
+        return len(text)
+
+
+def log_through(handler, iterations):
+    logger = logging.getLogger("benchmarks.logging")
+    logger.handlers = [handler]
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    timings = measure(
+        lambda: logger.info("GET /api/borrowings/ 200", extra=EXTRA), iterations
+    )
+    handler.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sink-ms", type=float, default=0.2)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    for label, handler in (
+        ("StreamHandler", logging.StreamHandler(SlowSink(args.sink_ms / 1000))),
+        ("QueueStreamHandler", QueueStreamHandler(SlowSink(args.sink_ms / 1000))),
+    ):
+        handler.setFormatter(JsonFormatter())
+        report(label, log_through(handler, args.iterations))
+
+    request = RequestFactory().get("/api/borrowings/")
+    view = lambda request: HttpResponse()  # noqa: E731
+    logging.getLogger("library_service.access").disabled = True
+    report("view without access log", measure(lambda: view(request), args.iterations))
+    logging.getLogger("library_service.access").disabled = False
+    middleware = AccessLogMiddleware(view)
+    report(
+        "view with access log", measure(lambda: middleware(request), args.iterations)
+    )
+
+
+if __name__ == "__main__":
+    main()
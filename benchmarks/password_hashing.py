@@ -0,0 +1,44 @@
+"""
+Logins per second per core for each password hasher profile.
+
+Verifies a password against a stored hash, the work a login does, and
+reports the time per check and the resulting logins/sec on one core:
+
+    python -m benchmarks.password_hashing --iterations 20
+
+Profiles whose library is missing (argon2-cffi) are skipped.
+"""
+
+import argparse
+import statistics
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.conf import settings  # noqa: E402
+from django.utils.module_loading import import_string  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    for profile, path in settings.PASSWORD_HASHER_PROFILES.items():
+        hasher = import_string(path)()
+        try:
+            encoded = hasher.encode("correct horse", hasher.salt())
+        except ValueError as exc:
+            print(f"{profile:<32} skipped: {exc}")
+            continue
+
+        timings = measure(
+            lambda: hasher.verify("correct horse", encoded), args.iterations, warmup=2
+        )
+        report(profile, timings)
+        print(f"{'':<32} {1000 / statistics.median(timings):8.1f} logins/sec/core")
+
+
+if __name__ == "__main__":
+    main()
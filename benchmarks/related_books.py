@@ -0,0 +1,71 @@
+"""
+Build time of the related books for a large synthetic borrowing history.
+
+Generates (user, book) pairs with a few popular books and many rarely
+borrowed ones, then times the sparse matrix build for every book, and the
+pure Python build on a sample of books. No database is needed:
+
+    python -m benchmarks.related_books --borrowings 10000000 --users 1000000 \\
+        --books 100000
+
+Needs numpy and scipy.
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import setup_django
+
+setup_django()
+
+from analytics.related import np, top_related, top_related_sparse  # noqa: E402
+
+
+def generate_pairs(rng, borrowings, users, books):
+    """User and book id arrays, book popularity is Zipf-like."""
+    user_ids = rng.integers(1, users + 1, size=borrowings)
+    # Spread the ranks over the id space, popular books aren't the first ids
+    book_ids = ((rng.zipf(1.3, size=borrowings) - 1) * 7919) % books + 1
+    return user_ids, book_ids
+
+
+def pairs(user_ids, book_ids):
+    """(user, book) tuples made as they are read, like database rows."""
+    return zip(map(int, user_ids), map(int, book_ids))
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    count = sum(1 for _ in func())
+    seconds = time.perf_counter() - start
+    print(f"{label:<32} {seconds:8.1f} s  {count / seconds:10.1f} books/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--borrowings", type=int, default=10_000_000)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--books", type=int, default=100_000)
+    parser.add_argument(
+        "--sample", type=int, default=200, help="Books built by pure Python."
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if np is None:
+        print("numpy and scipy are not installed")
+        return
+
+    rng = np.random.default_rng(args.seed)
+    user_ids, book_ids = generate_pairs(rng, args.borrowings, args.users, args.books)
+    sample = np.unique(book_ids[: args.sample * 10])[: args.sample].tolist()
+
+    timed("sparse, all books", lambda: top_related_sparse(pairs(user_ids, book_ids)))
+    timed(
+        f"python, {len(sample)} books",
+        lambda: top_related(pairs(user_ids, book_ids), sample),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Import time of a worker boot, measured with python -X importtime.
+
+Boots Django the way a worker does (settings, apps, URLconf, WSGI handler)
+in fresh interpreters, with the API docs enabled and disabled. Fails when
+a boot without the docs imports drf_spectacular, or when its median exceeds
+the budget:
+
+    python -m benchmarks.startup_time --runs 5
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+# Budget for the cumulative import time of a worker boot without the API
+# docs, in milliseconds
+BUDGET_MS = 900
+
+# Packages a boot with API_DOCS_ENABLED=False must not import
+DOCS_ONLY_PACKAGES = ("drf_spectacular",)
+
+BOOT = (
+    "import django; django.setup(); "
+    "import library_service.urls; "
+    "from library_service.wsgi import application"
+)
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure_boot(docs_enabled):
+    """
+    Return the top-level imports of one boot as (cumulative_us, module), and
+    the names of every imported module.
+    """
+    env = {
+        **os.environ,
+        "DJANGO_SETTINGS_MODULE": "library_service.settings",
+        "API_DOCS_ENABLED": str(docs_enabled),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", BOOT],
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode:
+        sys.exit(result.stderr.strip().splitlines()[-1])
+    imports, modules = [], set()
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if not match:
+            continue
+        modules.add(match.group(4))
+        # Top-level imports are the ones without indentation
+        if len(match.group(3)) == 1:
+            imports.append((int(match.group(2)), match.group(4)))
+    return imports, modules
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=BUDGET_MS)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    medians, failed = {}, False
+    for docs_enabled in (True, False):
+        totals, heaviest, modules = [], {}, set()
+        for _ in range(args.runs):
+            imports, imported = measure_boot(docs_enabled)
+            modules |= imported
+            totals.append(sum(cumulative for cumulative, _ in imports) / 1000)
+            for cumulative, module in imports:
+                heaviest.setdefault(module, []).append(cumulative / 1000)
+        medians[docs_enabled] = statistics.median(totals)
+
+        print(f"API_DOCS_ENABLED={docs_enabled}, heaviest top-level imports:")
+        ranking = sorted(
+            heaviest.items(), key=lambda item: statistics.median(item[1]), reverse=True
+        )
+        for module, timings in ranking[: args.top]:
+            print(f"  {statistics.median(timings):8.1f} ms  {module}")
+
+        if not docs_enabled:
+            leaked = sorted(
+                package
+                for package in DOCS_ONLY_PACKAGES
+                if any(module.split(".")[0] == package for module in modules)
+            )
+            if leaked:
+                print(f"Imported without the API docs: {', '.join(leaked)}")
+                failed = True
+
+    print(
+        f"Boot import time (median of {args.runs} runs): "
+        f"{medians[True]:.1f} ms with the API docs, {medians[False]:.1f} ms without"
+    )
+    if medians[False] > args.budget:
+        print(f"Over the budget of {args.budget:.0f} ms without the API docs")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Per-request overhead of the rate limiter.
+
+Compares DRF's UserRateThrottle, which keeps a list of request timestamps per
+client, with the sliding-window counter throttle, for a client that has
+already made `--history` requests in the current window:
+
+    python -m benchmarks.throttling --history 1000
+
+Uses the configured cache, set CACHE_BACKEND to measure against Redis.
+"""
+
+import argparse
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.contrib.auth.models import AnonymousUser  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from rest_framework.request import Request  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+from rest_framework.throttling import UserRateThrottle  # noqa: E402
+
+from utils.throttling import UserThrottle  # noqa: E402
+
+
+def build_request():
+    request = Request(APIRequestFactory().get("/api/borrowings/"))
+    request.user = AnonymousUser()
+    return request
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--history", type=int, default=1000)
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+
+    request = build_request()
+    # A limit that is never reached, so every call does the full bookkeeping
+    rate = f"{args.history + (args.iterations + 10) * 2}/day"
+
+    print(f"{args.history} prior requests in the window")
+    for label, throttle_class in (
+        ("drf timestamp list", UserRateThrottle),
+        ("sliding window counter", UserThrottle),
+    ):
+        cache.clear()
+        throttle_class = type(
+            throttle_class.__name__, (throttle_class,), {"rate": rate}
+        )
+        for _ in range(args.history):
+            throttle_class().allow_request(request, None)
+
+        timings = measure(
+            lambda: throttle_class().allow_request(request, None), args.iterations
+        )
+        report(label, timings)
+
+
+if __name__ == "__main__":
+    main()
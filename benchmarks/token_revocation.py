@@ -0,0 +1,66 @@
+"""
+Revocation check latency on refresh as the revoked token table grows.
+
+Inserts batches of revoked tokens (removed again at the end) and measures
+the check for a token that isn't revoked, which misses the cache and uses
+the unique index, and for one that is, which the cache answers:
+
+    python -m benchmarks.token_revocation --sizes 0 10000 100000
+"""
+
+import argparse
+import uuid
+from datetime import timedelta
+
+from benchmarks.utils import measure, report, setup_django
+
+setup_django()
+
+from django.utils import timezone  # noqa: E402
+
+from users.models import RevokedToken  # noqa: E402
+from users.tokens import is_revoked, revoke  # noqa: E402
+
+PREFIX = "benchmark-"
+
+
+def grow_table(count, expires_at):
+    RevokedToken.objects.bulk_create(
+        (
+            RevokedToken(jti=f"{PREFIX}{uuid.uuid4().hex}", expires_at=expires_at)
+            for _ in range(count)
+        ),
+        batch_size=5000,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[0, 10_000, 100_000])
+    parser.add_argument("--iterations", type=int, default=500)
+    args = parser.parse_args()
+
+    expires_at = timezone.now() + timedelta(days=1)
+    revoked_jti = f"{PREFIX}revoked"
+    revoke(revoked_jti, expires_at)
+
+    try:
+        inserted = 0
+        for size in sorted(args.sizes):
+            grow_table(size - inserted, expires_at)
+            inserted = size
+
+            report(
+                f"{size} rows, not revoked",
+                measure(lambda: is_revoked(uuid.uuid4().hex), args.iterations),
+            )
+            report(
+                f"{size} rows, revoked",
+                measure(lambda: is_revoked(revoked_jti), args.iterations),
+            )
+    finally:
+        RevokedToken.objects.filter(jti__startswith=PREFIX).delete()
+
+
+if __name__ == "__main__":
+    main()
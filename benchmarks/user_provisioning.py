@@ -0,0 +1,115 @@
+"""
+Throughput of bulk account provisioning, for onboarding e.g. 100k readers.
+
+Hashes a sample of passwords serially, in the bulk endpoint's thread pool and in a
+process pool, then inserts --accounts users with create() per row (on the
+sample) and with bulk_create, and estimates the total provisioning time of
+each combination. The inserted users are removed at the end:
+
+    python -m benchmarks.user_provisioning --accounts 100000 --sample 200
+
+Set PASSWORD_HASHER to compare hashers.
+"""
+
+import argparse
+import time
+
+from benchmarks.utils import setup_django
+
+setup_django()
+
+from django.contrib.auth import get_user_model  # noqa: E402
+from django.contrib.auth.hashers import make_password  # noqa: E402
+
+from users.provisioning import (  # noqa: E402
+    hash_passwords,
+    hashing_processes,
+    provisioning_pool,
+)
+
+PREFIX = "benchmark-provisioning-"
+
+
+def rate(label, count, seconds):
+    print(f"{label:<32} {count / seconds:10.1f} accounts/sec")
+    return count / seconds
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument(
+        "--sample", type=int, default=200, help="Passwords hashed per mode."
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    User = get_user_model()
+    passwords = [f"password-{index}" for index in range(args.sample)]
+
+    hashing = {
+        "hash serially": rate(
+            "hash serially", args.sample, timed(lambda: hash_passwords(passwords))
+        ),
+        "hash in threads": rate(
+            "hash in threads",
+            args.sample,
+            timed(lambda: hash_passwords(passwords, provisioning_pool)),
+        ),
+    }
+    with hashing_processes(args.workers) as executor:
+        executor.submit(make_password, "warmup").result()  # start the workers
+        hashing["hash in processes"] = rate(
+            "hash in processes",
+            args.sample,
+            timed(lambda: hash_passwords(passwords, executor)),
+        )
+
+    encoded = make_password("password")
+    try:
+        inserting = {
+            "create per row": rate(
+                "create per row",
+                args.sample,
+                timed(
+                    lambda: [
+                        User.objects.create(
+                            email=f"{PREFIX}row-{index}@example.com", password=encoded
+                        )
+                        for index in range(args.sample)
+                    ]
+                ),
+            ),
+            "bulk_create": rate(
+                "bulk_create",
+                args.accounts,
+                timed(
+                    lambda: User.objects.bulk_create(
+                        (
+                            User(email=f"{PREFIX}{index}@example.com", password=encoded)
+                            for index in range(args.accounts)
+                        ),
+                        batch_size=args.batch_size,
+                    )
+                ),
+            ),
+        }
+    finally:
+        User.objects.filter(email__startswith=PREFIX).delete()
+
+    print(f"\nEstimated time for {args.accounts} accounts:")
+    for hash_label, hash_rate in hashing.items():
+        for insert_label, insert_rate in inserting.items():
+            seconds = args.accounts / hash_rate + args.accounts / insert_rate
+            print(f"{hash_label + ', ' + insert_label:<48} {seconds:10.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+import os
+import statistics
+import time
+
+
+def setup_django():
+    """Configure Django for a standalone benchmark script."""
+    import django
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "library_service.settings")
+    django.setup()
+
+
+def measure(func, iterations, warmup=10):
+    """Run func repeatedly and return per-call timings in milliseconds."""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def report(label, timings):
+    """Print mean, median and p95 of timings in milliseconds."""
+    ordered = sorted(timings)
+    p95 = ordered[int(len(ordered) * 0.95) - 1]
+    print(
+        f"{label:<32} mean {statistics.mean(ordered):8.3f} ms"
+        f"  median {statistics.median(ordered):8.3f} ms  p95 {p95:8.3f} ms"
+    )
@@ -1,6 +1,25 @@
 from django.contrib import admin
 
-from books.models import Book
+from books.models import Book, BookCopy
+from books.services import refresh_inventory
+from utils.paginators import EstimatedCountPaginator
 
 
-admin.site.register(Book)
+class BookCopyInline(admin.TabularInline):
+    model = BookCopy
+    extra = 0
+
+
+@admin.register(Book)
+class BookAdmin(admin.ModelAdmin):
+    list_display = ("title", "author", "cover", "inventory", "daily_fee")
+    list_filter = ("branch", "cover", "tracks_copies")
+    search_fields = ("title", "author")
+    inlines = (BookCopyInline,)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def save_related(self, request, form, formsets, change):
+        """Recount the inventory of a book that tracks copies after editing them."""
+        super().save_related(request, form, formsets, change)
+        refresh_inventory([form.instance.pk])
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.7 on 2026-10-19 09:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="tracks_copies",
+            field=models.BooleanField(
+                default=False,
+                help_text="Borrowings take a physical copy, inventory is the number of available copies.",
+            ),
+        ),
+        migrations.CreateModel(
+            name="BookCopy",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("barcode", models.CharField(max_length=64, unique=True)),
+                (
+                    "condition",
+                    models.CharField(
+                        choices=[
+                            ("NEW", "New"),
+                            ("GOOD", "Good"),
+                            ("WORN", "Worn"),
+                            ("DAMAGED", "Damaged"),
+                        ],
+                        default="GOOD",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("AVAILABLE", "Available"),
+                            ("BORROWED", "Borrowed"),
+                            ("REPAIR", "In repair"),
+                            ("LOST", "Lost"),
+                        ],
+                        default="AVAILABLE",
+                        max_length=10,
+                    ),
+                ),
+                (
+                    "book",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="copies",
+                        to="books.book",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "book copies",
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "AVAILABLE")),
+                        fields=["book", "id"],
+                        name="bookcopy_available_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_bookcopy"),
+        ("branches", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="book",
+            name="branch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="books",
+                to="branches.branch",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="book",
+            index=models.Index(
+                fields=["branch", "title"], name="books_book_branch__f6cf39_idx"
+            ),
+        ),
+    ]
@@ -1,6 +1,9 @@
+from django.conf import settings
 from django.db import models
 from decimal import Decimal
 
+from library_service.db_router import branch_database
+
 
 class Book(models.Model):
     COVER_CHOICES = [
@@ -15,6 +18,72 @@ class Book(models.Model):
     daily_fee = models.DecimalField(
         max_digits=6, decimal_places=2, default=Decimal("0.00")
     )
+    branch = models.ForeignKey(
+        "branches.Branch",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="books",
+    )
+    tracks_copies = models.BooleanField(
+        default=False,
+        help_text=(
+            "Borrowings take a physical copy, inventory is the number "
+            "of available copies."
+        ),
+    )
+
+    class Meta:
+        indexes = [
+            # Branch catalogs, and the key to split them across databases
+            models.Index(fields=["branch", "title"]),
+        ]
+
+    def save(self, *args, **kwargs):
+        # QuerySet.create() picks the database before it sees the branch
+        if self.branch_id in settings.BRANCH_DATABASES:
+            kwargs["using"] = branch_database(self.branch_id)
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} by {self.author}"
+
+
+class BookCopy(models.Model):
+    """A physical copy of a book, tracked when the book `tracks_copies`."""
+
+    CONDITION_CHOICES = [
+        ("NEW", "New"),
+        ("GOOD", "Good"),
+        ("WORN", "Worn"),
+        ("DAMAGED", "Damaged"),
+    ]
+    AVAILABLE = "AVAILABLE"
+    BORROWED = "BORROWED"
+    STATUS_CHOICES = [
+        (AVAILABLE, "Available"),
+        (BORROWED, "Borrowed"),
+        ("REPAIR", "In repair"),
+        ("LOST", "Lost"),
+    ]
+
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="copies")
+    barcode = models.CharField(max_length=64, unique=True)
+    condition = models.CharField(
+        max_length=10, choices=CONDITION_CHOICES, default="GOOD"
+    )
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=AVAILABLE)
+
+    class Meta:
+        verbose_name_plural = "book copies"
+        indexes = [
+            # Free copies of a book, scanned when allocating one
+            models.Index(
+                fields=["book", "id"],
+                condition=models.Q(status="AVAILABLE"),
+                name="bookcopy_available_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.barcode} ({self.book.title})"
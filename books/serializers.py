@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework import serializers
 
 from books.models import Book
@@ -6,4 +7,54 @@ from books.models import Book
 class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
-        fields = ("id", "title", "author", "cover", "inventory", "daily_fee")
+        fields = (
+            "id",
+            "title",
+            "author",
+            "cover",
+            "inventory",
+            "daily_fee",
+            "branch",
+        )
+
+
+class BookAvailabilitySerializer(serializers.Serializer):
+    id = serializers.IntegerField()
+    inventory = serializers.IntegerField()
+    expected_returns = serializers.ListField(
+        child=serializers.DateField(),
+        help_text="Expected return dates of the active borrowings, earliest first.",
+    )
+
+
+class BookAvailabilityQuerySerializer(serializers.Serializer):
+    ids = serializers.CharField(help_text="Comma-separated book ids, e.g. ?ids=1,2,3")
+
+    max_ids = 100
+
+    def validate_ids(self, value):
+        try:
+            ids = {int(book_id) for book_id in value.split(",") if book_id.strip()}
+        except ValueError:
+            raise serializers.ValidationError("Book ids must be integers.")
+        if not ids:
+            raise serializers.ValidationError("Give at least one book id.")
+        if len(ids) > self.max_ids:
+            raise serializers.ValidationError(
+                f"Ask for at most {self.max_ids} books at once."
+            )
+        return sorted(ids)
+
+
+class RelatedBookSerializer(serializers.Serializer):
+    id = serializers.IntegerField(source="related.id")
+    title = serializers.CharField(source="related.title")
+    author = serializers.CharField(source="related.author")
+    score = serializers.FloatField(help_text="Similarity from 0 to 1.")
+    readers = serializers.IntegerField(help_text="Readers who borrowed both books.")
+
+
+class RelatedBooksQuerySerializer(serializers.Serializer):
+    limit = serializers.IntegerField(
+        min_value=1, max_value=settings.RELATED_BOOKS_LIMIT, default=10
+    )
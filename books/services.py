@@ -0,0 +1,91 @@
+from collections import Counter, defaultdict
+
+from django.db import router, transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from books.models import Book, BookCopy
+
+
+def allocate_copy(book_id, using=None):
+    """
+    Take the first available copy of a book and mark it borrowed, or return
+    None when none is free. Copies locked by concurrent borrowings are
+    skipped instead of waited for, and the book row isn't locked at all:
+    its inventory goes down by one after the transaction commits.
+    """
+    using = using or router.db_for_write(BookCopy)
+    copy = (
+        BookCopy.objects.using(using)
+        .filter(book_id=book_id, status=BookCopy.AVAILABLE)
+        .order_by("id")
+        .select_for_update(skip_locked=True)
+        .first()
+    )
+    if copy is None:
+        return None
+
+    BookCopy.objects.using(using).filter(pk=copy.pk).update(status=BookCopy.BORROWED)
+    copy.status = BookCopy.BORROWED
+    schedule_inventory_change({book_id: -1}, using)
+    return copy
+
+
+def release_copies(copy_ids, using=None):
+    """
+    Put borrowed copies back on the shelf and give their books the inventory
+    back. Copy ids are only unique within a database, `using` is the one
+    holding them.
+    """
+    if not copy_ids:
+        return
+    copies = BookCopy.objects.using(using or router.db_for_write(BookCopy))
+    released = list(
+        copies.filter(id__in=copy_ids, status=BookCopy.BORROWED).values_list(
+            "id", "book_id"
+        )
+    )
+    copies.filter(id__in=[copy_id for copy_id, _ in released]).update(
+        status=BookCopy.AVAILABLE
+    )
+    schedule_inventory_change(Counter(book_id for _, book_id in released), copies.db)
+
+
+def refresh_inventory(book_ids, using=None):
+    """
+    Set the inventory of books that track copies to their available copies,
+    e.g. after editing the copies in the admin.
+    """
+    available = (
+        BookCopy.objects.filter(book=OuterRef("pk"), status=BookCopy.AVAILABLE)
+        .order_by()
+        .values("book")
+        .annotate(count=Count("id"))
+        .values("count")
+    )
+    Book.objects.using(using or router.db_for_write(Book)).filter(
+        id__in=sorted(book_ids), tracks_copies=True
+    ).update(inventory=Coalesce(Subquery(available), 0))
+
+
+def schedule_inventory_change(changes, using=None):
+    """
+    After the transaction commits, add each {book_id: delta} to the
+    inventory of books that track copies, with one short UPDATE per delta
+    instead of recounting their copies. The inventory doesn't go below zero.
+    """
+    using = using or router.db_for_write(Book)
+    books_by_delta = defaultdict(list)
+    for book_id, delta in changes.items():
+        if delta:
+            books_by_delta[delta].append(book_id)
+    if not books_by_delta:
+        return
+
+    def apply():
+        for delta, book_ids in sorted(books_by_delta.items()):
+            Book.objects.using(using).filter(
+                id__in=sorted(book_ids), tracks_copies=True
+            ).update(inventory=Greatest(F("inventory") + delta, 0))
+
+    transaction.on_commit(apply, using=using)
@@ -59,6 +59,14 @@ class UnauthenticatedBookApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_list_books_publicly_cacheable(self):
+        """Test that anonymous catalog reads can be cached by shared caches"""
+        res = self.client.get(BOOKS_URL)
+
+        self.assertIn("public", res["Cache-Control"])
+        self.assertIn("max-age=", res["Cache-Control"])
+        self.assertIn("Authorization", res["Vary"])
+
     def test_create_book_forbidden_unauthorized(self):
         """Test that non-admin users cannot create a book"""
         payload = {
@@ -84,6 +92,13 @@ class AuthenticatedBookApiTests(TestCase):
         )
         self.client.force_authenticate(self.user)
 
+    def test_list_books_privately_cacheable(self):
+        """Test that authenticated catalog reads are only cached privately"""
+        res = self.client.get(BOOKS_URL)
+
+        self.assertIn("private", res["Cache-Control"])
+        self.assertNotIn("public", res["Cache-Control"])
+
     def test_create_book_forbidden_authorized(self):
         """Test that non-admin users cannot create a book"""
         payload = {
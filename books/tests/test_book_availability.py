@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+BULK_AVAILABILITY_URL = reverse("books:book-availability-list")
+
+
+def availability_url(book_id):
+    return reverse("books:book-availability", args=[book_id])
+
+
+class BookAvailabilityApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.book = Book.objects.create(title="Book", inventory=3)
+        self.other = Book.objects.create(title="Other", inventory=1)
+        self.soon = date.today() + timedelta(days=3)
+        self.later = date.today() + timedelta(days=10)
+        for book, expected in (
+            (self.book, self.later),
+            (self.book, self.soon),
+            (self.other, self.later),
+        ):
+            Borrowing.objects.create(
+                user=self.user, book=book, expected_return_date=expected
+            )
+        Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=self.soon,
+            actual_return_date=date.today(),
+        )
+
+    def test_availability(self):
+        """Test that availability lists active loans' return dates in order."""
+        res = self.client.get(availability_url(self.book.id))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            res.data,
+            {
+                "id": self.book.id,
+                "inventory": 0,
+                "expected_returns": [self.soon.isoformat(), self.later.isoformat()],
+            },
+        )
+        self.assertIn("public", res["Cache-Control"])
+
+    def test_availability_unknown_book(self):
+        """Test that availability of a missing book is 404."""
+        res = self.client.get(availability_url(self.other.id + 100))
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_bulk_availability(self):
+        """Test that many books are served in two queries, unknown ids skipped."""
+        ids = f"{self.other.id},{self.book.id},{self.other.id + 100}"
+        with self.assertNumQueries(2):
+            res = self.client.get(BULK_AVAILABILITY_URL, {"ids": ids})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(book["id"], book["expected_returns"]) for book in res.data],
+            [
+                (self.book.id, [self.soon.isoformat(), self.later.isoformat()]),
+                (self.other.id, [self.later.isoformat()]),
+            ],
+        )
+
+    def test_bulk_availability_invalid_ids(self):
+        """Test that missing, malformed or too many ids are rejected."""
+        for ids in ("", "1,a", ",".join(str(i) for i in range(1, 102))):
+            res = self.client.get(BULK_AVAILABILITY_URL, {"ids": ids})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST, ids)
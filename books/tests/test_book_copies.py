@@ -0,0 +1,117 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book, BookCopy
+from books.services import refresh_inventory
+from borrowings.models import Borrowing
+from borrowings.services import return_borrowings
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+class BookCopyAllocationTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(title="Book", inventory=2, tracks_copies=True)
+        self.copies = [
+            BookCopy.objects.create(book=self.book, barcode=f"B-{index}")
+            for index in range(2)
+        ]
+
+    def borrow(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.client.post(
+                BORROWINGS_URL,
+                {
+                    "book": self.book.id,
+                    "expected_return_date": date.today() + timedelta(days=7),
+                },
+            )
+
+    def test_borrow_allocates_free_copy(self):
+        """Test that borrowing takes the first free copy and updates inventory."""
+        res = self.borrow()
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        borrowing = Borrowing.objects.get(id=res.data["id"])
+        self.assertEqual(borrowing.copy, self.copies[0])
+        self.copies[0].refresh_from_db()
+        self.assertEqual(self.copies[0].status, BookCopy.BORROWED)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 1)
+
+    def test_borrow_without_free_copy(self):
+        """Test that a book with no available copy can't be borrowed."""
+        BookCopy.objects.filter(id=self.copies[0].id).update(status="REPAIR")
+        self.assertEqual(self.borrow().status_code, status.HTTP_201_CREATED)
+
+        # The cached inventory still says 1, the allocation is what decides
+        Book.objects.filter(id=self.book.id).update(inventory=1)
+        res = self.borrow()
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book", res.data)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_return_releases_copy(self):
+        """Test that returning puts the copy back and restores inventory."""
+        self.borrow()
+        with self.captureOnCommitCallbacks(execute=True):
+            return_borrowings(Borrowing.objects.all())
+
+        self.assertFalse(BookCopy.objects.exclude(status=BookCopy.AVAILABLE).exists())
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 2)
+
+    def test_inventory_adjusted_without_recount(self):
+        """Test that borrowing and returning move the inventory by one copy."""
+        Book.objects.filter(id=self.book.id).update(inventory=5)
+
+        self.borrow()
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return_borrowings(Borrowing.objects.all())
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+
+    def test_refresh_inventory_skips_counter_books(self):
+        """Test that only books tracking copies get their inventory recounted."""
+        counter_book = Book.objects.create(title="Counter", inventory=7)
+        BookCopy.objects.create(book=self.book, barcode="B-lost", status="LOST")
+        Book.objects.filter(id=self.book.id).update(inventory=0)
+
+        refresh_inventory([self.book.id, counter_book.id])
+
+        self.book.refresh_from_db()
+        counter_book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 2)
+        self.assertEqual(counter_book.inventory, 7)
+
+
+class InventoryCounterTests(TestCase):
+    def test_counter_never_goes_below_zero(self):
+        """Test that a stale in-memory inventory can't borrow the last copy twice."""
+        user = get_user_model().objects.create_user("user@test.com", "testpass")
+        book = Book.objects.create(title="Book", inventory=1)
+        stale = Book.objects.get(id=book.id)
+        expected = date.today() + timedelta(days=7)
+        Borrowing.objects.create(user=user, book=book, expected_return_date=expected)
+
+        with self.assertRaises(ValidationError):
+            Borrowing.objects.create(
+                user=user, book=stale, expected_return_date=expected
+            )
+
+        book.refresh_from_db()
+        self.assertEqual(book.inventory, 0)
+        self.assertEqual(Borrowing.objects.count(), 1)
@@ -1,11 +1,86 @@
+from django.http import Http404
 from rest_framework import viewsets
+from rest_framework.decorators import action
+from rest_framework.response import Response
 
+from analytics.models import RelatedBook
 from books.models import Book
-from books.serializers import BookSerializer
+from books.serializers import (
+    BookSerializer,
+    BookAvailabilitySerializer,
+    BookAvailabilityQuerySerializer,
+    RelatedBookSerializer,
+    RelatedBooksQuerySerializer,
+)
 from books.permissions import IsAdminOrReadOnly
+from borrowings.services import book_availability
+from utils.branches import BRANCH_PARAMETER, BranchScopedMixin
+from utils.cache_control import CacheControlMixin
+from utils.schema import extend_schema, extend_schema_view
 
 
-class BookViewSet(viewsets.ModelViewSet):
+@extend_schema_view(list=extend_schema(parameters=[BRANCH_PARAMETER]))
+class BookViewSet(BranchScopedMixin, CacheControlMixin, viewsets.ModelViewSet):
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     permission_classes = (IsAdminOrReadOnly,)
+    cache_control_policy = "catalog"
+    throttle_scope = "catalog"
+
+    def get_queryset(self):
+        return self.filter_by_branch(super().get_queryset())
+
+    @extend_schema(responses=BookAvailabilitySerializer)
+    @action(detail=True, methods=["GET"])
+    def availability(self, request, pk=None):
+        """Copies on the shelf and when the borrowed ones are expected back."""
+        try:
+            book_id = int(pk)
+        except ValueError:
+            raise Http404
+        availability = book_availability([book_id]).get(book_id)
+        if availability is None:
+            raise Http404
+        return Response(BookAvailabilitySerializer(availability).data)
+
+    @extend_schema(
+        parameters=[BookAvailabilityQuerySerializer],
+        responses=BookAvailabilitySerializer(many=True),
+    )
+    @action(
+        detail=False,
+        methods=["GET"],
+        url_path="availability",
+        url_name="availability-list",
+    )
+    def bulk_availability(self, request):
+        """Availability of many books at once, unknown ids are left out."""
+        params = BookAvailabilityQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        availability = book_availability(params.validated_data["ids"])
+        return Response(
+            BookAvailabilitySerializer(availability.values(), many=True).data
+        )
+
+    @extend_schema(
+        parameters=[RelatedBooksQuerySerializer],
+        responses=RelatedBookSerializer(many=True),
+    )
+    @action(detail=True, methods=["GET"])
+    def related(self, request, pk=None):
+        """Books most borrowed by the readers of this book, updated hourly."""
+        try:
+            book_id = int(pk)
+        except ValueError:
+            raise Http404
+        params = RelatedBooksQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        related = list(
+            RelatedBook.objects.filter(book_id=book_id)
+            .select_related("related")
+            .order_by("-score", "related_id")[: params.validated_data["limit"]]
+        )
+        if not related and not Book.objects.filter(pk=book_id).exists():
+            raise Http404
+        return Response(RelatedBookSerializer(related, many=True).data)
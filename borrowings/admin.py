@@ -1,6 +1,80 @@
+from datetime import date
+
 from django.contrib import admin
 
-from borrowings.models import Borrowing
+from borrowings.models import ArchivedBorrowing, Borrowing
+from borrowings.services import return_borrowings
+from utils.paginators import EstimatedCountPaginator
+
+
+class BorrowingStatusFilter(admin.SimpleListFilter):
+    """Filter borrowings by status, active and overdue use a partial index."""
+
+    title = "status"
+    parameter_name = "status"
+
+    def lookups(self, request, model_admin):
+        return (
+            ("active", "Active"),
+            ("overdue", "Overdue"),
+            ("returned", "Returned"),
+        )
+
+    def queryset(self, request, queryset):
+        if self.value() == "active":
+            return queryset.filter(actual_return_date__isnull=True)
+        if self.value() == "overdue":
+            return queryset.filter(
+                actual_return_date__isnull=True, expected_return_date__lt=date.today()
+            )
+        if self.value() == "returned":
+            return queryset.filter(actual_return_date__isnull=False)
+        return queryset
+
+
+@admin.register(Borrowing)
+class BorrowingAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "book",
+        "borrow_date",
+        "expected_return_date",
+        "actual_return_date",
+    )
+    list_select_related = ("user", "book")
+    list_filter = (BorrowingStatusFilter, "branch")
+    search_fields = ("=id", "=user__email")
+    autocomplete_fields = ("book", "user")
+    raw_id_fields = ("copy",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ("mark_returned",)
+
+    @admin.action(description="Mark selected borrowings as returned")
+    def mark_returned(self, request, queryset):
+        returned = return_borrowings(queryset)
+        self.message_user(request, f"{len(returned)} borrowings marked as returned.")
+
+
+@admin.register(ArchivedBorrowing)
+class ArchivedBorrowingAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "user",
+        "book",
+        "borrow_date",
+        "expected_return_date",
+        "actual_return_date",
+    )
+    list_select_related = ("user", "book")
+    search_fields = ("=id", "=user__email")
+    raw_id_fields = ("book", "copy", "user")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
+    def has_add_permission(self, request):
+        return False
 
-admin.site.register(Borrowing)
+    def has_change_permission(self, request, obj=None):
+        return False
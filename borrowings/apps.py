@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class BorrowingsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "borrowings"
+
+    def ready(self):
+        from borrowings import receivers  # noqa: F401
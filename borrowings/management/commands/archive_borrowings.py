@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from borrowings.services import archive_returned_borrowings, months_ago
+
+
+class Command(BaseCommand):
+    """Django command to move old returned borrowings to the archive table."""
+
+    help = "Archive borrowings returned more than --months months ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months",
+            type=int,
+            default=settings.BORROWING_ARCHIVE_AFTER_MONTHS,
+            help="Archive borrowings returned more than this many months ago.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Borrowings moved per transaction.",
+        )
+
+    def handle(self, *args, **options):
+        returned_before = months_ago(options["months"])
+        self.stdout.write(f"Archiving borrowings returned before {returned_before}...")
+
+        moved = archive_returned_borrowings(returned_before, options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Archived {moved} borrowings."))
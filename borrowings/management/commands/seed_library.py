@@ -0,0 +1,84 @@
+import random
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from books.models import Book
+from borrowings.seed import (
+    generate_books,
+    generate_borrowings,
+    generate_users,
+    insert_borrowings,
+    insert_objects,
+)
+
+
+class Command(BaseCommand):
+    """Django command to fill the database with generated library data."""
+
+    help = (
+        "Generate users, books and borrowings for performance work. "
+        "The same --seed always generates the same data."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=1000)
+        parser.add_argument("--books", type=int, default=1000)
+        parser.add_argument("--borrowings", type=int, default=10000)
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=730,
+            help="Spread borrowings over this many past days.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows per bulk_create when COPY isn't used.",
+        )
+        parser.add_argument(
+            "--no-copy",
+            action="store_true",
+            help="Insert borrowings with bulk_create even on Postgres.",
+        )
+
+    def handle(self, *args, **options):
+        if options["users"] < 1 or options["books"] < 1:
+            raise CommandError("At least one user and one book are needed.")
+
+        rng = random.Random(options["seed"])
+        use_copy = connection.vendor == "postgresql" and not options["no_copy"]
+        batch_size = options["batch_size"]
+        start = time.monotonic()
+
+        user_ids = insert_objects(
+            get_user_model(),
+            generate_users(rng, options["users"], options["seed"]),
+            batch_size,
+        )
+        self.stdout.write(f"Created {len(user_ids)} users.")
+
+        book_ids = insert_objects(
+            Book, generate_books(rng, options["books"]), batch_size
+        )
+        self.stdout.write(f"Created {len(book_ids)} books.")
+
+        rows = generate_borrowings(
+            rng, options["borrowings"], book_ids, user_ids, options["days"]
+        )
+        insert_borrowings(rows, batch_size, use_copy)
+        self.stdout.write(
+            f"Created {options['borrowings']} borrowings"
+            f" with {'COPY' if use_copy else 'bulk_create'}."
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded in {time.monotonic() - start:.1f}s, run "
+                "`python manage.py refresh_analytics --full` to update analytics."
+            )
+        )
@@ -0,0 +1,57 @@
+# Generated by Django 5.1.7 on 2026-10-19 09:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+        ("borrowings", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedBorrowing",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                ("borrow_date", models.DateField()),
+                ("expected_return_date", models.DateField()),
+                ("actual_return_date", models.DateField()),
+                ("archived_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["actual_return_date"], name="borrowings__actual__08c961_idx"
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedborrowing",
+            name="book",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_borrowings",
+                to="books.book",
+            ),
+        ),
+        migrations.AddField(
+            model_name="archivedborrowing",
+            name="user",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="archived_borrowings",
+                to=settings.AUTH_USER_MODEL,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedborrowing",
+            index=models.Index(
+                fields=["user", "borrow_date"], name="borrowings__user_id_bf0f1d_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.1.7 on 2026-10-19 09:57
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+        ("borrowings", "0003_borrowing_active_due_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["book", "expected_return_date"],
+                name="borrowing_active_book_due_idx",
+            ),
+        ),
+    ]
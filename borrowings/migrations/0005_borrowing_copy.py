@@ -0,0 +1,37 @@
+# Generated by Django 5.1.7 on 2026-10-19 09:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_bookcopy"),
+        ("borrowings", "0004_borrowing_active_book_due_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedborrowing",
+            name="copy",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="archived_borrowings",
+                to="books.bookcopy",
+            ),
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="copy",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="borrowings",
+                to="books.bookcopy",
+            ),
+        ),
+    ]
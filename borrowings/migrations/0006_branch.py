@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:03
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0003_branch"),
+        ("borrowings", "0005_borrowing_copy"),
+        ("branches", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="archivedborrowing",
+            name="branch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="archived_borrowings",
+                to="branches.branch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="branch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="borrowings",
+                to="branches.branch",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="archivedborrowing",
+            index=models.Index(
+                fields=["branch", "user"], name="borrowings__branch__07f68d_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["branch", "user"], name="borrowings__branch__bf4309_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["branch", "expected_return_date"],
+                name="borrowing_branch_due_idx",
+            ),
+        ),
+    ]
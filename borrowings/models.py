@@ -1,9 +1,12 @@
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.conf import settings
 from django.utils.timezone import now
 
-from books.models import Book
+from books.models import Book, BookCopy
+from books.services import allocate_copy
+from library_service.db_router import branch_database, using_branch
 
 
 class Borrowing(models.Model):
@@ -12,6 +15,21 @@ class Borrowing(models.Model):
     actual_return_date = models.DateField(null=True, blank=True)
 
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="borrowings")
+    copy = models.ForeignKey(
+        BookCopy,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="borrowings",
+    )
+    # The book's branch, copied so branch queries don't join books
+    branch = models.ForeignKey(
+        "branches.Branch",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="borrowings",
+    )
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="borrowings"
     )
@@ -27,15 +45,34 @@ class Borrowing(models.Model):
                 name="check_actual_return_after_borrow",
             ),
         ]
+        indexes = [
+            # Used by `archive_borrowings` to find old returned borrowings
+            models.Index(fields=["actual_return_date"]),
+            # Active and overdue borrowings, a small part of the table
+            models.Index(
+                fields=["expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_due_idx",
+            ),
+            # Projected returns per book, read with an index-only scan
+            models.Index(
+                fields=["book", "expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_book_due_idx",
+            ),
+            # Borrowings of a reader and overdue loans within a branch
+            models.Index(fields=["branch", "user"]),
+            models.Index(
+                fields=["branch", "expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_branch_due_idx",
+            ),
+        ]
 
     def validate(self):
         """Ensures book inventory is not 0 before borrowing and validates return dates."""
         if self.book.inventory <= 0:
-            raise ValidationError(
-                {
-                    "book": f"Book '{self.book.title}' is out of stock and cannot be borrowed."
-                }
-            )
+            raise self.out_of_stock()
 
         if self.borrow_date is None:
             self.borrow_date = now().date()
@@ -59,30 +96,128 @@ class Borrowing(models.Model):
         """Runs all validations before saving."""
         self.validate()
 
+    def out_of_stock(self):
+        return ValidationError(
+            {
+                "book": f"Book '{self.book.title}' is out of stock and cannot be borrowed."
+            }
+        )
+
     def save(self, *args, **kwargs):
-        if self.pk:  # returning borrowing
-            old_borrowing = Borrowing.objects.get(pk=self.pk)
-            if (
-                old_borrowing.actual_return_date is None
-                and self.actual_return_date is not None
-            ):
-                self.book.inventory += 1
-                self.book.save(update_fields=["inventory"])
-        else:  # creating borrowing
-            self.book.inventory -= 1
-            self.book.save(update_fields=["inventory"])
-
-        super().save(*args, **kwargs)
+        if self.pk:  # updating, e.g. returning from the admin change form
+            self.save_update(*args, **kwargs)
+            return
+
+        # creating borrowing, on the database of the book's branch
+        self.branch_id = self.book.branch_id
+        if self.branch_id in settings.BRANCH_DATABASES:
+            kwargs["using"] = branch_database(self.branch_id)
+        using = branch_database(self.branch_id)
+        with using_branch(self.branch_id), transaction.atomic(using=using):
+            self.take_book(using)
+            super().save(*args, **kwargs)
+
+    def save_update(self, *args, **kwargs):
+        """
+        Save changes to a borrowing. Setting actual_return_date returns it
+        like any other return, through `return_borrowings`; the row is locked
+        first so a concurrent return can't give the book back twice.
+        """
+        from borrowings.services import return_borrowings
+
+        using = kwargs.get("using") or self._state.db
+        with transaction.atomic(using=using):
+            returning = (
+                self.actual_return_date is not None
+                and Borrowing.objects.using(using)
+                .select_for_update()
+                .filter(pk=self.pk, actual_return_date__isnull=True)
+                .exists()
+            )
+            if not returning:
+                super().save(*args, **kwargs)
+                return
+
+            return_date, self.actual_return_date = self.actual_return_date, None
+            super().save(*args, **kwargs)
+            self.actual_return_date = return_date
+            return_borrowings(
+                Borrowing.objects.using(using).filter(pk=self.pk), return_date
+            )
+
+    def take_book(self, using):
+        """
+        Allocate a free copy of a book that tracks copies, or take one off the
+        inventory counter, which only succeeds while it is above zero.
+        """
+        if self.book.tracks_copies:
+            self.copy = allocate_copy(self.book_id, using)
+            if self.copy is None:
+                raise self.out_of_stock()
+            return
+
+        if (
+            not Book.objects.using(using)
+            .filter(pk=self.book_id, inventory__gt=0)
+            .update(inventory=F("inventory") - 1)
+        ):
+            raise self.out_of_stock()
+        self.book.inventory -= 1
 
     def return_borrowing(self):
         """Marks borrowing as returned and increases inventory."""
-        if self.actual_return_date is not None:
+        from borrowings.services import return_borrowings
+
+        if self.actual_return_date is not None or not return_borrowings(
+            Borrowing.objects.using(self._state.db).filter(pk=self.pk)
+        ):
             raise ValidationError(
                 {"actual_return_date": "This book has already been returned."}
             )
 
-        self.actual_return_date = now().date()
-        self.save(update_fields=["actual_return_date"])
+        self.refresh_from_db(fields=["actual_return_date"])
 
     def __str__(self):
         return f"{self.user} borrowed {self.book} on {self.borrow_date}"
+
+
+class ArchivedBorrowing(models.Model):
+    """Returned borrowing moved out of the hot table by `archive_borrowings`."""
+
+    id = models.BigIntegerField(primary_key=True)
+    borrow_date = models.DateField()
+    expected_return_date = models.DateField()
+    actual_return_date = models.DateField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    book = models.ForeignKey(
+        Book, on_delete=models.CASCADE, related_name="archived_borrowings"
+    )
+    copy = models.ForeignKey(
+        BookCopy,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="archived_borrowings",
+    )
+    branch = models.ForeignKey(
+        "branches.Branch",
+        on_delete=models.PROTECT,
+        null=True,
+        blank=True,
+        related_name="archived_borrowings",
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_borrowings",
+    )
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "borrow_date"]),
+            models.Index(fields=["branch", "user"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user} borrowed {self.book} on {self.borrow_date} (archived)"
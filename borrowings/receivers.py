@@ -0,0 +1,25 @@
+from django.dispatch import receiver
+
+from borrowings.models import Borrowing
+from borrowings.signals import borrowings_returned
+from borrowings.tasks import notify_admins
+
+# Returned borrowings listed in the notification, the rest are counted
+RETURNED_LISTED = 20
+
+
+@receiver(borrowings_returned)
+def announce_returns(sender, borrowing_ids, using, **kwargs):
+    """Announce a batch of returns to the admins in one message."""
+    returned = (
+        Borrowing.objects.using(using)
+        .filter(id__in=borrowing_ids)
+        .select_related("book")
+        .order_by("id")[:RETURNED_LISTED]
+    )
+    lines = [f"#{borrowing.id}: {borrowing.book.title}" for borrowing in returned]
+    if len(borrowing_ids) > RETURNED_LISTED:
+        lines.append(f"and {len(borrowing_ids) - RETURNED_LISTED} more")
+    notify_admins.delay(
+        f"Borrowings Returned ({len(borrowing_ids)}):\n" + "\n".join(lines)
+    )
@@ -0,0 +1,163 @@
+import random
+from contextlib import contextmanager
+from datetime import date, timedelta
+from decimal import Decimal
+from itertools import accumulate, islice
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+FIRST_NAMES = (
+    "Anna Bohdan Daria Ivan Kateryna Maksym Olena Petro "
+    "Sofia Taras Yulia Andriy Iryna Mykola Oksana Roman"
+).split()
+LAST_NAMES = (
+    "Shevchenko Kovalenko Bondarenko Tkachenko Kravchenko Melnyk "
+    "Boyko Koval Oliynyk Lysenko Marchenko Savchenko"
+).split()
+TITLE_WORDS = (
+    "Shadow River Garden Winter Silent Empire Letters Night Stone Glass Last "
+    "Summer Northern Secret House Road Forgotten City Light Storm Ocean "
+    "Mountain Song Fire"
+).split()
+
+# Share of borrowings, by due date, that are returned by now
+RETURNED_WHEN_DUE = 0.95
+RETURNED_BEFORE_DUE = 0.2
+# Share of returned borrowings that came back after the due date
+RETURNED_LATE = 0.15
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def generate_users(rng, count, seed):
+    password = make_password("password")
+    for index in range(count):
+        yield get_user_model()(
+            email=f"reader{index}.seed{seed}@example.com",
+            first_name=rng.choice(FIRST_NAMES),
+            last_name=rng.choice(LAST_NAMES),
+            password=password,
+        )
+
+
+def generate_books(rng, count):
+    for _ in range(count):
+        yield Book(
+            title=" ".join(rng.sample(TITLE_WORDS, rng.randint(2, 4))),
+            author=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            cover=rng.choice(("HARD", "SOFT")),
+            inventory=rng.randint(0, 20),
+            daily_fee=Decimal(rng.randint(50, 500)) / 100,
+        )
+
+
+def generate_borrowings(rng, count, book_ids, user_ids, days, today=None):
+    """
+    Yield (borrow_date, expected_return_date, actual_return_date, book_id,
+    user_id) rows spread over the last `days` days. Popular books and active
+    readers are borrowed more often; most borrowings past their due date are
+    returned, some late, the rest are overdue.
+    """
+    today = today or date.today()
+    # Skew towards the first ids, the way a few titles get most loans
+    book_weights = list(accumulate(1 / (rank + 1) for rank in range(len(book_ids))))
+    user_weights = list(
+        accumulate(1 / (rank + 1) ** 0.5 for rank in range(len(user_ids)))
+    )
+
+    for _ in range(count):
+        borrow_date = today - timedelta(days=rng.randint(0, days))
+        expected = borrow_date + timedelta(days=rng.randint(7, 30))
+
+        actual = None
+        if expected < today:
+            if rng.random() < RETURNED_WHEN_DUE:
+                actual = _return_date(rng, borrow_date, expected, today)
+        elif rng.random() < RETURNED_BEFORE_DUE:
+            actual = borrow_date + timedelta(
+                days=rng.randint(0, (today - borrow_date).days)
+            )
+
+        yield (
+            borrow_date,
+            expected,
+            actual,
+            rng.choices(book_ids, cum_weights=book_weights)[0],
+            rng.choices(user_ids, cum_weights=user_weights)[0],
+        )
+
+
+def _return_date(rng, borrow_date, expected, today):
+    if rng.random() < RETURNED_LATE:
+        actual = expected + timedelta(days=rng.randint(1, 30))
+    else:
+        actual = borrow_date + timedelta(
+            days=rng.randint(0, (expected - borrow_date).days)
+        )
+    return min(actual, today)
+
+
+@contextmanager
+def explicit_borrow_dates():
+    """Let bulk_create keep the given borrow_date instead of today's."""
+    field = Borrowing._meta.get_field("borrow_date")
+    field.auto_now_add = False
+    try:
+        yield
+    finally:
+        field.auto_now_add = True
+
+
+def insert_objects(model, objects, batch_size):
+    """Insert objects in batches, return the ids of the new rows in order."""
+    last_id = model.objects.order_by("-id").values_list("id", flat=True).first() or 0
+    for batch in batched(objects, batch_size):
+        with transaction.atomic():
+            model.objects.bulk_create(batch)
+    return list(
+        model.objects.filter(id__gt=last_id).order_by("id").values_list("id", flat=True)
+    )
+
+
+def insert_borrowings(rows, batch_size, use_copy):
+    """Insert borrowing rows with COPY on Postgres or batched bulk_create."""
+    if use_copy:
+        columns = [
+            Borrowing._meta.get_field(name).column
+            for name in (
+                "borrow_date",
+                "expected_return_date",
+                "actual_return_date",
+                "book",
+                "user",
+            )
+        ]
+        sql = f"COPY {Borrowing._meta.db_table} ({', '.join(columns)}) FROM STDIN"
+        with transaction.atomic(), connection.cursor() as cursor:
+            with cursor.cursor.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row)
+        return
+
+    with explicit_borrow_dates():
+        for batch in batched(rows, batch_size):
+            with transaction.atomic():
+                Borrowing.objects.bulk_create(
+                    Borrowing(
+                        borrow_date=borrow_date,
+                        expected_return_date=expected,
+                        actual_return_date=actual,
+                        book_id=book_id,
+                        user_id=user_id,
+                    )
+                    for borrow_date, expected, actual, book_id, user_id in batch
+                )
@@ -5,7 +5,7 @@ from rest_framework import serializers
 
 from borrowings.models import Borrowing
 from books.serializers import BookSerializer
-from utils.telegram_helper import send_telegram_message
+from borrowings.tasks import notify_admins
 
 
 class BorrowingReadSerializer(serializers.ModelSerializer):
@@ -22,8 +22,9 @@ class BorrowingReadSerializer(serializers.ModelSerializer):
             "actual_return_date",
             "book",
             "user",
+            "branch",
         ]
-        read_only_fields = ["id", "borrow_date", "user"]
+        read_only_fields = ["id", "borrow_date", "user", "branch"]
 
 
 class BorrowingCreateSerializer(serializers.ModelSerializer):
@@ -51,9 +52,12 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
         return data
 
     def create(self, validated_data):
-        """Attach the current user, create a borrowing and send message in telegram chat."""
+        """Attach the current user, create a borrowing and notify admins."""
         user = self.context["request"].user
-        borrowing = Borrowing.objects.create(user=user, **validated_data)
+        try:
+            borrowing = Borrowing.objects.create(user=user, **validated_data)
+        except ValidationError as e:  # the last copy was taken meanwhile
+            raise serializers.ValidationError(e.message_dict)
 
         message = (
             f"New Borrowing Created:\n"
@@ -61,7 +65,7 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
             f"Book: {borrowing.book.title}\n"
             f"Expected Return Date: {borrowing.expected_return_date}"
         )
-        send_telegram_message(message)
+        notify_admins.delay(message)
 
         return borrowing
 
@@ -81,5 +85,18 @@ class BorrowingReturnSerializer(serializers.ModelSerializer):
                 {"actual_return_date": "This borrowing has already been returned."}
             )
 
-        instance.return_borrowing()
+        try:
+            instance.return_borrowing()
+        except ValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
         return instance
+
+
+class BorrowingBulkReturnSerializer(serializers.Serializer):
+    """Serializer for returning many borrowings at once."""
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+    )
@@ -0,0 +1,145 @@
+import calendar
+from collections import Counter, defaultdict
+from datetime import date
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import F
+
+from books.models import Book
+from books.services import release_copies
+from borrowings.models import ArchivedBorrowing, Borrowing
+from borrowings.signals import borrowings_returned
+
+ARCHIVED_FIELDS = (
+    "id",
+    "borrow_date",
+    "expected_return_date",
+    "actual_return_date",
+    "book_id",
+    "branch_id",
+    "copy_id",
+    "user_id",
+)
+
+
+def return_borrowings(queryset, return_date=None):
+    """
+    Return every not yet returned borrowing of the queryset in one transaction:
+    lock the rows, stamp actual_return_date with one UPDATE, put borrowed
+    copies back and restore the other books' inventory with one UPDATE per
+    group of books. Return the returned ids.
+    """
+    return_date = return_date or date.today()
+    # Ids are only unique within a database, every query uses the queryset's
+    using = queryset.db
+
+    with transaction.atomic(using=using):
+        rows = list(
+            queryset.filter(actual_return_date__isnull=True)
+            .order_by("id")
+            .select_for_update()
+            .values_list("id", "book_id", "copy_id")
+        )
+        if not rows:
+            return []
+
+        borrowing_ids = [borrowing_id for borrowing_id, _, _ in rows]
+        Borrowing.objects.using(using).filter(id__in=borrowing_ids).update(
+            actual_return_date=return_date
+        )
+
+        release_copies(
+            [copy_id for _, _, copy_id in rows if copy_id is not None], using
+        )
+
+        # Books getting the same number of copies back share one UPDATE
+        books_by_count = defaultdict(list)
+        counted = Counter(book_id for _, book_id, copy_id in rows if copy_id is None)
+        for book_id, count in counted.items():
+            books_by_count[count].append(book_id)
+        for count, book_ids in sorted(books_by_count.items()):
+            Book.objects.using(using).filter(id__in=sorted(book_ids)).update(
+                inventory=F("inventory") + count
+            )
+
+        transaction.on_commit(
+            lambda: borrowings_returned.send(
+                sender=Borrowing, borrowing_ids=borrowing_ids, using=using
+            ),
+            using=using,
+        )
+
+    return borrowing_ids
+
+
+def book_availability(book_ids):
+    """
+    Map each existing book id to its inventory and the sorted expected
+    return dates of its active borrowings, for any number of books in two
+    queries. The dates come from the (book, expected_return_date) partial index.
+    """
+    availability = {
+        book_id: {"id": book_id, "inventory": inventory, "expected_returns": []}
+        for book_id, inventory in Book.objects.filter(id__in=book_ids).values_list(
+            "id", "inventory"
+        )
+    }
+    if not availability:
+        return availability
+
+    active = (
+        Borrowing.objects.filter(
+            book_id__in=list(availability), actual_return_date__isnull=True
+        )
+        .order_by("book_id", "expected_return_date")
+        .values_list("book_id", "expected_return_date")
+    )
+    for book_id, expected in active:
+        availability[book_id]["expected_returns"].append(expected)
+    return availability
+
+
+def months_ago(months, today=None):
+    """Return the date the given number of months before today."""
+    today = today or date.today()
+    month_index = today.year * 12 + today.month - 1 - months
+    year, month = divmod(month_index, 12)
+    day = min(today.day, calendar.monthrange(year, month + 1)[1])
+    return date(year, month + 1, day)
+
+
+def archive_returned_borrowings(returned_before, batch_size=1000, using=None):
+    """
+    Move borrowings returned before the given date to the archive table
+    in batches, each in its own transaction, on the `using` database or on
+    the primary and every branch database. Return the number moved.
+    """
+    if using is None:
+        aliases = dict.fromkeys([DEFAULT_DB_ALIAS, *settings.BRANCH_DATABASES.values()])
+        return sum(
+            archive_returned_borrowings(returned_before, batch_size, alias)
+            for alias in aliases
+        )
+
+    moved = 0
+    while True:
+        with transaction.atomic(using=using):
+            batch = list(
+                Borrowing.objects.using(using)
+                .filter(actual_return_date__lt=returned_before)
+                .order_by("id")
+                .select_for_update(skip_locked=True)
+                .values(*ARCHIVED_FIELDS)[:batch_size]
+            )
+            if not batch:
+                return moved
+
+            ArchivedBorrowing.objects.using(using).bulk_create(
+                [ArchivedBorrowing(**row) for row in batch], ignore_conflicts=True
+            )
+            Borrowing.objects.using(using).filter(
+                id__in=[row["id"] for row in batch]
+            ).delete()
+
+        moved += len(batch)
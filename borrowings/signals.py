@@ -0,0 +1,6 @@
+from django.dispatch import Signal
+
+# Sent once per batch of returned borrowings, after the transaction commits,
+# with `borrowing_ids`: the ids of the borrowings that were returned, and
+# `using`: the database they live on. borrowings.receivers notifies admins.
+borrowings_returned = Signal()
@@ -0,0 +1,37 @@
+from datetime import date
+
+from borrowings.models import Borrowing
+from tasks.registry import task
+from tasks.schedule import periodic
+from utils.notifier import notify
+
+# Overdue borrowings listed in the daily reminder, the rest are counted
+OVERDUE_LISTED = 20
+
+
+@task
+def notify_admins(text):
+    """Announce an event in the admin notification channels."""
+    notify(text)
+
+
+@periodic("0 9 * * *")
+def check_overdue():
+    """Remind admins of the active borrowings past their return date."""
+    overdue = Borrowing.objects.filter(
+        actual_return_date__isnull=True, expected_return_date__lt=date.today()
+    )
+    count = overdue.count()
+    if not count:
+        return
+
+    lines = [
+        f"{borrowing.user.email}: {borrowing.book.title}, "
+        f"due {borrowing.expected_return_date}"
+        for borrowing in overdue.select_related("book", "user").order_by(
+            "expected_return_date", "id"
+        )[:OVERDUE_LISTED]
+    ]
+    if count > OVERDUE_LISTED:
+        lines.append(f"and {count - OVERDUE_LISTED} more")
+    notify(f"Overdue Borrowings ({count}):\n" + "\n".join(lines))
@@ -0,0 +1,99 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+
+from books.models import Book
+from borrowings.models import Borrowing
+from utils.paginators import EstimatedCountPaginator
+
+CHANGELIST_URL = reverse("admin:borrowings_borrowing_changelist")
+
+
+class BorrowingAdminTests(TestCase):
+    def setUp(self):
+        self.admin = get_user_model().objects.create_superuser(
+            "admin@test.com", "testpass"
+        )
+        self.client.force_login(self.admin)
+        self.book = Book.objects.create(title="Book", inventory=10)
+        self.active = Borrowing.objects.create(
+            user=self.admin,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+        self.overdue = Borrowing.objects.create(
+            user=self.admin,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+        Borrowing.objects.filter(id=self.overdue.id).update(
+            borrow_date=date.today() - timedelta(days=14),
+            expected_return_date=date.today() - timedelta(days=1),
+        )
+        self.returned = Borrowing.objects.create(
+            user=self.admin,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=7),
+            actual_return_date=date.today(),
+        )
+
+    def _listed_ids(self, **params):
+        res = self.client.get(CHANGELIST_URL, params)
+        self.assertEqual(res.status_code, 200)
+        return {obj.id for obj in res.context["cl"].result_list}
+
+    def test_status_filter(self):
+        """Test that the status filter splits active, overdue and returned."""
+        self.assertEqual(
+            self._listed_ids(status="active"), {self.active.id, self.overdue.id}
+        )
+        self.assertEqual(self._listed_ids(status="overdue"), {self.overdue.id})
+        self.assertEqual(self._listed_ids(status="returned"), {self.returned.id})
+
+    def test_changelist_query_count_is_constant(self):
+        """Test that users and books are joined and rows are counted once."""
+        # Session, user, branches for the filter, count and rows
+        with self.assertNumQueries(5):
+            self.client.get(CHANGELIST_URL)
+        Borrowing.objects.create(
+            user=self.admin,
+            book=Book.objects.create(title="Another", inventory=1),
+            expected_return_date=date.today() + timedelta(days=1),
+        )
+
+        with self.assertNumQueries(5):
+            self.client.get(CHANGELIST_URL)
+
+    def test_mark_returned_action(self):
+        """Test that the action returns borrowings and restores inventory."""
+        res = self.client.post(
+            CHANGELIST_URL,
+            {
+                "action": "mark_returned",
+                "_selected_action": [self.active.id, self.overdue.id],
+            },
+        )
+
+        self.assertEqual(res.status_code, 302)
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 9)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    def test_exact_count_for_small_or_filtered_querysets(self):
+        """Test that querysets the estimate can't describe are counted exactly."""
+        Book.objects.create(title="First", inventory=1)
+        Book.objects.create(title="Second", inventory=1)
+
+        books = Book.objects.order_by("id")
+
+        self.assertEqual(EstimatedCountPaginator(books, 10).count, 2)
+        self.assertEqual(
+            EstimatedCountPaginator(books.filter(title="First"), 10).count, 1
+        )
+        self.assertEqual(EstimatedCountPaginator([1, 2, 3], 10).count, 3)
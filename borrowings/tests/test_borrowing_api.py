@@ -54,9 +54,9 @@ class AuthenticatedBorrowingApiTests(TestCase):
         )
         self.client.force_authenticate(self.user)
 
-    @patch("borrowings.serializers.send_telegram_message")  # Mock Telegram message function
-    def test_create_borrowing_sends_notification(self, mock_send_telegram):
-        """Test that borrowing creation works and sends a Telegram notification."""
+    @patch("borrowings.tasks.notify")  # Mock admin notifications
+    def test_create_borrowing_sends_notification(self, mock_notify):
+        """Test that borrowing creation works and notifies admins."""
         book = sample_book()
 
         payload = {
@@ -71,8 +71,8 @@ class AuthenticatedBorrowingApiTests(TestCase):
         borrowing = Borrowing.objects.first()
         self.assertEqual(borrowing.user, self.user)
 
-        # Verify that send_telegram_message was called once
-        mock_send_telegram.assert_called_once()
+        # Verify that notify was called once
+        mock_notify.assert_called_once()
 
         # Check the expected message format
         expected_message = (
@@ -81,7 +81,7 @@ class AuthenticatedBorrowingApiTests(TestCase):
             f"Book: {borrowing.book.title}\n"
             f"Expected Return Date: {borrowing.expected_return_date}"
         )
-        mock_send_telegram.assert_called_with(expected_message)
+        mock_notify.assert_called_with(expected_message)
 
     def test_create_borrowing_with_wrong_expected_return_date(self):
         """Test can not create borrowing with wrong expected return date."""
@@ -130,6 +130,13 @@ class AuthenticatedBorrowingApiTests(TestCase):
         self.assertEqual(len(res.data), len(borrowings))
         self.assertEqual(res.data, serializer.data)
 
+    def test_list_borrowings_not_stored_by_caches(self):
+        """Test that borrowing lists are marked private and no-store."""
+        res = self.client.get(BORROWINGS_URL)
+
+        self.assertIn("private", res["Cache-Control"])
+        self.assertIn("no-store", res["Cache-Control"])
+
     def test_list_borrowings_filtered_by_active(self):
         """Test filtering borrowings by is_active."""
         active_borrowing1 = sample_borrowing(user=self.user)
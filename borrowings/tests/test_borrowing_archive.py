@@ -0,0 +1,148 @@
+from datetime import date, timedelta
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import ArchivedBorrowing, Borrowing
+from borrowings.services import months_ago
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+def sample_borrowing(user, borrowed_days_ago=0, returned_days_ago=None):
+    """Create a borrowing that started (and maybe ended) in the past."""
+    book = Book.objects.create(title="Sample Book", inventory=5)
+    borrowing = Borrowing.objects.create(
+        user=user, book=book, expected_return_date=date.today() + timedelta(days=7)
+    )
+    borrow_date = date.today() - timedelta(days=borrowed_days_ago)
+    Borrowing.objects.filter(pk=borrowing.pk).update(
+        borrow_date=borrow_date,
+        expected_return_date=borrow_date + timedelta(days=7),
+        actual_return_date=(
+            None
+            if returned_days_ago is None
+            else date.today() - timedelta(days=returned_days_ago)
+        ),
+    )
+    return borrowing
+
+
+def archive():
+    call_command("archive_borrowings", "--months", "12", stdout=StringIO())
+
+
+class MonthsAgoTests(TestCase):
+    def test_months_ago_clamps_day(self):
+        """Test that month arithmetic clamps to the end of shorter months."""
+        self.assertEqual(months_ago(1, today=date(2025, 3, 31)), date(2025, 2, 28))
+        self.assertEqual(months_ago(12, today=date(2025, 1, 15)), date(2024, 1, 15))
+
+
+class ArchiveBorrowingsCommandTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+
+    def test_old_returned_borrowings_archived(self):
+        """Test that only borrowings returned long ago are moved."""
+        old = sample_borrowing(self.user, borrowed_days_ago=500, returned_days_ago=490)
+        recent = sample_borrowing(self.user, borrowed_days_ago=30, returned_days_ago=20)
+        active = sample_borrowing(self.user, borrowed_days_ago=500)
+
+        archive()
+
+        self.assertEqual(
+            set(Borrowing.objects.values_list("id", flat=True)), {recent.id, active.id}
+        )
+        archived = ArchivedBorrowing.objects.get()
+        self.assertEqual(archived.id, old.id)
+        self.assertEqual(archived.book_id, old.book_id)
+
+    def test_archiving_twice_is_harmless(self):
+        """Test that running the job again moves nothing."""
+        sample_borrowing(self.user, borrowed_days_ago=500, returned_days_ago=490)
+
+        archive()
+        archive()
+
+        self.assertEqual(ArchivedBorrowing.objects.count(), 1)
+        self.assertEqual(Borrowing.objects.count(), 0)
+
+
+class ArchivedBorrowingApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+
+        self.old = sample_borrowing(
+            self.user, borrowed_days_ago=500, returned_days_ago=490
+        )
+        self.active = sample_borrowing(self.user)
+        archive()
+
+    def test_list_includes_archived(self):
+        """Test that archived borrowings are still listed."""
+        res = self.client.get(BORROWINGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([b["id"] for b in res.data], [self.old.id, self.active.id])
+        self.assertNotIn("Link", res)
+
+    @override_settings(BORROWING_ARCHIVE_PAGE_SIZE=1)
+    def test_archive_read_in_pages(self):
+        """Test that the archive is listed newest first, a page at a time."""
+        other = sample_borrowing(
+            self.user, borrowed_days_ago=600, returned_days_ago=590
+        )
+        archive()
+
+        res = self.client.get(BORROWINGS_URL)
+
+        self.assertEqual([b["id"] for b in res.data], [other.id, self.active.id])
+        self.assertIn(f"archived_before={other.id}", res["Link"])
+        self.assertTrue(res["Link"].endswith('rel="next"'))
+
+        res = self.client.get(BORROWINGS_URL, {"archived_before": other.id})
+
+        self.assertEqual([b["id"] for b in res.data], [self.old.id])
+        self.assertNotIn("Link", res)
+
+    def test_invalid_archived_before(self):
+        """Test that a cursor that isn't an id is rejected."""
+        res = self.client.get(BORROWINGS_URL, {"archived_before": "²"})
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_active_list_skips_archive(self):
+        """Test that listing active borrowings only reads the hot table."""
+        with self.assertNumQueries(1):
+            res = self.client.get(BORROWINGS_URL, {"is_active": "true"})
+
+        self.assertEqual([b["id"] for b in res.data], [self.active.id])
+
+    def test_retrieve_archived(self):
+        """Test that an archived borrowing can be retrieved by its id."""
+        url = reverse("borrowings:borrowing-detail", args=[self.old.id])
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["id"], self.old.id)
+        self.assertIsNotNone(res.data["actual_return_date"])
+
+    def test_other_users_archive_hidden(self):
+        """Test that users can't see archived borrowings of others."""
+        other = get_user_model().objects.create_user("other@test.com", "testpass")
+        self.client.force_authenticate(other)
+
+        url = reverse("borrowings:borrowing-detail", args=[self.old.id])
+        res = self.client.get(url)
+
+        self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(self.client.get(BORROWINGS_URL).data, [])
@@ -0,0 +1,142 @@
+import threading
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from books.models import Book
+from borrowings.models import Borrowing
+from utils.idempotency import idempotent
+
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+def return_url(borrowing_id):
+    return reverse("borrowings:borrowing-return-borrowing", args=[borrowing_id])
+
+
+class BorrowingIdempotencyTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(title="Book", inventory=5)
+        self.payload = {
+            "book": self.book.id,
+            "expected_return_date": date.today() + timedelta(days=7),
+        }
+
+    def test_retried_borrow_created_once(self):
+        """Test that a retry returns the stored response without borrowing again."""
+        first = self.client.post(
+            BORROWINGS_URL, self.payload, HTTP_IDEMPOTENCY_KEY="borrow-1"
+        )
+        retry = self.client.post(
+            BORROWINGS_URL, self.payload, HTTP_IDEMPOTENCY_KEY="borrow-1"
+        )
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry.data, first.data)
+        self.assertEqual(retry["Idempotent-Replayed"], "true")
+        self.assertEqual(Borrowing.objects.count(), 1)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 4)
+
+    def test_requests_without_key_not_deduplicated(self):
+        """Test that requests without a key behave as before."""
+        self.client.post(BORROWINGS_URL, self.payload)
+        self.client.post(BORROWINGS_URL, self.payload)
+
+        self.assertEqual(Borrowing.objects.count(), 2)
+
+    def test_key_reused_for_other_request(self):
+        """Test that reusing a key with a different body is rejected."""
+        self.client.post(BORROWINGS_URL, self.payload, HTTP_IDEMPOTENCY_KEY="key")
+        other = {**self.payload, "expected_return_date": date.today()}
+
+        res = self.client.post(BORROWINGS_URL, other, HTTP_IDEMPOTENCY_KEY="key")
+
+        self.assertEqual(res.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_keys_are_per_user(self):
+        """Test that another user's key doesn't replay their response."""
+        self.client.post(BORROWINGS_URL, self.payload, HTTP_IDEMPOTENCY_KEY="key")
+        other_user = get_user_model().objects.create_user("other@test.com", "pass")
+        self.client.force_authenticate(other_user)
+
+        res = self.client.post(BORROWINGS_URL, self.payload, HTTP_IDEMPOTENCY_KEY="key")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Borrowing.objects.count(), 2)
+
+    def test_retried_return_replays_success(self):
+        """Test that a retried return gets the first success, not a 400."""
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+
+        first = self.client.post(return_url(borrowing.id), HTTP_IDEMPOTENCY_KEY="r")
+        retry = self.client.post(return_url(borrowing.id), HTTP_IDEMPOTENCY_KEY="r")
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(retry.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+
+
+class SlowView(APIView):
+    calls = 0
+
+    @idempotent
+    def post(self, request):
+        type(self).calls += 1
+        time.sleep(0.2)
+        return Response({"call": self.calls}, status=status.HTTP_201_CREATED)
+
+
+class ParallelRetryTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        SlowView.calls = 0
+        self.user = get_user_model()(pk=1, email="test@test.com")
+
+    def post(self, results):
+        request = APIRequestFactory().post(
+            "/", {"book": 1}, format="json", HTTP_IDEMPOTENCY_KEY="same"
+        )
+        force_authenticate(request, self.user)
+        results.append(SlowView.as_view()(request))
+
+    def test_parallel_retries_run_once(self):
+        """Test that duplicates sent in parallel don't run the view twice."""
+        results = []
+        threads = [
+            threading.Thread(target=self.post, args=(results,)) for _ in range(5)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(SlowView.calls, 1)
+        codes = sorted(res.status_code for res in results)
+        self.assertEqual(codes, [201] + [409] * 4)
+
+        # Once the first finished, retries get its response
+        retry = []
+        self.post(retry)
+        self.assertEqual(retry[0].status_code, status.HTTP_201_CREATED)
+        self.assertEqual(retry[0].data, {"call": 1})
+        self.assertEqual(SlowView.calls, 1)
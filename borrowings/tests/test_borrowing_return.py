@@ -0,0 +1,183 @@
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.services import return_borrowings
+from borrowings.signals import borrowings_returned
+
+BULK_RETURN_URL = reverse("borrowings:borrowing-return")
+
+
+def sample_borrowing(user, book):
+    return Borrowing.objects.create(
+        user=user, book=book, expected_return_date=date.today() + timedelta(days=7)
+    )
+
+
+class ReturnBorrowingsServiceTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.book = Book.objects.create(title="Book", inventory=5)
+        self.other_book = Book.objects.create(title="Other Book", inventory=5)
+
+    def test_returns_and_restores_inventory(self):
+        """Test that each returned borrowing gives one copy back to its book."""
+        borrowings = [
+            sample_borrowing(self.user, self.book),
+            sample_borrowing(self.user, self.book),
+            sample_borrowing(self.user, self.other_book),
+        ]
+
+        returned = return_borrowings(Borrowing.objects.all())
+
+        self.assertEqual(returned, [borrowing.id for borrowing in borrowings])
+        self.assertFalse(
+            Borrowing.objects.filter(actual_return_date__isnull=True).exists()
+        )
+        self.book.refresh_from_db()
+        self.other_book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+        self.assertEqual(self.other_book.inventory, 5)
+
+    def test_already_returned_skipped(self):
+        """Test that returning twice does not restore inventory twice."""
+        borrowing = sample_borrowing(self.user, self.book)
+
+        return_borrowings(Borrowing.objects.filter(pk=borrowing.pk))
+        returned = return_borrowings(Borrowing.objects.filter(pk=borrowing.pk))
+
+        self.assertEqual(returned, [])
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+
+    def test_constant_number_of_queries(self):
+        """Test that the query count does not grow with the batch size."""
+        self.book.inventory = 50
+        self.book.save()
+        for _ in range(20):
+            sample_borrowing(self.user, self.book)
+        sample_borrowing(self.user, self.other_book)
+
+        # savepoint, locking select, borrowings update,
+        # one inventory update per group of books, release
+        with self.assertNumQueries(6):
+            return_borrowings(Borrowing.objects.all())
+
+    def test_one_event_per_batch(self):
+        """Test that a batch sends a single returned event after commit."""
+        borrowings = [sample_borrowing(self.user, self.book) for _ in range(3)]
+        events = []
+
+        def receiver(sender, borrowing_ids, **kwargs):
+            events.append(borrowing_ids)
+
+        borrowings_returned.connect(receiver)
+        self.addCleanup(borrowings_returned.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return_borrowings(Borrowing.objects.all())
+
+        self.assertEqual(events, [[borrowing.id for borrowing in borrowings]])
+
+    @patch("borrowings.tasks.notify")
+    def test_batch_announced_to_admins(self, mock_notify):
+        """Test that a returned batch is announced in one admin message."""
+        borrowings = [
+            sample_borrowing(self.user, self.book),
+            sample_borrowing(self.user, self.other_book),
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            return_borrowings(Borrowing.objects.all())
+
+        mock_notify.assert_called_once_with(
+            f"Borrowings Returned (2):\n"
+            f"#{borrowings[0].id}: Book\n"
+            f"#{borrowings[1].id}: Other Book"
+        )
+
+    def test_save_with_return_date_returns(self):
+        """Test that setting actual_return_date and saving is a regular return."""
+        borrowing = sample_borrowing(self.user, self.book)
+        stale = Borrowing.objects.get(pk=borrowing.pk)
+        events = []
+
+        def receiver(sender, borrowing_ids, **kwargs):
+            events.append(borrowing_ids)
+
+        borrowings_returned.connect(receiver)
+        self.addCleanup(borrowings_returned.disconnect, receiver)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            borrowing.actual_return_date = date.today()
+            borrowing.expected_return_date += timedelta(days=1)
+            borrowing.save()
+            stale.actual_return_date = date.today()
+            stale.save(update_fields=["actual_return_date"])
+
+        borrowing.refresh_from_db()
+        self.assertEqual(borrowing.actual_return_date, date.today())
+        self.assertEqual(
+            borrowing.expected_return_date, date.today() + timedelta(days=8)
+        )
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+        self.assertEqual(events, [[borrowing.id]])
+
+
+class BulkReturnApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.book = Book.objects.create(title="Book", inventory=5)
+
+    def test_single_return_restores_one_copy(self):
+        """Test that the return action increases inventory exactly once."""
+        borrowing = sample_borrowing(self.user, self.book)
+        url = reverse("borrowings:borrowing-return-borrowing", args=[borrowing.id])
+
+        res = self.client.post(url)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+
+    def test_bulk_return(self):
+        """Test returning many borrowings in one request."""
+        borrowings = [sample_borrowing(self.user, self.book) for _ in range(3)]
+        ids = [borrowing.id for borrowing in borrowings]
+
+        res = self.client.post(BULK_RETURN_URL, {"ids": ids}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data, {"returned": ids, "not_returned": []})
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 5)
+
+    def test_bulk_return_skips_others_borrowings(self):
+        """Test that users can't return borrowings of other users."""
+        other = get_user_model().objects.create_user("other@test.com", "testpass")
+        own = sample_borrowing(self.user, self.book)
+        foreign = sample_borrowing(other, self.book)
+
+        res = self.client.post(
+            BULK_RETURN_URL, {"ids": [own.id, foreign.id]}, format="json"
+        )
+
+        self.assertEqual(res.data, {"returned": [own.id], "not_returned": [foreign.id]})
+        foreign.refresh_from_db()
+        self.assertIsNone(foreign.actual_return_date)
+
+    def test_bulk_return_requires_ids(self):
+        """Test that an empty id list is rejected."""
+        res = self.client.post(BULK_RETURN_URL, {"ids": []}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,74 @@
+import random
+from datetime import date
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.seed import generate_borrowings
+
+
+class SeedLibraryCommandTests(TestCase):
+    def test_seeds_requested_volumes(self):
+        """Test that the command creates the requested number of rows."""
+        call_command(
+            "seed_library",
+            "--users=20",
+            "--books=10",
+            "--borrowings=500",
+            "--batch-size=64",
+            stdout=StringIO(),
+        )
+
+        self.assertEqual(get_user_model().objects.count(), 20)
+        self.assertEqual(Book.objects.count(), 10)
+        self.assertEqual(Borrowing.objects.count(), 500)
+
+    def test_borrow_dates_spread_over_history(self):
+        """Test that borrow dates are kept instead of set to today."""
+        call_command(
+            "seed_library",
+            "--users=5",
+            "--books=5",
+            "--borrowings=200",
+            stdout=StringIO(),
+        )
+
+        self.assertGreater(
+            Borrowing.objects.exclude(borrow_date=date.today()).count(), 150
+        )
+
+    def test_status_distribution(self):
+        """Test that generated borrowings are returned, active and overdue."""
+        today = date(2025, 6, 1)
+        rows = list(
+            generate_borrowings(
+                random.Random(1), 5000, [1, 2, 3], [1, 2], days=365, today=today
+            )
+        )
+        returned = [row for row in rows if row[2] is not None]
+        overdue = [row for row in rows if row[2] is None and row[1] < today]
+        late = [row for row in returned if row[2] > row[1]]
+
+        self.assertGreater(len(returned) / len(rows), 0.8)
+        self.assertGreater(len(overdue), 0)
+        self.assertGreater(len(late), 0)
+        for borrow_date, expected, actual, _, _ in rows:
+            self.assertGreater(expected, borrow_date)
+            self.assertTrue(actual is None or borrow_date <= actual <= today)
+
+    def test_same_seed_same_rows(self):
+        """Test that generation is deterministic for a seed."""
+
+        def rows(seed):
+            return list(
+                generate_borrowings(
+                    random.Random(seed), 100, [1, 2, 3], [1, 2], 30, date(2025, 6, 1)
+                )
+            )
+
+        self.assertEqual(rows(7), rows(7))
+        self.assertNotEqual(rows(7), rows(8))
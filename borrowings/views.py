@@ -1,21 +1,34 @@
-from datetime import date
-
-from drf_spectacular.types import OpenApiTypes
-from drf_spectacular.utils import extend_schema, OpenApiParameter
-from rest_framework import permissions, status, mixins
+from django.conf import settings
+from django.http import Http404
+from rest_framework import permissions, serializers, status, mixins
 from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
 from rest_framework.viewsets import GenericViewSet
 
-from borrowings.models import Borrowing
+from borrowings.models import ArchivedBorrowing, Borrowing
 from borrowings.serializers import (
     BorrowingReadSerializer,
     BorrowingCreateSerializer,
     BorrowingReturnSerializer,
+    BorrowingBulkReturnSerializer,
+)
+from borrowings.services import return_borrowings
+from utils.branches import BRANCH_PARAMETER, BranchScopedMixin
+from utils.cache_control import CacheControlMixin
+from utils.idempotency import IDEMPOTENCY_KEY_PARAMETER, idempotent
+from utils.schema import (
+    OpenApiParameter,
+    OpenApiTypes,
+    extend_schema,
+    inline_serializer,
 )
 
 
 class BorrowingViewSet(
+    BranchScopedMixin,
+    CacheControlMixin,
     mixins.CreateModelMixin,
     mixins.ListModelMixin,
     mixins.RetrieveModelMixin,
@@ -23,6 +36,14 @@ class BorrowingViewSet(
 ):
     queryset = Borrowing.objects.all()
     permission_classes = [permissions.IsAuthenticated]
+    cache_control_policy = "private"
+
+    @property
+    def throttle_scope(self):
+        """Borrowing and returning share a bucket, reads use the user rate."""
+        if self.action in ("create", "return_borrowing", "bulk_return"):
+            return "borrow"
+        return None
 
     def get_queryset(self):
         queryset = self.queryset.select_related("book", "user")
@@ -36,6 +57,21 @@ class BorrowingViewSet(
             else:
                 queryset = queryset.filter(actual_return_date__isnull=False)
 
+        return self.filter_by_branch(self.filter_by_user(queryset))
+
+    def get_archived_queryset(self):
+        """Archived borrowings visible to the user, None when they can't match."""
+        is_active = self.request.query_params.get("is_active", "")
+        if is_active.lower() == "true":
+            return None  # archived borrowings are always returned
+
+        return self.filter_by_branch(
+            self.filter_by_user(
+                ArchivedBorrowing.objects.select_related("book", "user")
+            )
+        )
+
+    def filter_by_user(self, queryset):
         # Filter by users (only for admins)
         user_id = self.request.query_params.get("user_id", None)
         if self.request.user.is_staff:
@@ -48,10 +84,21 @@ class BorrowingViewSet(
 
         return queryset
 
+    def get_object(self):
+        """Fall back to the archive when retrieving an old borrowing."""
+        try:
+            return super().get_object()
+        except Http404:
+            if self.action != "retrieve":
+                raise
+            return get_object_or_404(self.get_archived_queryset(), pk=self.kwargs["pk"])
+
     def get_serializer_class(self):
         """Use different serializers for different actions."""
         if self.action == "return_borrowing":
             return BorrowingReturnSerializer
+        if self.action == "bulk_return":
+            return BorrowingBulkReturnSerializer
         if self.action in ["list", "retrieve"]:
             return BorrowingReadSerializer
         return BorrowingCreateSerializer
@@ -68,14 +115,61 @@ class BorrowingViewSet(
                 type=OpenApiTypes.INT,
                 description="Filter by specific user ID (Admins only). Use ?user_id=1",
             ),
+            OpenApiParameter(
+                "archived_before",
+                type=OpenApiTypes.INT,
+                description="Only list the archived borrowings older than this id, as linked by the Link header. Use ?archived_before=100",
+            ),
+            BRANCH_PARAMETER,
         ]
     )
     def list(self, request, *args, **kwargs):
-        return super().list(request, *args, **kwargs)
+        """
+        List borrowings after the most recent archived ones. The archive is
+        read BORROWING_ARCHIVE_PAGE_SIZE rows at a time, newest first: when
+        older ones remain, the Link header points at the next page of it.
+        """
+        archived_before = request.query_params.get("archived_before", "").strip()
+        if archived_before and not (
+            archived_before.isascii() and archived_before.isdecimal()
+        ):
+            raise serializers.ValidationError(
+                {"archived_before": "Must be a borrowing id."}
+            )
+
+        borrowings = []
+        if not archived_before:
+            borrowings = list(self.filter_queryset(self.get_queryset()))
 
+        archived = self.get_archived_queryset()
+        next_page = None
+        if archived is not None:
+            if archived_before:
+                archived = archived.filter(id__lt=int(archived_before))
+            size = settings.BORROWING_ARCHIVE_PAGE_SIZE
+            page = list(archived.order_by("-id")[: size + 1])
+            if len(page) > size:
+                page = page[:size]
+                next_page = replace_query_param(
+                    request.build_absolute_uri(), "archived_before", page[-1].id
+                )
+            borrowings = page[::-1] + borrowings
+
+        serializer = self.get_serializer(borrowings, many=True)
+        headers = {"Link": f'<{next_page}>; rel="next"'} if next_page else None
+        return Response(serializer.data, headers=headers)
+
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
+    @idempotent
+    def create(self, request, *args, **kwargs):
+        """Borrow a book, retries with the same Idempotency-Key borrow it once."""
+        return super().create(request, *args, **kwargs)
+
+    @extend_schema(parameters=[IDEMPOTENCY_KEY_PARAMETER])
     @action(
         detail=True, methods=["POST"], permission_classes=[permissions.IsAuthenticated]
     )
+    @idempotent
     def return_borrowing(self, request, pk=None):
         """Mark a borrowing as returned and increase book inventory."""
         borrowing = self.get_object()
@@ -87,19 +181,49 @@ class BorrowingViewSet(
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        # Check if already returned
-        if borrowing.actual_return_date is not None:
+        # Update return date and inventory, unless already returned
+        if not return_borrowings(Borrowing.objects.filter(pk=borrowing.pk)):
             return Response(
                 {"detail": "This borrowing has already been returned."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
-        # Update return date and inventory
-        borrowing.actual_return_date = date.today()
-        borrowing.book.inventory += 1
-        borrowing.book.save(update_fields=["inventory"])
-        borrowing.save(update_fields=["actual_return_date"])
-
         return Response(
             {"message": "Book returned successfully!"}, status=status.HTTP_200_OK
         )
+
+    @extend_schema(
+        parameters=[IDEMPOTENCY_KEY_PARAMETER],
+        responses=inline_serializer(
+            name="BorrowingBulkReturnResult",
+            fields={
+                "returned": serializers.ListField(child=serializers.IntegerField()),
+                "not_returned": serializers.ListField(child=serializers.IntegerField()),
+            },
+        ),
+    )
+    @action(
+        detail=False,
+        methods=["POST"],
+        url_path="return",
+        url_name="return",
+        permission_classes=[permissions.IsAuthenticated],
+    )
+    @idempotent
+    def bulk_return(self, request):
+        """Return many borrowings at once and increase book inventory."""
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data["ids"]
+
+        # Only borrower or admin can return the books
+        queryset = self.filter_by_user(Borrowing.objects.filter(id__in=ids))
+        returned = return_borrowings(queryset)
+
+        return Response(
+            {
+                "returned": returned,
+                "not_returned": sorted(set(ids) - set(returned)),
+            },
+            status=status.HTTP_200_OK,
+        )
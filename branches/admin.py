@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from branches.models import Branch
+
+
+@admin.register(Branch)
+class BranchAdmin(admin.ModelAdmin):
+    list_display = ("name", "code")
+    search_fields = ("name", "code")
@@ -0,0 +1,14 @@
+from django.db import models
+
+
+class Branch(models.Model):
+    """A library branch, owning its books and borrowings."""
+
+    name = models.CharField(max_length=255)
+    code = models.SlugField(max_length=32, unique=True)
+
+    class Meta:
+        verbose_name_plural = "branches"
+
+    def __str__(self):
+        return self.name
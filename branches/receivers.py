@@ -0,0 +1,55 @@
+import copy
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import UNUSABLE_PASSWORD_PREFIX
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Model
+from django.db.models.signals import post_delete, pre_save
+from django.dispatch import receiver
+
+from books.models import Book
+from borrowings.models import Borrowing
+
+
+def copy_row(instance, using):
+    """Insert or update a copy of a primary row, and of its branch, on `using`."""
+    if getattr(instance, "branch_id", None) is not None:
+        copy_row(instance.branch, using)
+    Model.save_base(copy.copy(instance), raw=True, using=using)
+
+
+def copy_user_key(user, using):
+    """
+    Insert a stand-in for `user` on `using` with just the id its borrowings
+    point to: no password hash, and no profile that could go stale there.
+    """
+    stand_in = type(user)(
+        pk=user.pk,
+        email=f"{user.pk}@copy.invalid",
+        password=UNUSABLE_PASSWORD_PREFIX,
+    )
+    Model.save_base(stand_in, raw=True, using=using)
+
+
+# Users and branches live on the primary. A branch database gets a copy of
+# the branches its books and borrowings point to, and the ids of the users,
+# when they are written there.
+@receiver(pre_save, sender=Book)
+@receiver(pre_save, sender=Borrowing)
+def copy_references(sender, instance, raw, using, **kwargs):
+    if raw or using == DEFAULT_DB_ALIAS:
+        return
+    if instance.branch_id is not None:
+        copy_row(instance.branch, using)
+    if sender is Borrowing:
+        copy_user_key(instance.user, using)
+
+
+@receiver(post_delete, sender=get_user_model())
+def delete_copies(sender, instance, using, **kwargs):
+    """Delete a user's copies, and with them their borrowings, everywhere."""
+    if using != DEFAULT_DB_ALIAS:
+        return
+    for alias in sorted(set(settings.BRANCH_DATABASES.values())):
+        sender._base_manager.using(alias).filter(pk=instance.pk).delete()
@@ -0,0 +1,242 @@
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.db import DEFAULT_DB_ALIAS
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book, BookCopy
+from borrowings.models import ArchivedBorrowing, Borrowing
+from borrowings.services import archive_returned_borrowings
+from branches.models import Branch
+from library_service.db_router import BranchRouter, using_branch
+
+BOOKS_URL = reverse("books:book-list")
+BORROWINGS_URL = reverse("borrowings:borrowing-list")
+
+
+@override_settings(BRANCH_DATABASES={2: "branch_2"})
+class BranchRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.router = BranchRouter()
+
+    def test_instances_routed_by_their_branch(self):
+        """Test that books and borrowings go to the database of their branch."""
+        self.assertEqual(
+            self.router.db_for_write(Book, instance=Book(branch_id=2)), "branch_2"
+        )
+        self.assertEqual(
+            self.router.db_for_read(Borrowing, instance=Borrowing(branch_id=2)),
+            "branch_2",
+        )
+        self.assertIsNone(self.router.db_for_write(Book, instance=Book(branch_id=3)))
+
+    def test_queries_routed_by_chosen_branch(self):
+        """Test that queries without an instance use the branch of the block."""
+        self.assertIsNone(self.router.db_for_read(BookCopy))
+        with using_branch(2):
+            self.assertEqual(self.router.db_for_read(BookCopy), "branch_2")
+            self.assertEqual(self.router.db_for_write(Borrowing), "branch_2")
+
+    def test_other_apps_not_routed(self):
+        """Test that users and branches are left to the next router."""
+        with using_branch(2):
+            self.assertIsNone(self.router.db_for_read(get_user_model()))
+            self.assertIsNone(self.router.db_for_write(Branch))
+
+    def test_relations_across_branch_databases(self):
+        """Test that branch data may point to users on the primary."""
+        user = get_user_model()(id=1)
+        user._state.db = DEFAULT_DB_ALIAS
+        book = Book(branch_id=2)
+        book._state.db = "branch_2"
+
+        self.assertTrue(self.router.allow_relation(user, book))
+
+
+class BranchScopedApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client.force_authenticate(self.user)
+        self.north = Branch.objects.create(name="North", code="north")
+        self.south = Branch.objects.create(name="South", code="south")
+        self.north_book = Book.objects.create(
+            title="North Book", inventory=2, branch=self.north
+        )
+        self.south_book = Book.objects.create(
+            title="South Book", inventory=2, branch=self.south
+        )
+
+    def borrow(self, book):
+        return self.client.post(
+            BORROWINGS_URL,
+            {"book": book.id, "expected_return_date": date.today() + timedelta(days=7)},
+        )
+
+    def test_books_scoped_to_branch(self):
+        """Test that ?branch= only lists the books of that branch."""
+        res = self.client.get(BOOKS_URL, {"branch": self.north.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([book["id"] for book in res.data], [self.north_book.id])
+        self.assertEqual(len(self.client.get(BOOKS_URL).data), 2)
+
+    def test_borrowing_takes_branch_of_book(self):
+        """Test that a borrowing belongs to the branch of its book."""
+        res = self.borrow(self.south_book)
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        borrowing = Borrowing.objects.get(id=res.data["id"])
+        self.assertEqual(borrowing.branch, self.south)
+
+    def test_borrowings_scoped_to_branch(self):
+        """Test that ?branch= only lists the borrowings of that branch."""
+        self.borrow(self.north_book)
+        self.borrow(self.south_book)
+
+        res = self.client.get(BORROWINGS_URL, {"branch": self.south.id})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["branch"] for row in res.data], [self.south.id])
+
+    def test_invalid_branch(self):
+        """Test that a branch that isn't an id is rejected."""
+        for branch in ("north", "²", "١"):
+            res = self.client.get(BOOKS_URL, {"branch": branch})
+            self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+# library_service.test_settings adds the SQLite database "branch_test"
+@override_settings(BRANCH_DATABASES={900: "branch_test"})
+class BranchDatabaseTests(TestCase):
+    databases = {DEFAULT_DB_ALIAS, "branch_test"}
+
+    def setUp(self):
+        self.branch_id, self.alias = 900, "branch_test"
+        self.branch = Branch.objects.create(
+            id=self.branch_id, name="Remote", code="remote"
+        )
+        self.user = get_user_model().objects.create_user("user@test.com", "testpass")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_references_copied_on_demand(self):
+        """Test that borrowing on a branch database copies the user id and branch."""
+        users = get_user_model().objects.using(self.alias)
+        self.assertFalse(users.filter(id=self.user.id).exists())
+
+        book = Book.objects.create(title="Remote Book", inventory=1, branch=self.branch)
+        Borrowing.objects.create(
+            user=self.user,
+            book=book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+
+        self.assertTrue(Branch.objects.using(self.alias).filter(id=self.branch_id))
+        copied = users.get(id=self.user.id)
+        self.assertNotEqual(copied.email, self.user.email)
+        self.assertFalse(copied.has_usable_password())
+
+        self.user.delete()
+        self.assertFalse(users.filter(id=self.user.id).exists())
+        self.assertFalse(Borrowing.objects.using(self.alias).exists())
+
+    def test_branch_data_stored_on_branch_database(self):
+        """Test that books and borrowings of the branch live on its database."""
+        book = Book.objects.create(title="Remote Book", inventory=1, branch=self.branch)
+        self.assertEqual(book._state.db, self.alias)
+
+        res = self.client.post(
+            f"{BORROWINGS_URL}?branch={self.branch_id}",
+            {"book": book.id, "expected_return_date": date.today() + timedelta(days=7)},
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Borrowing.objects.using(DEFAULT_DB_ALIAS).exists())
+        self.assertEqual(Book.objects.using(self.alias).get(id=book.id).inventory, 0)
+        listed = self.client.get(BORROWINGS_URL, {"branch": self.branch_id}).data
+        self.assertEqual([row["id"] for row in listed], [res.data["id"]])
+
+    def test_branch_database_archived(self):
+        """Test that old returned borrowings of a branch database are archived."""
+        book = Book.objects.create(title="Remote Book", inventory=1, branch=self.branch)
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=book,
+            expected_return_date=date.today() + timedelta(days=7),
+        )
+        Borrowing.objects.using(self.alias).filter(pk=borrowing.pk).update(
+            borrow_date=date(2020, 1, 1),
+            expected_return_date=date(2020, 1, 8),
+            actual_return_date=date(2020, 1, 5),
+        )
+
+        moved = archive_returned_borrowings(date(2021, 1, 1))
+
+        self.assertEqual(moved, 1)
+        self.assertFalse(Borrowing.objects.using(self.alias).exists())
+        self.assertTrue(
+            ArchivedBorrowing.objects.using(self.alias).filter(pk=borrowing.pk)
+        )
+
+    def borrow_with_same_id(self, book, remote_book):
+        """A primary and a branch borrowing that share an id, branch one first."""
+        expected = date.today() + timedelta(days=7)
+        local = Borrowing.objects.create(
+            user=self.user, book=book, expected_return_date=expected
+        )
+        remote = Borrowing.objects.create(
+            user=self.user, book=remote_book, expected_return_date=expected
+        )
+        Borrowing.objects.using(self.alias).filter(pk=remote.pk).update(id=local.pk)
+        remote.pk = local.pk
+        return local, remote
+
+    def test_return_stays_on_branch_database(self):
+        """Test that returning a branch borrowing never touches primary rows."""
+        book = Book.objects.create(title="Local Book", inventory=1)
+        remote_book = Book.objects.create(
+            id=book.id, title="Remote Book", inventory=1, branch=self.branch
+        )
+        local, remote = self.borrow_with_same_id(book, remote_book)
+
+        remote.return_borrowing()
+
+        local.refresh_from_db()
+        self.assertIsNone(local.actual_return_date)
+        self.assertEqual(
+            Book.objects.using(DEFAULT_DB_ALIAS).get(id=book.id).inventory, 0
+        )
+        remote = Borrowing.objects.using(self.alias).get(pk=remote.pk)
+        self.assertIsNotNone(remote.actual_return_date)
+        self.assertEqual(Book.objects.using(self.alias).get(id=book.id).inventory, 1)
+
+    def test_copy_released_on_branch_database(self):
+        """Test that a returned branch copy is put back on the branch's shelf."""
+        book = Book.objects.create(title="Local Book", inventory=1, tracks_copies=True)
+        remote_book = Book.objects.create(
+            id=book.id,
+            title="Remote Book",
+            inventory=1,
+            tracks_copies=True,
+            branch=self.branch,
+        )
+        BookCopy.objects.create(book=book, barcode="L1")
+        BookCopy.objects.using(self.alias).create(book=remote_book, barcode="R1")
+        with self.captureOnCommitCallbacks(using=self.alias, execute=True):
+            local, remote = self.borrow_with_same_id(book, remote_book)
+        self.assertEqual(local.copy_id, remote.copy_id)
+
+        with self.captureOnCommitCallbacks(using=self.alias, execute=True):
+            remote.return_borrowing()
+
+        self.assertEqual(
+            BookCopy.objects.using(DEFAULT_DB_ALIAS).get().status, BookCopy.BORROWED
+        )
+        self.assertEqual(
+            BookCopy.objects.using(self.alias).get().status, BookCopy.AVAILABLE
+        )
+        self.assertEqual(Book.objects.using(self.alias).get(id=book.id).inventory, 1)
@@ -0,0 +1,84 @@
+"""
+Gunicorn configuration for the production entry point.
+
+Every value can be tuned through the environment:
+    WEB_WORKER_CLASS  sync | gthread | uvicorn_worker.UvicornWorker
+    WEB_CONCURRENCY   worker processes (default: 2 * CPU + 1, fewer when the
+                      replicas would open more than POSTGRES_MAX_CONNECTIONS)
+    WEB_THREADS       threads per gthread worker
+    WEB_PRELOAD       load the app in the master before forking (default: off)
+
+Send HUP to the master for a graceful reload of the workers with the new
+code. With WEB_PRELOAD on the workers are forked from the code loaded in
+the master, so HUP restarts the old code: deploy with USR2 instead, which
+starts a new master next to the old one, then send the old master TERM.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("WEB_BIND", "0.0.0.0:8000")
+
+worker_class = os.getenv("WEB_WORKER_CLASS", "gthread")
+threads = int(os.getenv("WEB_THREADS", "4"))
+
+# Left for the task worker, the scheduler, migrations and psql sessions
+RESERVED_CONNECTIONS = 10
+
+
+def default_workers():
+    """2 * CPU + 1, as far as the database connections of all replicas allow."""
+    if os.getenv("POSTGRES_POOL", "False") == "True":
+        per_worker = int(os.getenv("POSTGRES_POOL_MAX_SIZE", threads))
+    else:
+        per_worker = threads  # one persistent connection per thread
+    replicas = int(os.getenv("WEB_REPLICAS", "3"))
+    available = int(os.getenv("POSTGRES_MAX_CONNECTIONS", "100")) - RESERVED_CONNECTIONS
+
+    fitting = available // (replicas * per_worker)
+    return max(1, min(multiprocessing.cpu_count() * 2 + 1, fitting))
+
+
+workers = int(os.getenv("WEB_CONCURRENCY", default_workers()))
+
+# Uvicorn workers serve the ASGI application, the others the WSGI one
+if "uvicorn" in worker_class.lower():
+    wsgi_app = "library_service.asgi:application"
+else:
+    wsgi_app = "library_service.wsgi:application"
+
+# Importing Django once in the master shares its memory copy-on-write, but
+# then HUP can't load new code (see the USR2 deploy above)
+preload_app = os.getenv("WEB_PRELOAD", "False") == "True"
+
+timeout = int(os.getenv("WEB_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("WEB_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("WEB_KEEPALIVE", "5"))
+
+# Recycle workers now and then, with jitter so they don't restart together
+max_requests = int(os.getenv("WEB_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "200"))
+
+# Requests are logged as JSON by AccessLogMiddleware, not a second time here
+accesslog = None
+errorlog = "-"
+
+
+def post_fork(server, worker):
+    """Drop the database connections inherited from a preloaded master."""
+    if not server.cfg.preload_app:
+        return  # Django is only set up once the worker loads the application
+    from django.db import connections
+
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    """Fill the worker's own pool before it accepts requests."""
+    if os.getenv("POSTGRES_POOL", "False") == "True":
+        from django.core.management import call_command
+        from django.db import connections
+
+        call_command("wait_for_db", "--warm-pool")
+        # Give the checked out connection back, the pool keeps it open
+        connections.close_all()
@@ -0,0 +1,108 @@
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Alias of the replica chosen for the current request, None means primary.
+_read_alias = ContextVar("read_alias", default=None)
+
+# Id of the branch the current request works on, None means any.
+_branch = ContextVar("branch", default=None)
+
+
+def choose_replica():
+    """Pick one of the configured replicas, or None when there are none."""
+    replicas = settings.DATABASE_REPLICAS
+    return random.choice(replicas) if replicas else None
+
+
+@contextmanager
+def read_from(alias):
+    """Route replicated reads inside the block to the given alias."""
+    token = _read_alias.set(alias)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+class ReplicaRouter:
+    """
+    Database router for read replicas:
+    - Reads of replicated apps go to the replica chosen for the request.
+    - Writes, reads inside transactions and every other app use the primary.
+    - Migrations only run on the primary, replicas receive them via replication.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or model._meta.app_label not in settings.REPLICA_ROUTED_APPS:
+            return None
+
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.DATABASE_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+def branch_database(branch_id):
+    """Alias of the database holding a branch, the primary unless configured."""
+    return settings.BRANCH_DATABASES.get(branch_id, DEFAULT_DB_ALIAS)
+
+
+@contextmanager
+def using_branch(branch_id):
+    """Route branch data without an instance at hand to the branch's database."""
+    token = _branch.set(branch_id)
+    try:
+        yield
+    finally:
+        _branch.reset(token)
+
+
+class BranchRouter:
+    """
+    Database router for branches placed on their own databases:
+    - Books and borrowings of a branch in BRANCH_DATABASES are read and written
+      on its database. The branch comes from the instance or `using_branch`.
+    - Everything else is left to the next router.
+    - Branch databases get the full schema, the users and branches their
+      rows point to are copied there (see `branches.receivers`).
+    """
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in settings.BRANCH_ROUTED_APPS:
+            return None
+
+        branch_id = getattr(hints.get("instance"), "branch_id", None)
+        if branch_id is None:
+            branch_id = _branch.get()
+        return settings.BRANCH_DATABASES.get(branch_id)
+
+    db_for_write = db_for_read
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *settings.BRANCH_DATABASES.values()}
+        if (
+            settings.BRANCH_DATABASES
+            and obj1._state.db in databases
+            and obj2._state.db in databases
+        ):
+            return True
+        return None
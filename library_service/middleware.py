@@ -0,0 +1,213 @@
+import hashlib
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from library_service.db_router import choose_replica, read_from
+from utils.compression import available_encodings, compress
+from utils.log import QueryLogger
+from utils.profiling import RequestProfile
+
+
+class ReplicaPinningMiddleware:
+    """
+    Serve safe-method requests from a read replica.
+
+    A client that sent a write is pinned to the primary for
+    REPLICA_PIN_SECONDS, so it reads its own writes even while
+    the replicas are lagging behind.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        pin_key = self.get_pin_key(request)
+
+        if request.method not in SAFE_METHODS:
+            response = self.get_response(request)
+            if settings.DATABASE_REPLICAS:
+                cache.set(pin_key, True, timeout=settings.REPLICA_PIN_SECONDS)
+            return response
+
+        alias = None
+        if settings.DATABASE_REPLICAS and not cache.get(pin_key):
+            alias = choose_replica()
+
+        with read_from(alias):
+            return self.get_response(request)
+
+    @staticmethod
+    def get_pin_key(request):
+        """Identify the client by its credentials, or by address for anonymous ones."""
+        identity = request.META.get("HTTP_AUTHORIZATION") or request.META.get(
+            "REMOTE_ADDR", ""
+        )
+        digest = hashlib.sha256(identity.encode()).hexdigest()
+        return f"replica-pin:{digest}"
+
+
+class CompressionMiddleware:
+    """
+    Compress responses above COMPRESSION_MIN_SIZE bytes with the first
+    encoding of COMPRESSION_ENCODINGS the client accepts (gzip, and brotli
+    or zstd when their libraries are installed).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.encodings = available_encodings(settings.COMPRESSION_ENCODINGS)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if (
+            response.streaming
+            or response.has_header("Content-Encoding")
+            or len(response.content) < settings.COMPRESSION_MIN_SIZE
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        encoding = self.choose_encoding(request)
+        if encoding is None:
+            return response
+
+        compressed = compress(
+            response.content, encoding, settings.COMPRESSION_LEVELS[encoding]
+        )
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        response.headers["Content-Encoding"] = encoding
+
+        # A strong ETag must change with the representation, make it weak
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+        return response
+
+    def choose_encoding(self, request):
+        accepted = set()
+        for token in request.META.get("HTTP_ACCEPT_ENCODING", "").split(","):
+            name, _, params = token.partition(";")
+            quality = params.strip().removeprefix("q=")
+            try:
+                if params and float(quality) == 0:
+                    continue  # explicitly refused
+            except ValueError:
+                pass
+            accepted.add(name.strip().lower())
+
+        for encoding in self.encodings:
+            if encoding in accepted:
+                return encoding
+        return None
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests when PROFILING_ENABLED: on demand for staff sending an
+    `X-Profile: 1` header or `?profile=1`, and a PROFILING_SAMPLE_RATE share
+    of all requests, kept only when slower than PROFILING_SLOW_MS.
+
+    Profiles are written to PROFILING_DIR as speedscope and collapsed-stack
+    files, keeping the newest PROFILING_MAX_FILES.
+    """
+
+    def __init__(self, get_response):
+        if not settings.PROFILING_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        requested = self.is_requested(request) and self.is_staff(request)
+        if not requested and random.random() >= settings.PROFILING_SAMPLE_RATE:
+            return self.get_response(request)
+
+        name = f"{request.method} {request.path}"
+        with RequestProfile(name, settings.PROFILING_INTERVAL_MS / 1000) as profile:
+            response = self.get_response(request)
+
+        if requested or profile.duration * 1000 >= settings.PROFILING_SLOW_MS:
+            stem = profile.save(settings.PROFILING_DIR, settings.PROFILING_MAX_FILES)
+            if requested:
+                response["X-Profile"] = stem
+        return response
+
+    @staticmethod
+    def is_requested(request):
+        return (
+            request.headers.get("X-Profile") == "1" or request.GET.get("profile") == "1"
+        )
+
+    @staticmethod
+    def is_staff(request):
+        """Check the session user, or the JWT user the API view will see."""
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            return user.is_staff
+
+        try:
+            result = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return False
+        return result is not None and result[0].is_staff
+
+
+class AccessLogMiddleware:
+    """
+    Log every request to `library_service.access` with its view, user,
+    status, latency and query count; requests slower than SLOW_REQUEST_MS
+    are logged as warnings. Slow queries are logged by QueryLogger.
+    """
+
+    logger = logging.getLogger("library_service.access")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with QueryLogger() as queries:
+            response = self.get_response(request)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        level = logging.INFO
+        if latency_ms >= settings.SLOW_REQUEST_MS:
+            level = logging.WARNING
+        if not self.logger.isEnabledFor(level):
+            return response
+
+        match = request.resolver_match
+        user = getattr(request, "user", None)
+
+        self.logger.log(
+            level,
+            "%s %s %s",
+            request.method,
+            request.path,
+            response.status_code,
+            extra={
+                "method": request.method,
+                "path": request.path,
+                "view": match.view_name if match else None,
+                "user_id": user.pk if user is not None else None,
+                "status": response.status_code,
+                "latency_ms": round(latency_ms, 2),
+                "queries": queries.count,
+            },
+        )
+        return response
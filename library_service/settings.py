@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from dotenv import load_dotenv
@@ -32,6 +33,9 @@ DEBUG = os.getenv("DEBUG", "False") == "True"
 
 ALLOWED_HOSTS = ["*"]
 
+# Serve the OpenAPI schema and Swagger UI
+API_DOCS_ENABLED = os.getenv("API_DOCS_ENABLED", "True") == "True"
+
 
 # Application definition
 
@@ -44,21 +48,30 @@ INSTALLED_APPS = [
     "django.contrib.admin",
     # extra apps
     "rest_framework",
-    "drf_spectacular",
     # new apps
     "books",
     "users",
     "borrowings",
+    "analytics",
+    "branches",
+    "tasks",
 ]
 
+if API_DOCS_ENABLED:
+    INSTALLED_APPS += ["drf_spectacular", "api_docs"]
+
 MIDDLEWARE = [
+    "library_service.middleware.AccessLogMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "library_service.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "library_service.middleware.ProfilingMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "library_service.middleware.ReplicaPinningMiddleware",
 ]
 
 ROOT_URLCONF = "library_service.urls"
@@ -93,9 +106,85 @@ DATABASES = {
         "PASSWORD": os.getenv("POSTGRES_PASSWORD"),
         "HOST": os.getenv("POSTGRES_HOST"),
         "PORT": os.getenv("POSTGRES_DB_PORT"),
+        "CONN_HEALTH_CHECKS": True,
+    }
+}
+
+# Connection reuse: a psycopg pool per worker process when POSTGRES_POOL is on,
+# persistent connections otherwise. Size the pool to the worker's thread count.
+if os.getenv("POSTGRES_POOL", "False") == "True":
+    DATABASES["default"]["OPTIONS"] = {
+        "pool": {
+            "min_size": int(os.getenv("POSTGRES_POOL_MIN_SIZE", "2")),
+            "max_size": int(
+                os.getenv("POSTGRES_POOL_MAX_SIZE", os.getenv("WEB_THREADS", "4"))
+            ),
+            "timeout": float(os.getenv("POSTGRES_POOL_TIMEOUT", "10")),
+        }
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("CONN_MAX_AGE", "60"))
+
+# Read replicas share the primary credentials, hosts are given as host[:port]
+DATABASE_REPLICAS = []
+
+for index, replica in enumerate(
+    filter(None, os.getenv("POSTGRES_REPLICA_HOSTS", "").split(",")), start=1
+):
+    host, _, port = replica.strip().partition(":")
+    alias = f"replica_{index}"
+    DATABASES[alias] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": port or DATABASES["default"]["PORT"],
+        "TEST": {"MIRROR": "default"},
+    }
+    DATABASE_REPLICAS.append(alias)
+
+# Branches kept on their own database (same server and credentials),
+# given as <branch id>:<database name>
+BRANCH_DATABASES = {}
+
+for entry in filter(None, os.getenv("POSTGRES_BRANCH_DATABASES", "").split(",")):
+    branch_id, _, name = entry.strip().partition(":")
+    alias = f"branch_{branch_id}"
+    DATABASES[alias] = {**DATABASES["default"], "NAME": name}
+    BRANCH_DATABASES[int(branch_id)] = alias
+
+# Apps whose rows live on the database of their branch
+BRANCH_ROUTED_APPS = ("books", "borrowings")
+
+DATABASE_ROUTERS = [
+    "library_service.db_router.BranchRouter",
+    "library_service.db_router.ReplicaRouter",
+]
+
+# Apps whose safe-method reads may be served by a replica
+REPLICA_ROUTED_APPS = ("books", "borrowings")
+
+# How long a client reads from the primary after a write
+REPLICA_PIN_SECONDS = int(os.getenv("REPLICA_PIN_SECONDS", "5"))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", ""),
     }
 }
 
+# Analytics dashboards are cached until the next rollup refresh, or this long
+ANALYTICS_CACHE_SECONDS = int(os.getenv("ANALYTICS_CACHE_SECONDS", 3600))
+
+# Related books kept per book, and readers two books need in common to be related
+RELATED_BOOKS_LIMIT = int(os.getenv("RELATED_BOOKS_LIMIT", 20))
+RELATED_BOOKS_MIN_READERS = int(os.getenv("RELATED_BOOKS_MIN_READERS", 2))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -115,6 +204,37 @@ AUTH_PASSWORD_VALIDATORS = [
     },
 ]
 
+# Preferred password hasher: "scrypt", "argon2" (needs argon2-cffi) or "pbkdf2".
+# Hashes made by the others are still accepted and upgraded on the next login.
+PASSWORD_HASHER_PROFILES = {
+    "scrypt": "users.hashers.ScryptPasswordHasher",
+    "argon2": "users.hashers.Argon2PasswordHasher",
+    "pbkdf2": "django.contrib.auth.hashers.PBKDF2PasswordHasher",
+}
+PASSWORD_HASHER = os.getenv("PASSWORD_HASHER", "scrypt")
+PASSWORD_HASHERS = [
+    PASSWORD_HASHER_PROFILES[PASSWORD_HASHER],
+    *(
+        hasher
+        for profile, hasher in PASSWORD_HASHER_PROFILES.items()
+        if profile != PASSWORD_HASHER
+    ),
+]
+
+AUTHENTICATION_BACKENDS = ["users.backends.PooledHashingBackend"]
+
+# Passwords hashed at the same time per process, each scrypt hash takes 32 MiB
+PASSWORD_HASHING_WORKERS = int(
+    os.getenv("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)
+)
+
+# Threads per process hashing the passwords of the bulk endpoint, apart from
+# the login pool so an import doesn't queue logins behind it
+PROVISIONING_HASHING_WORKERS = int(os.getenv("PROVISIONING_HASHING_WORKERS", 1))
+
+# How long /api/users/me/ is cached, writes to the user drop it earlier
+USER_CACHE_SECONDS = int(os.getenv("USER_CACHE_SECONDS", 300))
+
 
 # Internationalization
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
@@ -141,17 +261,27 @@ STATIC_URL = "static/"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "utils.throttling.ScopedThrottle",
+        "utils.throttling.AnonThrottle",
+        "utils.throttling.UserThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "10/day", "user": "30/day"},
+    # "anon" and "user" cover views without a `throttle_scope`
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "10/day",
+        "user": "30/day",
+        "catalog": os.getenv("THROTTLE_CATALOG_RATE", "120/min"),
+        "borrow": os.getenv("THROTTLE_BORROW_RATE", "30/hour"),
+        "token": os.getenv("THROTTLE_TOKEN_RATE", "10/min"),
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
 }
 
+if API_DOCS_ENABLED:
+    REST_FRAMEWORK["DEFAULT_SCHEMA_CLASS"] = "drf_spectacular.openapi.AutoSchema"
+
 SPECTACULAR_SETTINGS = {
     "TITLE": "Library Service API",
     "DESCRIPTION": "Easier way to borrow books and manage it.",
@@ -165,8 +295,119 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Telegram notifications for admins, sent only when a bot is configured
+TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
+TELEGRAM_NOTIFICATIONS_ENABLED = bool(TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID)
+TELEGRAM_MESSAGES_PER_MINUTE = 20  # Telegram's limit per chat
+
+# Admin notification channels, comma separated: telegram, webhook, log.
+# Events within NOTIFICATION_DIGEST_SECONDS are sent as one digest message.
+NOTIFICATION_CHANNELS = [
+    channel
+    for channel in os.getenv(
+        "NOTIFICATION_CHANNELS", "telegram" if TELEGRAM_NOTIFICATIONS_ENABLED else ""
+    ).split(",")
+    if channel
+]
+NOTIFICATION_DIGEST_SECONDS = float(os.getenv("NOTIFICATION_DIGEST_SECONDS", 10))
+NOTIFICATION_WEBHOOK_URL = os.getenv("NOTIFICATION_WEBHOOK_URL")
+WEBHOOK_MESSAGES_PER_MINUTE = 60
+
+# Background tasks: "database" queues them for `manage.py run_tasks` workers,
+# "thread" runs them in a thread pool of the web process (development),
+# "inline" runs them in the caller (tests).
+TASKS_BACKEND = os.getenv("TASKS_BACKEND", "thread")
+TASKS_THREADS = int(os.getenv("TASKS_THREADS", 2))
+TASKS_WORKER_CONCURRENCY = int(os.getenv("TASKS_WORKER_CONCURRENCY", 4))
+# A running task without a heartbeat for this long is assumed lost with its
+# worker and rerun, workers send one every third of it
+TASKS_VISIBILITY_TIMEOUT = int(os.getenv("TASKS_VISIBILITY_TIMEOUT", 600))
+TASKS_KEEP_DAYS = int(os.getenv("TASKS_KEEP_DAYS", 7))
+# Schedulers wait up to this long before claiming a due job, so replicas
+# started together don't all query at once
+SCHEDULER_JITTER_SECONDS = float(os.getenv("SCHEDULER_JITTER_SECONDS", 5))
+
+# Response compression, encodings in order of preference
+COMPRESSION_ENCODINGS = ["br", "zstd", "gzip"]
+COMPRESSION_LEVELS = {"br": 4, "zstd": 3, "gzip": 6}
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Cache-Control policies for views, see utils.cache_control.CacheControlMixin
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "60"))
+
+CACHE_CONTROL_POLICIES = {
+    "catalog": {
+        "anonymous": {"public": True, "max_age": CATALOG_CACHE_MAX_AGE},
+        "authenticated": {"private": True, "max_age": CATALOG_CACHE_MAX_AGE},
+        "vary": ("Authorization",),
+    },
+    "private": {
+        "anonymous": {"private": True, "no_store": True},
+        "authenticated": {"private": True, "no_store": True},
+        "vary": ("Authorization",),
+    },
+}
+
+# Returned borrowings older than this are moved to the archive table
+BORROWING_ARCHIVE_AFTER_MONTHS = int(os.getenv("BORROWING_ARCHIVE_AFTER_MONTHS", "12"))
+# Archived borrowings listed per response, older ones are linked as next pages
+BORROWING_ARCHIVE_PAGE_SIZE = int(os.getenv("BORROWING_ARCHIVE_PAGE_SIZE", "100"))
+
+# Responses to POSTs sent with an Idempotency-Key are replayed for retries
+# within IDEMPOTENCY_KEY_TTL seconds
+IDEMPOTENCY_KEY_TTL = int(os.getenv("IDEMPOTENCY_KEY_TTL", 24 * 60 * 60))
+IDEMPOTENCY_LOCK_SECONDS = 30
+
+# JSON logs on stderr, written by a background thread. Every request is logged
+# at INFO to `library_service.access`, slow requests and slow SQL as warnings.
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+SLOW_REQUEST_MS = int(os.getenv("SLOW_REQUEST_MS", 1000))
+SLOW_QUERY_MS = int(os.getenv("SLOW_QUERY_MS", 200))
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "json": {"()": "utils.log.JsonFormatter"},
+    },
+    "handlers": {
+        "queue": {
+            "class": "utils.log.QueueStreamHandler",
+            "formatter": "json",
+            "stream": "ext://sys.stderr",
+        },
+    },
+    "root": {"handlers": ["queue"], "level": LOG_LEVEL},
+    "loggers": {
+        "django": {"handlers": ["queue"], "level": LOG_LEVEL, "propagate": False},
+        "django.server": {"propagate": True},
+    },
+}
+
+# Request profiling, see ProfilingMiddleware. Off unless PROFILING_ENABLED.
+PROFILING_ENABLED = os.getenv("PROFILING_ENABLED", "False") == "True"
+PROFILING_DIR = os.getenv(
+    "PROFILING_DIR", os.path.join(tempfile.gettempdir(), "library_service_profiles")
+)
+PROFILING_MAX_FILES = int(os.getenv("PROFILING_MAX_FILES", 50))
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", 0))
+PROFILING_SLOW_MS = int(os.getenv("PROFILING_SLOW_MS", 500))
+PROFILING_INTERVAL_MS = 1
+
+# Admin changelists of tables bigger than this show an estimated row count
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100_000
+
+# Pre-built OpenAPI schema, see `python manage.py build_schema`
+API_SCHEMA_ARTIFACT_DIR = BASE_DIR / "api_docs" / "artifacts"
+API_SCHEMA_MAX_AGE = int(os.getenv("API_SCHEMA_MAX_AGE", "300"))
+
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
-    "ROTATE_REFRESH_TOKENS": False,
+    # Each refresh returns a new refresh token and revokes the old one
+    "ROTATE_REFRESH_TOKENS": True,
+    "BLACKLIST_AFTER_ROTATION": True,
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "users.serializers.TokenRevokeSerializer",
 }
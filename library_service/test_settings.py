@@ -0,0 +1,21 @@
+"""
+Settings for the test suite, used by `python manage.py test`.
+
+Runs background tasks inline, only logs errors and puts a branch on an SQLite
+database of its own (see branches.tests), so the routing between databases
+runs without a second Postgres database.
+"""
+
+from library_service.settings import *  # noqa: F401,F403
+from library_service.settings import DATABASES, LOGGING
+
+DATABASES["branch_test"] = {
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": ":memory:",
+}
+
+TASKS_BACKEND = "inline"
+
+LOG_LEVEL = "ERROR"
+LOGGING["root"]["level"] = LOG_LEVEL
+LOGGING["loggers"]["django"]["level"] = LOG_LEVEL
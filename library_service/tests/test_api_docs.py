@@ -0,0 +1,42 @@
+import os
+import subprocess
+import sys
+
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework import status
+
+
+class ApiDocsTests(TestCase):
+    def test_schema_served(self):
+        """Test that the lazily loaded schema view serves the OpenAPI schema."""
+        res = self.client.get(reverse("schema"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(b"Library Service API", res.content)
+
+    def test_swagger_ui_served(self):
+        """Test that Swagger UI is served and points at the schema."""
+        res = self.client.get(reverse("swagger-ui"))
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertIn(reverse("schema").encode(), res.content)
+
+
+class ApiDocsDisabledTests(SimpleTestCase):
+    def test_boot_without_docs_skips_drf_spectacular(self):
+        """Test that a worker boot without the API docs doesn't import them."""
+        boot = (
+            "import sys, django; django.setup(); import library_service.urls; "
+            "from library_service.wsgi import application; "
+            "print(sorted(m for m in sys.modules if m.startswith('drf_spectacular')))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", boot],
+            env={**os.environ, "API_DOCS_ENABLED": "False"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        self.assertEqual(result.stdout.strip(), "[]")
@@ -0,0 +1,60 @@
+import gzip
+
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from library_service.middleware import CompressionMiddleware
+
+BODY = b'{"title": "Sample Book", "author": "John Doe"}' * 100
+
+
+@override_settings(COMPRESSION_ENCODINGS=["gzip"], COMPRESSION_MIN_SIZE=1024)
+class CompressionMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def get_response(self, body=BODY, accept_encoding="gzip, deflate, br", **headers):
+        def view(request):
+            response = HttpResponse(body, content_type="application/json")
+            for name, value in headers.items():
+                response[name] = value
+            return response
+
+        request = self.factory.get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+        return CompressionMiddleware(view)(request)
+
+    def test_large_response_compressed(self):
+        """Test that responses above the threshold are compressed."""
+        res = self.get_response()
+
+        self.assertEqual(res["Content-Encoding"], "gzip")
+        self.assertEqual(gzip.decompress(res.content), BODY)
+        self.assertEqual(res["Content-Length"], str(len(res.content)))
+        self.assertIn("Accept-Encoding", res["Vary"])
+
+    def test_small_response_not_compressed(self):
+        """Test that responses below the threshold are sent as is."""
+        res = self.get_response(body=b"{}")
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+        self.assertEqual(res.content, b"{}")
+
+    def test_client_without_support_gets_identity(self):
+        """Test that clients not accepting any encoding get plain content."""
+        res = self.get_response(accept_encoding="gzip;q=0, identity")
+
+        self.assertFalse(res.has_header("Content-Encoding"))
+        self.assertEqual(res.content, BODY)
+
+    def test_already_encoded_response_untouched(self):
+        """Test that pre-compressed responses are not compressed again."""
+        res = self.get_response(**{"Content-Encoding": "br"})
+
+        self.assertEqual(res["Content-Encoding"], "br")
+        self.assertEqual(res.content, BODY)
+
+    def test_strong_etag_weakened(self):
+        """Test that a strong ETag becomes weak for the compressed variant."""
+        res = self.get_response(ETag='"abc"')
+
+        self.assertEqual(res["ETag"], 'W/"abc"')
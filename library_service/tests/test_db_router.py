@@ -0,0 +1,113 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TransactionTestCase,
+    override_settings,
+)
+
+from books.models import Book
+from borrowings.models import Borrowing
+from library_service.db_router import ReplicaRouter, read_from
+from library_service.middleware import ReplicaPinningMiddleware
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaRouterTests(SimpleTestCase):
+    databases = {"default"}
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_outside_request_use_primary(self):
+        """Test that reads without a chosen replica use the primary."""
+        self.assertIsNone(self.router.db_for_read(Book))
+
+    def test_replicated_apps_read_from_replica(self):
+        """Test that books and borrowings reads go to the chosen replica."""
+        with read_from("replica_1"):
+            self.assertEqual(self.router.db_for_read(Book), "replica_1")
+            self.assertEqual(self.router.db_for_read(Borrowing), "replica_1")
+
+    def test_other_apps_read_from_primary(self):
+        """Test that users are always read from the primary."""
+        with read_from("replica_1"):
+            self.assertIsNone(self.router.db_for_read(get_user_model()))
+
+    def test_writes_use_primary(self):
+        """Test that writes never go to a replica."""
+        with read_from("replica_1"):
+            self.assertEqual(self.router.db_for_write(Book), "default")
+
+    def test_reads_inside_transaction_use_primary(self):
+        """Test that reads inside an atomic block stay on the primary."""
+        with read_from("replica_1"), transaction.atomic():
+            self.assertEqual(self.router.db_for_read(Book), "default")
+
+    def test_no_migrations_on_replicas(self):
+        """Test that migrations are not applied to replicas."""
+        self.assertFalse(self.router.allow_migrate("replica_1", "books"))
+        self.assertIsNone(self.router.allow_migrate("default", "books"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica_1"])
+class ReplicaPinningMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.router = ReplicaRouter()
+        self.read_aliases = []
+
+        def view(request):
+            self.read_aliases.append(self.router.db_for_read(Book))
+            return HttpResponse()
+
+        self.middleware = ReplicaPinningMiddleware(view)
+
+    def test_safe_requests_read_from_replica(self):
+        """Test that GET requests are served by a replica."""
+        self.middleware(self.factory.get("/api/books/"))
+
+        self.assertEqual(self.read_aliases, ["replica_1"])
+
+    def test_client_pinned_to_primary_after_write(self):
+        """Test read-your-writes: a read after a write uses the primary."""
+        auth = {"HTTP_AUTHORIZATION": "Bearer writer"}
+        self.middleware(
+            self.factory.post("/api/borrowings/1/return_borrowing/", **auth)
+        )
+        self.middleware(self.factory.get("/api/borrowings/", **auth))
+
+        self.assertEqual(self.read_aliases, [None, None])
+
+    def test_pin_is_per_client(self):
+        """Test that a write pins only the client that made it."""
+        self.middleware(
+            self.factory.post("/api/borrowings/", HTTP_AUTHORIZATION="Bearer writer")
+        )
+        self.middleware(
+            self.factory.get("/api/borrowings/", HTTP_AUTHORIZATION="Bearer reader")
+        )
+
+        self.assertEqual(self.read_aliases[-1], "replica_1")
+
+
+@skipUnless(settings.DATABASE_REPLICAS, "No read replicas configured")
+class ReplicaReadTests(TransactionTestCase):
+    databases = {"default", *settings.DATABASE_REPLICAS}
+
+    def test_books_listed_from_replica(self):
+        """Test that the catalog can be listed through a replica connection."""
+        Book.objects.create(title="Replicated", author="Author", inventory=1)
+        alias = settings.DATABASE_REPLICAS[0]
+
+        with read_from(alias):
+            books = list(Book.objects.all())
+
+        self.assertEqual([book._state.db for book in books], [alias])
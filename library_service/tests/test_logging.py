@@ -0,0 +1,71 @@
+import io
+import json
+import logging
+
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from books.models import Book
+from utils.log import JsonFormatter, QueueStreamHandler
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class JsonLoggingTests(SimpleTestCase):
+    def test_queue_handler_writes_json_lines(self):
+        """Test that records are written as JSON with their extra fields."""
+        stream = io.StringIO()
+        handler = QueueStreamHandler(stream)
+        handler.setFormatter(JsonFormatter())
+        logger = logging.getLogger("library_service.tests.json")
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        self.addCleanup(logger.removeHandler, handler)
+
+        logger.warning("Returned %s books", 3, extra={"user_id": 7})
+        handler.close()
+
+        entry = json.loads(stream.getvalue())
+        self.assertEqual(entry["message"], "Returned 3 books")
+        self.assertEqual(entry["level"], "WARNING")
+        self.assertEqual(entry["user_id"], 7)
+
+
+class AccessLogTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        Book.objects.create(title="Book", author="Author", inventory=1)
+
+    def test_request_logged(self):
+        """Test that requests are logged with view, user, status and queries."""
+        self.client.force_authenticate(self.user)
+
+        with self.assertLogs("library_service.access", "INFO") as logs:
+            self.client.get(BOOKS_URL)
+
+        [record] = logs.records
+        self.assertEqual(record.view, "books:book-list")
+        self.assertEqual(record.user_id, self.user.id)
+        self.assertEqual(record.status, 200)
+        self.assertEqual(record.queries, 1)
+        self.assertGreater(record.latency_ms, 0)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_request_logged_as_warning(self):
+        """Test that requests over the threshold are warnings."""
+        with self.assertLogs("library_service.access", "INFO") as logs:
+            self.client.get(BOOKS_URL)
+
+        self.assertEqual(logs.records[0].levelno, logging.WARNING)
+
+    @override_settings(SLOW_QUERY_MS=0)
+    def test_slow_query_logged(self):
+        """Test that queries over the threshold are logged with their SQL."""
+        with self.assertLogs("library_service.db.slow", "WARNING") as logs:
+            self.client.get(BOOKS_URL)
+
+        self.assertIn("books_book", logs.records[0].sql)
@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from utils.notifier import (
+    Notifier,
+    SharedRateLimit,
+    TelegramTransport,
+    Transport,
+    WebhookTransport,
+    build_digest,
+)
+
+
+class FakeEndpoint(ThreadingHTTPServer):
+    """Local HTTP server recording JSON bodies, optionally answering 429 first."""
+
+    def __init__(self, rate_limit_first=0):
+        super().__init__(("127.0.0.1", 0), FakeHandler)
+        self.received = []
+        self.paths = []
+        self.rate_limit_first = rate_limit_first
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.server.rate_limit_first:
+            self.server.rate_limit_first -= 1
+            self._reply(429, {"ok": False, "parameters": {"retry_after": 0.05}})
+            return
+        self.server.paths.append(self.path)
+        self.server.received.append(body)
+        self._reply(200, {"ok": True})
+
+    def _reply(self, status, payload):
+        content = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingTransport(Transport):
+    def __init__(self, max_length=None):
+        self.max_length = max_length
+        self.sent = []
+
+    def send(self, text):
+        self.sent.append(text)
+
+
+class NotifierTests(SimpleTestCase):
+    def setUp(self):
+        self.endpoint = FakeEndpoint()
+        threading.Thread(target=self.endpoint.serve_forever, daemon=True).start()
+        self.addCleanup(self.endpoint.server_close)
+        self.addCleanup(self.endpoint.shutdown)
+
+    def test_events_in_window_sent_as_one_digest(self):
+        """Test that events within the window are coalesced into one message."""
+        transport = TelegramTransport("token", "chat", api_url=self.endpoint.url)
+        notifier = Notifier([(transport, None)], window=0.1)
+
+        for index in range(5):
+            notifier.notify(f"Borrowing {index}")
+        time.sleep(0.3)
+
+        self.assertEqual(self.endpoint.paths, ["/bottoken/sendMessage"])
+        message = self.endpoint.received[0]
+        self.assertEqual(message["chat_id"], "chat")
+        self.assertTrue(message["text"].startswith("5 new notifications:"))
+        self.assertIn("Borrowing 4", message["text"])
+
+    def test_all_channels_receive_digest(self):
+        """Test that every configured channel gets the digest."""
+        recording = RecordingTransport()
+        webhook = WebhookTransport(self.endpoint.url)
+        notifier = Notifier([(webhook, None), (recording, None)], window=10)
+
+        notifier.notify("Borrowing created")
+        notifier.flush()
+
+        self.assertEqual(self.endpoint.received, [{"text": "Borrowing created"}])
+        self.assertEqual(recording.sent, ["Borrowing created"])
+
+    def test_rate_limited_message_retried(self):
+        """Test that a 429 from the channel is retried after retry_after."""
+        self.endpoint.rate_limit_first = 1
+        transport = TelegramTransport("token", "chat", api_url=self.endpoint.url)
+        notifier = Notifier([(transport, None)], window=10)
+
+        notifier.notify("Borrowing created")
+        notifier.flush()
+
+        self.assertEqual(len(self.endpoint.received), 1)
+
+    def test_failing_channel_does_not_raise(self):
+        """Test that an unreachable channel is logged, not raised."""
+        self.endpoint.shutdown()
+        self.endpoint.server_close()
+        notifier = Notifier([(WebhookTransport(self.endpoint.url, 0.5), None)], 10)
+        notifier.notify("Borrowing created")
+
+        with self.assertLogs("utils.notifier", "ERROR"):
+            notifier.flush()
+
+    def test_rate_limit_spaces_sends(self):
+        """Test that a channel's rate limit spaces out its messages."""
+        cache.clear()
+        recording = RecordingTransport(max_length=20)
+        limit = SharedRateLimit("test", 2, per=0.2)
+        notifier = Notifier([(recording, limit)], window=10)
+        for index in range(4):
+            notifier.notify(f"Borrowing {index:08}")
+
+        start = time.monotonic()
+        notifier.flush()
+
+        # A header and four events in messages of 20 characters at most
+        self.assertEqual(len(recording.sent), 5)
+        self.assertGreaterEqual(time.monotonic() - start, 0.25)
+
+
+class SharedRateLimitTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_shared_between_instances(self):
+        """Test that limits with the same name share one budget."""
+        now = [150.0]
+        first = SharedRateLimit("test", 3, per=60, clock=lambda: now[0])
+        second = SharedRateLimit("test", 3, per=60, clock=lambda: now[0])
+
+        waits = [first.acquire(), second.acquire(), first.acquire(), second.acquire()]
+
+        self.assertEqual(waits[:3], [0, 0, 0])
+        self.assertAlmostEqual(waits[3], 30.0)
+        self.assertEqual(SharedRateLimit("other", 3).acquire(), 0)
+
+    def test_no_burst_across_window_boundary(self):
+        """Test that a full window still counts at the start of the next."""
+        now = [179.0]
+        limit = SharedRateLimit("test", 3, per=60, clock=lambda: now[0])
+        for _ in range(3):
+            self.assertEqual(limit.acquire(), 0)
+
+        now[0] = 180.0
+        self.assertAlmostEqual(limit.acquire(), 20.0)
+        now[0] = 210.0
+        self.assertEqual(limit.acquire(), 0)
+        self.assertGreater(limit.acquire(), 0)
+
+
+class BuildDigestTests(SimpleTestCase):
+    def test_single_event_sent_as_is(self):
+        """Test that a lone event is not wrapped in a digest header."""
+        self.assertEqual(build_digest(["Borrowing created"]), ["Borrowing created"])
+
+    def test_split_at_max_length(self):
+        """Test that long digests are split between events."""
+        messages = build_digest(["a" * 30, "b" * 30, "c" * 30], max_length=70)
+
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(all(len(message) <= 70 for message in messages))
+        self.assertTrue(messages[1].endswith("c" * 30))
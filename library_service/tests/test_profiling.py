@@ -0,0 +1,86 @@
+import json
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from books.models import Book
+
+BOOKS_URL = reverse("books:book-list")
+
+
+class ProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.profile_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.profile_dir.cleanup)
+        settings_override = override_settings(
+            PROFILING_ENABLED=True,
+            PROFILING_DIR=self.profile_dir.name,
+            PROFILING_SAMPLE_RATE=0,
+            PROFILING_MAX_FILES=2,
+        )
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        Book.objects.create(title="Book", author="Author", inventory=1)
+
+    def authenticate(self, is_staff):
+        user = get_user_model().objects.create_user(
+            f"staff{is_staff}@test.com", "testpass", is_staff=is_staff
+        )
+        token = RefreshToken.for_user(user).access_token
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+
+    def profiles(self):
+        return sorted(Path(self.profile_dir.name).glob("*.speedscope.json"))
+
+    def test_staff_profile_on_demand(self):
+        """Test that staff get a speedscope profile with the SQL timeline."""
+        self.authenticate(is_staff=True)
+
+        res = self.client.get(BOOKS_URL, HTTP_X_PROFILE="1")
+
+        [path] = self.profiles()
+        self.assertEqual(res["X-Profile"], path.name.removesuffix(".speedscope.json"))
+        profile = json.loads(path.read_text())
+        cpu, sql = profile["profiles"]
+        self.assertEqual(cpu["type"], "sampled")
+        self.assertEqual(len(cpu["samples"]), len(cpu["weights"]))
+        self.assertEqual(sql["type"], "evented")
+        queries = [
+            profile["shared"]["frames"][e["frame"]]["name"] for e in sql["events"]
+        ]
+        self.assertTrue(any("books_book" in query for query in queries))
+        self.assertTrue(path.with_name(res["X-Profile"] + ".collapsed.txt").exists())
+
+    def test_non_staff_not_profiled(self):
+        """Test that the profile flag is ignored for regular users."""
+        self.authenticate(is_staff=False)
+
+        res = self.client.get(BOOKS_URL, {"profile": "1"})
+
+        self.assertNotIn("X-Profile", res)
+        self.assertEqual(self.profiles(), [])
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_SLOW_MS=0)
+    def test_slow_sampled_requests_kept_with_rotation(self):
+        """Test that slow sampled requests are saved, keeping the newest files."""
+        for _ in range(3):
+            self.client.get(BOOKS_URL)
+
+        self.assertEqual(len(self.profiles()), 2)
+        self.assertEqual(
+            len(list(Path(self.profile_dir.name).glob("*.collapsed.txt"))), 2
+        )
+
+    @override_settings(PROFILING_SAMPLE_RATE=1, PROFILING_SLOW_MS=60_000)
+    def test_fast_sampled_requests_discarded(self):
+        """Test that sampled requests under the threshold aren't saved."""
+        self.client.get(BOOKS_URL)
+
+        self.assertEqual(self.profiles(), [])
@@ -0,0 +1,94 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient, APIRequestFactory
+
+from utils.throttling import ScopedThrottle, SlidingWindowThrottle
+
+BOOKS_URL = reverse("books:book-list")
+TOKEN_URL = reverse("users:token_obtain_pair")
+
+
+class FixedClockThrottle(SlidingWindowThrottle):
+    rate = "10/min"
+    now = 6000.0  # start of a window
+
+    def timer(self):
+        return self.now
+
+    def get_cache_key(self, request, view):
+        return "throttle_test_client"
+
+
+class SlidingWindowThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.request = APIRequestFactory().get("/")
+
+    def allowed(self, at):
+        throttle = FixedClockThrottle()
+        throttle.now = at
+        return throttle.allow_request(self.request, None), throttle
+
+    def test_limit_within_window(self):
+        """Test that requests over the rate in one window are rejected."""
+        results = [self.allowed(6000.0 + i)[0] for i in range(11)]
+
+        self.assertEqual(results, [True] * 10 + [False])
+
+    def test_previous_window_weighted(self):
+        """Test that the previous window counts in proportion to its overlap."""
+        for i in range(10):
+            self.allowed(6000.0 + i)
+
+        # 30s into the next window half of the previous 10 still count
+        results = [self.allowed(6090.0)[0] for _ in range(6)]
+
+        self.assertEqual(results, [True] * 5 + [False])
+
+    def test_rejected_requests_not_counted(self):
+        """Test that hammering a full bucket doesn't extend the block."""
+        for i in range(15):
+            self.allowed(6000.0 + i)
+
+        self.assertEqual(cache.get("throttle_test_client:100"), 10)
+
+    def test_wait(self):
+        """Test that the wait is the time until one request fits again."""
+        for i in range(10):
+            self.allowed(6000.0 + i)
+
+        for _ in range(6):
+            allowed, throttle = self.allowed(6090.0)
+
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(throttle.wait(), 6.0)
+
+
+class ScopedThrottleTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_catalog_has_own_bucket(self):
+        """Test that catalog reads don't use up the anonymous daily rate."""
+        rates = {**ScopedThrottle.THROTTLE_RATES, "anon": "1/day", "catalog": "3/min"}
+        with mock.patch.object(ScopedThrottle, "THROTTLE_RATES", rates):
+            codes = [self.client.get(BOOKS_URL).status_code for _ in range(4)]
+
+        self.assertEqual(codes, [200, 200, 200, 429])
+
+    def test_token_issuance_throttled(self):
+        """Test that token requests are limited by the token scope."""
+        get_user_model().objects.create_user("test@test.com", "testpass")
+        payload = {"email": "test@test.com", "password": "testpass"}
+        rates = {**ScopedThrottle.THROTTLE_RATES, "token": "2/min"}
+        with mock.patch.object(ScopedThrottle, "THROTTLE_RATES", rates):
+            codes = [self.client.post(TOKEN_URL, payload).status_code for _ in range(3)]
+
+        self.assertEqual(codes[-1], status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(codes[:2], [status.HTTP_200_OK] * 2)
@@ -15,22 +15,34 @@ Including another URLconf
     2. Add a URL to urlpatterns:  path('blog/', include('blog.urls'))
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularSwaggerView,
-)
+
+from utils.lazy import lazy_view
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
-    path(
-        "api/doc/swagger/",
-        SpectacularSwaggerView.as_view(url_name="schema"),
-        name="swagger-ui",
-    ),
     path("api/books/", include("books.urls", namespace="books")),
     path("api/users/", include("users.urls", namespace="users")),
     path("api/borrowings/", include("borrowings.urls", namespace="borrowings")),
+    path("api/analytics/", include("analytics.urls", namespace="analytics")),
+    path("api/tasks/", include("tasks.urls", namespace="tasks")),
 ]
+
+if settings.API_DOCS_ENABLED:
+    # drf_spectacular is heavy to import, load it on the first docs request
+    urlpatterns += [
+        path(
+            "api/schema/",
+            lazy_view("api_docs.views.CachedSchemaView"),
+            name="schema",
+        ),
+        path(
+            "api/doc/swagger/",
+            lazy_view(
+                "drf_spectacular.views.SpectacularSwaggerView", url_name="schema"
+            ),
+            name="swagger-ui",
+        ),
+    ]
@@ -0,0 +1,36 @@
+from django.contrib import admin
+
+from tasks.models import JobRun, QueuedTask
+from utils.paginators import EstimatedCountPaginator
+
+
+@admin.register(QueuedTask)
+class QueuedTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        "id",
+        "name",
+        "status",
+        "attempts",
+        "run_after",
+        "started_at",
+        "finished_at",
+    )
+    list_filter = ("status",)
+    search_fields = ("=id", "name")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(JobRun)
+class JobRunAdmin(admin.ModelAdmin):
+    list_display = (
+        "job",
+        "scheduled_for",
+        "status",
+        "host",
+        "duration_ms",
+        "finished_at",
+    )
+    list_filter = ("status", "job")
+    search_fields = ("job",)
+    date_hierarchy = "started_at"
@@ -0,0 +1,155 @@
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from tasks.models import QueuedTask
+
+logger = logging.getLogger("library_service.tasks")
+
+
+def execute(task, args, kwargs, attempt, due):
+    """Run one attempt of a task and log its wait and run time."""
+    started = timezone.now()
+    start = time.perf_counter()
+    extra = {
+        "task": task.name,
+        "attempt": attempt,
+        "wait_ms": round(max((started - due).total_seconds(), 0) * 1000, 2),
+    }
+    try:
+        task(*args, **kwargs)
+    except Exception:
+        extra["run_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        logger.exception("Task %s failed", task.name, extra=extra)
+        raise
+    extra["run_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    logger.info("Task %s done", task.name, extra=extra)
+    return extra
+
+
+class InlineBackend:
+    """Run tasks right away in the caller, errors included. For tests."""
+
+    def enqueue(self, task, args, kwargs, countdown):
+        task(*args, **kwargs)
+
+    def metrics(self):
+        return {"backend": "inline"}
+
+
+class ThreadBackend:
+    """
+    Run tasks in a thread pool of this process once the transaction that
+    queued them commits. For development: queued tasks are lost on exit.
+    """
+
+    def __init__(self, workers):
+        self.executor = ThreadPoolExecutor(workers, thread_name_prefix="task")
+        self.lock = threading.Lock()
+        self.counts = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        self.recent = deque(maxlen=1000)  # (wait_ms, run_ms) of finished tasks
+
+    def enqueue(self, task, args, kwargs, countdown):
+        transaction.on_commit(lambda: self.submit(task, args, kwargs, countdown, 1))
+
+    def submit(self, task, args, kwargs, countdown, attempt):
+        with self.lock:
+            self.counts["queued"] += 1
+        due = timezone.now() + timedelta(seconds=countdown)
+        if countdown > 0:
+            timer = threading.Timer(
+                countdown,
+                self.executor.submit,
+                (self.run, task, args, kwargs, attempt, due),
+            )
+            timer.daemon = True
+            timer.start()
+        else:
+            self.executor.submit(self.run, task, args, kwargs, attempt, due)
+
+    def run(self, task, args, kwargs, attempt, due):
+        with self.lock:
+            self.counts["queued"] -= 1
+            self.counts["running"] += 1
+        try:
+            timings = execute(task, args, kwargs, attempt, due)
+        except Exception:
+            if attempt < task.max_attempts:
+                self.submit(task, args, kwargs, task.backoff(attempt), attempt + 1)
+                outcome = None
+            else:
+                outcome = "failed"
+        else:
+            outcome = "done"
+            with self.lock:
+                self.recent.append((timings["wait_ms"], timings["run_ms"]))
+        finally:
+            close_old_connections()
+
+        with self.lock:
+            self.counts["running"] -= 1
+            if outcome:
+                self.counts[outcome] += 1
+
+    def metrics(self):
+        with self.lock:
+            recent = list(self.recent)
+            counts = dict(self.counts)
+        return {
+            "backend": "thread",
+            **counts,
+            "oldest_due_seconds": None,
+            "avg_wait_ms": _mean(wait for wait, _ in recent),
+            "avg_run_ms": _mean(run for _, run in recent),
+        }
+
+
+class DatabaseBackend:
+    """Store tasks as QueuedTask rows, run by `manage.py run_tasks` workers."""
+
+    def enqueue(self, task, args, kwargs, countdown):
+        # Saved in the caller's transaction: a rolled back request queues nothing
+        return QueuedTask.objects.create(
+            name=task.name,
+            args=args,
+            kwargs=kwargs,
+            max_attempts=task.max_attempts,
+            run_after=timezone.now() + timedelta(seconds=countdown),
+        )
+
+    def metrics(self):
+        from tasks.worker import queue_metrics
+
+        return {"backend": "database", **queue_metrics()}
+
+
+def _mean(values):
+    values = list(values)
+    return round(sum(values) / len(values), 2) if values else None
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend():
+    """The backend named by TASKS_BACKEND, one instance per process."""
+    name = settings.TASKS_BACKEND
+    with _backends_lock:
+        if name not in _backends:
+            if name == "inline":
+                _backends[name] = InlineBackend()
+            elif name == "thread":
+                _backends[name] = ThreadBackend(settings.TASKS_THREADS)
+            elif name == "database":
+                _backends[name] = DatabaseBackend()
+            else:
+                raise ValueError(f"Unknown task backend: {name}")
+        return _backends[name]
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+# (name, lowest, highest) of the five fields, weekday 0 and 7 are Sunday
+FIELDS = (
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 7),
+)
+
+
+def parse_field(text, name, low, high):
+    """Values matched by one field: `*`, `5`, `1-5`, `*/15`, `1-30/2`, lists."""
+    values = set()
+    for item in text.split(","):
+        spec, _, step = item.partition("/")
+        if spec == "*":
+            start, end = low, high
+        elif "-" in spec:
+            start, end = (int(value) for value in spec.split("-", 1))
+        else:
+            start = end = int(spec)
+        step = int(step) if step else 1
+        if not low <= start <= end <= high or step < 1:
+            raise ValueError(f"Invalid {name} field in cron expression: {text}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+class CronExpression:
+    """A five-field cron expression (minute hour day month weekday)."""
+
+    def __init__(self, expression):
+        self.expression = expression
+        parts = ALIASES.get(expression.strip(), expression).split()
+        if len(parts) != 5:
+            raise ValueError(f"A cron expression has five fields: {expression}")
+
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            parse_field(part, *field) for part, field in zip(parts, FIELDS)
+        )
+        self.weekdays = frozenset(weekday % 7 for weekday in weekdays)
+        # Like cron, a day matches either field when both are restricted
+        self.any_day = parts[2].startswith("*")
+        self.any_weekday = parts[4].startswith("*")
+
+    def matches_day(self, moment):
+        in_days = moment.day in self.days
+        in_weekdays = (moment.weekday() + 1) % 7 in self.weekdays
+        if self.any_day or self.any_weekday:
+            return in_days and in_weekdays
+        return in_days or in_weekdays
+
+    def next_after(self, moment):
+        """The first matching minute after `moment`, in its timezone."""
+        moment = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        for _ in range(366 * 5):
+            if moment.month in self.months and self.matches_day(moment):
+                for hour in sorted(hour for hour in self.hours if hour >= moment.hour):
+                    first = moment.minute if hour == moment.hour else 0
+                    for minute in sorted(self.minutes):
+                        if minute >= first:
+                            return moment.replace(hour=hour, minute=minute)
+            moment = (moment + timedelta(days=1)).replace(hour=0, minute=0)
+        raise ValueError(f"Cron expression never matches: {self.expression}")
+
+    def __str__(self):
+        return self.expression
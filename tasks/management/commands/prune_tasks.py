@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from tasks.worker import prune_finished
+
+
+class Command(BaseCommand):
+    """Django command to delete finished tasks from the queue table."""
+
+    help = "Delete done and failed tasks finished more than --days days ago."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.TASKS_KEEP_DAYS,
+            help="Keep tasks finished within this many days.",
+        )
+
+    def handle(self, *args, **options):
+        older_than = timezone.now() - timedelta(days=options["days"])
+        pruned = prune_finished(older_than)
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} finished tasks."))
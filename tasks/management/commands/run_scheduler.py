@@ -0,0 +1,58 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from tasks.schedule import schedule
+from tasks.scheduler import Scheduler
+
+
+class Command(BaseCommand):
+    """Django command to run the periodic jobs on their cron schedules."""
+
+    help = (
+        "Run registered periodic jobs until stopped. Any number of schedulers "
+        "may run, each job slot runs once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--list",
+            action="store_true",
+            help="List the periodic jobs and their next run, then exit.",
+        )
+        parser.add_argument(
+            "--max-sleep",
+            type=float,
+            default=60.0,
+            help="Longest wait between checks for due jobs, in seconds.",
+        )
+
+    def handle(self, *args, **options):
+        if not schedule:
+            raise CommandError("No periodic jobs are registered.")
+        scheduler = Scheduler(schedule.values())
+
+        if options["list"]:
+            for job in scheduler.jobs:
+                self.stdout.write(
+                    f"{job.name}  {job.cron}  next {scheduler.next_slots[job.name]}"
+                )
+            return
+
+        stopping = threading.Event()
+        scheduler.sleep = stopping.wait
+        previous = {
+            signum: signal.signal(signum, lambda *_: stopping.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            while not stopping.is_set():
+                # Drop a connection that went stale while sleeping
+                close_old_connections()
+                scheduler.run_pending()
+                stopping.wait(min(scheduler.seconds_until_next(), options["max_sleep"]))
+        finally:
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
@@ -0,0 +1,78 @@
+import signal
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from tasks.worker import claim, keeping_alive, run_queued
+
+
+def run_in_thread(queued):
+    try:
+        run_queued(queued)
+    finally:
+        # Pool threads keep their connection, recycle it like a request would
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    """Django command to run the tasks queued in the database."""
+
+    help = "Run queued tasks until stopped (SIGTERM/SIGINT finish the current batch)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.TASKS_WORKER_CONCURRENCY,
+            help="Tasks run at the same time, in threads.",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before looking again when no task is due.",
+        )
+        parser.add_argument(
+            "--burst",
+            action="store_true",
+            help="Exit once no task is due instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        stopping = threading.Event()
+        previous = {
+            signum: signal.signal(signum, lambda *_: stopping.set())
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+
+        concurrency = options["concurrency"]
+        # With a concurrency of 1 tasks run in this thread, without a pool
+        pool = ThreadPoolExecutor(concurrency) if concurrency > 1 else None
+        ran = 0
+        try:
+            while not stopping.is_set():
+                batch = claim(concurrency, settings.TASKS_VISIBILITY_TIMEOUT)
+                if not batch:
+                    if options["burst"]:
+                        break
+                    stopping.wait(options["poll_interval"])
+                    continue
+
+                # Heartbeats keep long tasks from being claimed again
+                with keeping_alive(batch, settings.TASKS_VISIBILITY_TIMEOUT / 3):
+                    if pool:
+                        list(pool.map(run_in_thread, batch))
+                    else:
+                        for queued in batch:
+                            run_queued(queued)
+                ran += len(batch)
+        finally:
+            if pool:
+                pool.shutdown()
+            for signum, handler in previous.items():
+                signal.signal(signum, handler)
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} tasks."))
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:44
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def start_heartbeats(apps, schema_editor):
+    # Tasks running during the upgrade count from their start, as before
+    QueuedTask = apps.get_model("tasks", "QueuedTask")
+    QueuedTask.objects.filter(status="RUNNING").update(heartbeat_at=F("started_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tasks", "0002_jobrun"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="queuedtask",
+            name="queuedtask_running_idx",
+        ),
+        migrations.AddField(
+            model_name="queuedtask",
+            name="heartbeat_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.RunPython(start_heartbeats, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name="queuedtask",
+            index=models.Index(
+                condition=models.Q(("status", "RUNNING")),
+                fields=["heartbeat_at"],
+                name="queuedtask_heartbeat_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+from django.db import models
+
+
+class QueuedTask(models.Model):
+    """A task call waiting for, or run by, the `run_tasks` worker."""
+
+    QUEUED = "QUEUED"
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+    ]
+
+    name = models.CharField(max_length=255)
+    args = models.JSONField(default=list)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Touched by the worker while the task runs, a stale one means it died
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            # Due tasks, claimed oldest first by the workers
+            models.Index(
+                fields=["run_after", "id"],
+                condition=models.Q(status="QUEUED"),
+                name="queuedtask_due_idx",
+            ),
+            # Running tasks, to find the ones a dead worker left behind
+            models.Index(
+                fields=["heartbeat_at"],
+                condition=models.Q(status="RUNNING"),
+                name="queuedtask_heartbeat_idx",
+            ),
+            models.Index(fields=["status", "finished_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.name} #{self.id} ({self.status})"
+
+
+class JobRun(models.Model):
+    """One run of a periodic job, claimed by the scheduler that created it."""
+
+    RUNNING = "RUNNING"
+    DONE = "DONE"
+    FAILED = "FAILED"
+    SKIPPED = "SKIPPED"
+    STATUS_CHOICES = [
+        (RUNNING, "Running"),
+        (DONE, "Done"),
+        (FAILED, "Failed"),
+        (SKIPPED, "Skipped, the previous run was still going"),
+    ]
+
+    job = models.CharField(max_length=255)
+    scheduled_for = models.DateTimeField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RUNNING)
+    host = models.CharField(max_length=255)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    duration_ms = models.FloatField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            # The first scheduler to insert the run of a slot is the one to run it
+            models.UniqueConstraint(
+                fields=["job", "scheduled_for"], name="unique_job_run_per_slot"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["started_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.job} at {self.scheduled_for} ({self.status})"
@@ -0,0 +1,57 @@
+import json
+from functools import update_wrapper
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+# Registered tasks by name, filled by @task when the app modules are imported
+registry = {}
+
+
+class Task:
+    """A function that can be queued to run outside the request."""
+
+    def __init__(self, func, name, max_attempts, retry_delay):
+        self.func = func
+        self.name = name
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        update_wrapper(self, func)
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def delay(self, *args, **kwargs):
+        """Queue a call with the given arguments."""
+        return self.enqueue(args, kwargs)
+
+    def enqueue(self, args=(), kwargs=None, countdown=0):
+        """Queue a call to run in `countdown` seconds at the earliest."""
+        from tasks.backends import get_backend
+
+        # Arguments go through JSON with every backend, so the ones that
+        # don't store tasks reject what the database queue couldn't store
+        args, kwargs = json.loads(
+            json.dumps([list(args), kwargs or {}], cls=DjangoJSONEncoder)
+        )
+        return get_backend().enqueue(self, args, kwargs, countdown)
+
+    def backoff(self, attempt):
+        """Seconds to wait before retrying after the given failed attempt."""
+        return self.retry_delay * 2 ** (attempt - 1)
+
+
+def task(func=None, *, name=None, max_attempts=3, retry_delay=10):
+    """
+    Register a function as a task, run with `func.delay(...)`. A failing
+    call is retried up to max_attempts times, waiting retry_delay seconds
+    after the first failure and twice as long after each next one.
+    """
+
+    def register(func):
+        task_name = name or f"{func.__module__}.{func.__qualname__}"
+        if task_name in registry:
+            raise ValueError(f"A task named {task_name} is already registered.")
+        registry[task_name] = Task(func, task_name, max_attempts, retry_delay)
+        return registry[task_name]
+
+    return register(func) if func is not None else register
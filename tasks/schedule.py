@@ -0,0 +1,45 @@
+import hashlib
+
+from tasks.cron import CronExpression
+
+# Periodic jobs by name, filled by @periodic when the app modules are imported
+schedule = {}
+
+
+class PeriodicJob:
+    def __init__(self, func, name, cron, jitter):
+        self.func = func
+        self.name = name
+        self.cron = CronExpression(cron)
+        self.jitter = jitter
+
+    @property
+    def offset(self):
+        """
+        Seconds after each slot at which the job starts: fixed per job, so
+        every scheduler agrees on it, and different per job, so jobs sharing
+        a cron expression don't all hit the database in the same second.
+        """
+        if not self.jitter:
+            return 0
+        digest = hashlib.sha256(self.name.encode()).digest()
+        return int.from_bytes(digest[:4], "big") % self.jitter
+
+    def __call__(self):
+        return self.func()
+
+
+def periodic(cron, *, name=None, jitter=60):
+    """
+    Run a function on a cron schedule (see tasks.cron) in `run_scheduler`,
+    up to `jitter` seconds after each matching minute.
+    """
+
+    def register(func):
+        job_name = name or f"{func.__module__}.{func.__qualname__}"
+        if job_name in schedule:
+            raise ValueError(f"A periodic job named {job_name} is already registered.")
+        schedule[job_name] = PeriodicJob(func, job_name, cron, jitter)
+        return func
+
+    return register
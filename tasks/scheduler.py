@@ -0,0 +1,125 @@
+import hashlib
+import logging
+import os
+import random
+import socket
+import time
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+from tasks.models import JobRun
+
+logger = logging.getLogger("library_service.scheduler")
+
+HOST = f"{socket.gethostname()}:{os.getpid()}"
+
+
+@contextmanager
+def advisory_lock(name):
+    """
+    Try to take a Postgres session advisory lock named `name` without
+    waiting, yield whether it was taken. Other databases have no advisory
+    locks and always get it.
+    """
+    if connection.vendor != "postgresql":
+        yield True
+        return
+
+    key = int.from_bytes(hashlib.sha256(name.encode()).digest()[:8], "big", signed=True)
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+        acquired = cursor.fetchone()[0]
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_unlock(%s)", [key])
+
+
+def claim_run(job, slot):
+    """Record the run of a slot, or return None if another scheduler did."""
+    try:
+        with transaction.atomic():
+            return JobRun.objects.create(job=job.name, scheduled_for=slot, host=HOST)
+    except IntegrityError:
+        return None
+
+
+def run_job(job, slot):
+    """
+    Run a job for its slot unless another scheduler claimed the slot, and
+    skip it while a previous run is still going anywhere. Return the run.
+    """
+    run = claim_run(job, slot)
+    if run is None:
+        return None
+
+    with advisory_lock(f"periodic-job:{job.name}") as acquired:
+        if not acquired:
+            run.status = JobRun.SKIPPED
+        else:
+            start = time.perf_counter()
+            try:
+                job()
+                run.status = JobRun.DONE
+            except Exception:
+                logger.exception("Periodic job %s failed", job.name)
+                run.status = JobRun.FAILED
+                run.error = traceback.format_exc()
+            run.duration_ms = round((time.perf_counter() - start) * 1000, 2)
+
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "error", "duration_ms", "finished_at"])
+    logger.info(
+        "Periodic job %s %s",
+        job.name,
+        run.status.lower(),
+        extra={"job": job.name, "status": run.status, "duration_ms": run.duration_ms},
+    )
+    return run
+
+
+class Scheduler:
+    """Run periodic jobs at their slots, missed slots are not caught up."""
+
+    def __init__(self, jobs, sleep=time.sleep, now=timezone.now):
+        self.jobs = list(jobs)
+        self.sleep = sleep
+        self.now = now
+        start = timezone.localtime(self.now())
+        self.next_slots = {job.name: job.cron.next_after(start) for job in self.jobs}
+
+    def due_jobs(self):
+        """Jobs past their slot plus offset, with the slot, earliest first."""
+        now = self.now()
+        due = [
+            (self.next_slots[job.name], job)
+            for job in self.jobs
+            if self.next_slots[job.name] + timedelta(seconds=job.offset) <= now
+        ]
+        return sorted(due, key=lambda item: item[0])
+
+    def seconds_until_next(self):
+        upcoming = min(
+            self.next_slots[job.name] + timedelta(seconds=job.offset)
+            for job in self.jobs
+        )
+        return max((upcoming - self.now()).total_seconds(), 0)
+
+    def run_pending(self):
+        """Run the due jobs once each and move them to their next slot."""
+        ran = []
+        for slot, job in self.due_jobs():
+            self.next_slots[job.name] = job.cron.next_after(
+                timezone.localtime(self.now())
+            )
+            # Replicas reach the slot together, spread their claims out
+            self.sleep(random.uniform(0, settings.SCHEDULER_JITTER_SECONDS))
+            ran.append(run_job(job, slot))
+        return ran
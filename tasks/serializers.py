@@ -0,0 +1,24 @@
+from rest_framework import serializers
+
+
+class TaskMetricsSerializer(serializers.Serializer):
+    backend = serializers.CharField()
+    queued = serializers.IntegerField(required=False)
+    running = serializers.IntegerField(required=False)
+    done = serializers.IntegerField(required=False)
+    failed = serializers.IntegerField(required=False)
+    oldest_due_seconds = serializers.FloatField(
+        allow_null=True,
+        required=False,
+        help_text="How long the oldest due task has been waiting.",
+    )
+    avg_wait_ms = serializers.FloatField(
+        allow_null=True,
+        required=False,
+        help_text="Average time from due to started of recently done tasks.",
+    )
+    avg_run_ms = serializers.FloatField(
+        allow_null=True,
+        required=False,
+        help_text="Average run time of recently done tasks.",
+    )
@@ -0,0 +1,16 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from tasks.models import JobRun
+from tasks.schedule import periodic
+from tasks.worker import prune_finished
+
+
+@periodic("30 3 * * *")
+def prune_history():
+    """Delete finished tasks and periodic job runs older than TASKS_KEEP_DAYS."""
+    older_than = timezone.now() - timedelta(days=settings.TASKS_KEEP_DAYS)
+    prune_finished(older_than)
+    JobRun.objects.filter(started_at__lt=older_than).delete()
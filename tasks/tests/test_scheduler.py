@@ -0,0 +1,218 @@
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.tasks import check_overdue
+from tasks.cron import CronExpression
+from tasks.models import JobRun
+from tasks.schedule import PeriodicJob, schedule
+from tasks.scheduler import Scheduler, claim_run, run_job
+
+calls = []
+
+
+def record():
+    calls.append("ran")
+
+
+def fail():
+    raise RuntimeError("Boom")
+
+
+def at(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class CronExpressionTests(TestCase):
+    def test_next_after(self):
+        """Test the next matching minute of common expressions."""
+        moment = at(2026, 10, 19, 10, 7, 30)  # a Monday
+
+        self.assertEqual(
+            CronExpression("*/15 * * * *").next_after(moment), at(2026, 10, 19, 10, 15)
+        )
+        self.assertEqual(
+            CronExpression("0 9 * * *").next_after(moment), at(2026, 10, 20, 9, 0)
+        )
+        self.assertEqual(
+            CronExpression("30 8 * * 1-5").next_after(at(2026, 10, 23, 9, 0)),
+            at(2026, 10, 26, 8, 30),
+        )
+        self.assertEqual(
+            CronExpression("@monthly").next_after(moment), at(2026, 11, 1, 0, 0)
+        )
+
+    def test_sunday_is_zero_or_seven(self):
+        """Test that weekday 7 means Sunday, like 0."""
+        moment = at(2026, 10, 19, 0, 0)
+
+        self.assertEqual(
+            CronExpression("0 0 * * 7").next_after(moment),
+            CronExpression("0 0 * * 0").next_after(moment),
+        )
+
+    def test_day_or_weekday(self):
+        """Test that a restricted day and weekday match either one, like cron."""
+        cron = CronExpression("0 0 13 * 5")
+
+        # Friday the 23rd comes before the 13th of next month
+        self.assertEqual(
+            cron.next_after(at(2026, 10, 19, 12, 0)), at(2026, 10, 23, 0, 0)
+        )
+
+    def test_invalid_expressions(self):
+        """Test that malformed expressions are rejected."""
+        for expression in ("* * * *", "60 * * * *", "*/0 * * * *", "5-1 * * * *"):
+            with self.subTest(expression=expression):
+                with self.assertRaises(ValueError):
+                    CronExpression(expression)
+
+
+class RunJobTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.slot = at(2026, 10, 19, 9, 0)
+
+    def test_slot_claimed_once(self):
+        """Test that only the first scheduler claims a slot."""
+        job = PeriodicJob(record, "tests.record", "0 9 * * *", jitter=0)
+
+        self.assertIsNotNone(claim_run(job, self.slot))
+        self.assertIsNone(claim_run(job, self.slot))
+
+    def test_run_recorded(self):
+        """Test that a run is recorded with its status and duration."""
+        job = PeriodicJob(record, "tests.record", "0 9 * * *", jitter=0)
+
+        run = run_job(job, self.slot)
+        again = run_job(job, self.slot)
+
+        self.assertEqual(calls, ["ran"])
+        self.assertIsNone(again)
+        run.refresh_from_db()
+        self.assertEqual(run.status, JobRun.DONE)
+        self.assertIsNotNone(run.duration_ms)
+        self.assertIsNotNone(run.finished_at)
+
+    def test_failure_recorded(self):
+        """Test that a failing job is recorded with its traceback."""
+        job = PeriodicJob(fail, "tests.fail", "0 9 * * *", jitter=0)
+
+        with self.assertLogs("library_service.scheduler", "ERROR"):
+            run = run_job(job, self.slot)
+
+        run.refresh_from_db()
+        self.assertEqual(run.status, JobRun.FAILED)
+        self.assertIn("RuntimeError: Boom", run.error)
+
+    def test_stable_offset(self):
+        """Test that a job starts at the same offset on every scheduler."""
+        job = PeriodicJob(record, "tests.record", "0 9 * * *", jitter=60)
+        same = PeriodicJob(record, "tests.record", "0 9 * * *", jitter=60)
+
+        self.assertEqual(job.offset, same.offset)
+        self.assertLess(job.offset, 60)
+
+
+@override_settings(SCHEDULER_JITTER_SECONDS=0)
+class SchedulerTests(TestCase):
+    def setUp(self):
+        calls.clear()
+        self.now = at(2026, 10, 19, 10, 7)
+        self.job = PeriodicJob(record, "tests.record", "*/15 * * * *", jitter=0)
+        self.scheduler = Scheduler([self.job], sleep=lambda _: None, now=self.clock)
+
+    def clock(self):
+        return self.now
+
+    def test_runs_due_jobs_once(self):
+        """Test that due jobs run once per slot and move to the next slot."""
+        self.assertEqual(self.scheduler.run_pending(), [])
+        self.assertEqual(self.scheduler.seconds_until_next(), 8 * 60)
+
+        self.now = at(2026, 10, 19, 10, 15, 2)
+        self.scheduler.run_pending()
+        self.scheduler.run_pending()
+
+        self.assertEqual(calls, ["ran"])
+        self.assertEqual(
+            self.scheduler.next_slots[self.job.name], at(2026, 10, 19, 10, 30)
+        )
+        run = JobRun.objects.get()
+        self.assertEqual(run.scheduled_for, at(2026, 10, 19, 10, 15))
+
+    def test_missed_slots_not_caught_up(self):
+        """Test that a scheduler behind by several slots runs the job once."""
+        self.now = at(2026, 10, 19, 11, 40)
+
+        self.scheduler.run_pending()
+
+        self.assertEqual(calls, ["ran"])
+        self.assertEqual(
+            self.scheduler.next_slots[self.job.name], at(2026, 10, 19, 11, 45)
+        )
+
+    def test_replicas_share_slots(self):
+        """Test that two schedulers run a slot only once between them."""
+        other = Scheduler([self.job], sleep=lambda _: None, now=self.clock)
+        self.now = at(2026, 10, 19, 10, 15, 2)
+
+        self.scheduler.run_pending()
+        other.run_pending()
+
+        self.assertEqual(calls, ["ran"])
+
+    def test_list_command(self):
+        """Test that run_scheduler --list shows the registered jobs."""
+        out = StringIO()
+
+        call_command("run_scheduler", "--list", stdout=out)
+
+        for name in schedule:
+            self.assertIn(name, out.getvalue())
+        self.assertIn("borrowings.tasks.check_overdue", schedule)
+
+
+class OverdueJobTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.book = Book.objects.create(title="Late", author="A", inventory=5)
+
+    def borrow(self, days_overdue):
+        borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=date.today() + timedelta(days=1),
+        )
+        Borrowing.objects.filter(pk=borrowing.pk).update(
+            borrow_date=date.today() - timedelta(days=days_overdue + 7),
+            expected_return_date=date.today() - timedelta(days=days_overdue),
+        )
+
+    @patch("borrowings.tasks.notify")
+    def test_notifies_overdue_borrowings(self, notify):
+        """Test that admins get one message listing the overdue borrowings."""
+        self.borrow(3)
+        self.borrow(0)
+
+        check_overdue()
+
+        notify.assert_called_once()
+        message = notify.call_args.args[0]
+        self.assertIn("Overdue Borrowings (1)", message)
+        self.assertIn("test@test.com: Late", message)
+
+    @patch("borrowings.tasks.notify")
+    def test_silent_without_overdue_borrowings(self, notify):
+        """Test that nothing is sent when no borrowing is overdue."""
+        self.borrow(0)
+
+        check_overdue()
+
+        notify.assert_not_called()
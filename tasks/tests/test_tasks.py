@@ -0,0 +1,227 @@
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from tasks.backends import ThreadBackend
+from tasks.models import QueuedTask
+from tasks.registry import registry, task
+from tasks.worker import (
+    claim,
+    heartbeat,
+    prune_finished,
+    queue_metrics,
+    run_queued,
+)
+
+METRICS_URL = reverse("tasks:metrics")
+
+calls = []
+
+
+@task(name="tests.record")
+def record(value):
+    calls.append(value)
+
+
+@task(name="tests.flaky", max_attempts=2, retry_delay=60)
+def flaky():
+    raise RuntimeError("Boom")
+
+
+class TaskRegistryTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_registered_by_name(self):
+        """Test that @task registers the function and keeps it callable."""
+        self.assertIs(registry["tests.record"], record)
+        record(1)
+        self.assertEqual(calls, [1])
+
+    def test_duplicate_name_rejected(self):
+        """Test that two tasks can't share a name."""
+        with self.assertRaises(ValueError):
+            task(name="tests.record")(lambda: None)
+
+    def test_inline_backend_runs_right_away(self):
+        """Test that tests run queued tasks in the caller."""
+        record.delay("now")
+        self.assertEqual(calls, ["now"])
+
+    def test_arguments_must_be_json(self):
+        """Test that arguments the database queue can't store are rejected."""
+        with self.assertRaises(TypeError):
+            record.delay(object())
+
+
+@override_settings(TASKS_BACKEND="database")
+class DatabaseQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_delay_stores_task(self):
+        """Test that delay queues a row instead of running the task."""
+        record.delay("later")
+
+        queued = QueuedTask.objects.get()
+        self.assertEqual(calls, [])
+        self.assertEqual((queued.name, queued.args), ("tests.record", ["later"]))
+        self.assertEqual(queued.status, QueuedTask.QUEUED)
+
+    def test_claim_and_run(self):
+        """Test that a worker claims due tasks only and marks them done."""
+        record.delay(1)
+        record.enqueue([2], countdown=3600)
+
+        batch = claim(10, visibility_timeout=600)
+        self.assertEqual([queued.args for queued in batch], [[1]])
+        self.assertEqual(batch[0].status, QueuedTask.RUNNING)
+        self.assertEqual(claim(10, visibility_timeout=600), [])
+
+        run_queued(batch[0])
+
+        self.assertEqual(calls, [1])
+        batch[0].refresh_from_db()
+        self.assertEqual(batch[0].status, QueuedTask.DONE)
+        self.assertIsNotNone(batch[0].finished_at)
+
+    def test_failed_task_retried_then_failed(self):
+        """Test that failures are retried later, up to max_attempts."""
+        flaky.delay()
+
+        with self.assertLogs("library_service.tasks", "ERROR"):
+            run_queued(claim(1, visibility_timeout=600)[0])
+        queued = QueuedTask.objects.get()
+        self.assertEqual(queued.status, QueuedTask.QUEUED)
+        self.assertIn("Boom", queued.last_error)
+        self.assertGreater(queued.run_after, timezone.now() + timedelta(seconds=50))
+
+        QueuedTask.objects.update(run_after=timezone.now())
+        with self.assertLogs("library_service.tasks", "ERROR"):
+            run_queued(claim(1, visibility_timeout=600)[0])
+        queued.refresh_from_db()
+        self.assertEqual((queued.status, queued.attempts), (QueuedTask.FAILED, 2))
+
+    def test_abandoned_task_claimed_again(self):
+        """Test that a task left running by a dead worker is run again."""
+        record.delay("lost")
+        claim(1, visibility_timeout=600)
+        QueuedTask.objects.update(heartbeat_at=timezone.now() - timedelta(hours=1))
+
+        batch = claim(1, visibility_timeout=600)
+
+        self.assertEqual(len(batch), 1)
+        self.assertEqual(batch[0].attempts, 2)
+
+    def test_heartbeat_keeps_slow_task_claimed(self):
+        """Test that a task running past the timeout isn't claimed while alive."""
+        record.delay("slow")
+        batch = claim(1, visibility_timeout=600)
+        QueuedTask.objects.update(started_at=timezone.now() - timedelta(hours=1))
+
+        self.assertEqual(heartbeat(batch), 1)
+
+        self.assertEqual(claim(1, visibility_timeout=600), [])
+
+    def test_claimed_again_attempt_left_alone(self):
+        """Test that a worker finishing late doesn't overwrite the new attempt."""
+        record.delay("late")
+        stale = claim(1, visibility_timeout=600)[0]
+        QueuedTask.objects.update(heartbeat_at=timezone.now() - timedelta(hours=1))
+        claim(1, visibility_timeout=600)
+
+        with self.assertLogs("library_service.tasks", "WARNING"):
+            run_queued(stale)
+
+        queued = QueuedTask.objects.get()
+        self.assertEqual((queued.status, queued.attempts), (QueuedTask.RUNNING, 2))
+        self.assertEqual(heartbeat([stale]), 0)
+
+    def test_unknown_task_fails(self):
+        """Test that a task no worker knows is failed, not retried."""
+        QueuedTask.objects.create(name="tests.missing", run_after=timezone.now())
+
+        run_queued(claim(1, visibility_timeout=600)[0])
+
+        self.assertEqual(QueuedTask.objects.get().status, QueuedTask.FAILED)
+
+    def test_run_tasks_command(self):
+        """Test that run_tasks --burst runs every due task and exits."""
+        for value in range(5):
+            record.delay(value)
+
+        call_command("run_tasks", "--burst", "--concurrency", "1", stdout=StringIO())
+
+        self.assertEqual(sorted(calls), [0, 1, 2, 3, 4])
+        self.assertFalse(QueuedTask.objects.exclude(status=QueuedTask.DONE).exists())
+
+    def test_metrics_and_prune(self):
+        """Test queue depth and latency metrics, then pruning finished tasks."""
+        record.delay(1)
+        record.delay(2)
+        run_queued(claim(1, visibility_timeout=600)[0])
+
+        metrics = queue_metrics()
+        self.assertEqual((metrics["queued"], metrics["done"]), (1, 1))
+        self.assertIsNotNone(metrics["oldest_due_seconds"])
+        self.assertIsNotNone(metrics["avg_run_ms"])
+
+        self.assertEqual(prune_finished(timezone.now() + timedelta(seconds=1)), 1)
+        self.assertEqual(QueuedTask.objects.count(), 1)
+
+    def test_metrics_endpoint_for_admins(self):
+        """Test that only admins can read the task metrics."""
+        client = APIClient()
+        user = get_user_model().objects.create_user("user@test.com", "testpass")
+        client.force_authenticate(user)
+        self.assertEqual(client.get(METRICS_URL).status_code, 403)
+
+        user.is_staff = True
+        user.save()
+        res = client.get(METRICS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["backend"], "database")
+
+
+class ThreadBackendTests(TestCase):
+    def test_runs_after_commit_with_retries(self):
+        """Test that the thread pool runs tasks on commit and retries failures."""
+        backend = ThreadBackend(workers=2)
+        attempts = []
+        done = threading.Event()
+
+        @task(name="tests.thread_retry", max_attempts=2, retry_delay=0)
+        def retried():
+            attempts.append(1)
+            if len(attempts) < 2:
+                raise RuntimeError("First attempt fails")
+            done.set()
+
+        self.addCleanup(registry.pop, "tests.thread_retry")
+        with (
+            patch("tasks.registry.Task.enqueue", autospec=True) as enqueue,
+            self.assertLogs("library_service.tasks", "ERROR"),
+        ):
+            enqueue.side_effect = lambda self, args=(), kwargs=None, countdown=0: (
+                backend.enqueue(self, list(args), kwargs or {}, countdown)
+            )
+            with self.captureOnCommitCallbacks(execute=False) as callbacks:
+                retried.delay()
+            self.assertEqual(attempts, [])
+            for callback in callbacks:
+                callback()
+            self.assertTrue(done.wait(5))
+
+        backend.executor.shutdown(wait=True)
+        self.assertEqual(len(attempts), 2)
+        self.assertEqual(backend.metrics()["done"], 1)
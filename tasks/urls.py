@@ -0,0 +1,9 @@
+from django.urls import path
+
+from tasks.views import TaskMetricsView
+
+urlpatterns = [
+    path("metrics/", TaskMetricsView.as_view(), name="metrics"),
+]
+
+app_name = "tasks"
@@ -0,0 +1,15 @@
+from rest_framework import generics, permissions
+from rest_framework.response import Response
+
+from tasks.backends import get_backend
+from tasks.serializers import TaskMetricsSerializer
+
+
+class TaskMetricsView(generics.GenericAPIView):
+    """Queue depth and task latency of the configured task backend."""
+
+    permission_classes = [permissions.IsAdminUser]
+    serializer_class = TaskMetricsSerializer
+
+    def get(self, request):
+        return Response(self.get_serializer(get_backend().metrics()).data)
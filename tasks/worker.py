@@ -0,0 +1,171 @@
+import logging
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Min, Q
+from django.utils import timezone
+
+from tasks.backends import execute
+from tasks.models import QueuedTask
+from tasks.registry import registry
+
+logger = logging.getLogger("library_service.tasks")
+
+
+def claim(batch_size, visibility_timeout):
+    """
+    Take up to batch_size due tasks and mark them running. Rows locked by
+    other workers are skipped, so workers never wait on each other. Running
+    tasks without a heartbeat for visibility_timeout seconds were left by a
+    worker that died and are taken again.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            QueuedTask.objects.filter(
+                Q(status=QueuedTask.QUEUED, run_after__lte=now)
+                | Q(
+                    status=QueuedTask.RUNNING,
+                    heartbeat_at__lt=now - timedelta(seconds=visibility_timeout),
+                )
+            )
+            .order_by("id")
+            .select_for_update(skip_locked=True)
+            .values_list("id", flat=True)[:batch_size]
+        )
+        QueuedTask.objects.filter(id__in=ids).update(
+            status=QueuedTask.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+            attempts=F("attempts") + 1,
+        )
+    return list(QueuedTask.objects.filter(id__in=ids).order_by("id"))
+
+
+def _claimed(queued):
+    """The task's row, as long as it is still this worker's attempt."""
+    return QueuedTask.objects.filter(
+        id=queued.id, attempts=queued.attempts, status=QueuedTask.RUNNING
+    )
+
+
+def heartbeat(batch):
+    """Mark claimed tasks as alive, return how many are still claimed."""
+    now = timezone.now()
+    return sum(_claimed(queued).update(heartbeat_at=now) for queued in batch)
+
+
+@contextmanager
+def keeping_alive(batch, interval):
+    """Send heartbeats for the batch every `interval` seconds while it runs."""
+    done = threading.Event()
+
+    def beat():
+        try:
+            while not done.wait(interval):
+                heartbeat(batch)
+        finally:
+            connection.close()
+
+    thread = threading.Thread(target=beat, name="task-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def run_queued(queued):
+    """
+    Run a claimed task, then mark it done, failed or queued for a retry.
+    When another worker took the task meanwhile, its attempt is left alone.
+    """
+    task = registry.get(queued.name)
+    try:
+        if task is None:
+            raise LookupError(f"No task named {queued.name} is registered.")
+        if queued.attempts > queued.max_attempts:
+            raise RuntimeError("The worker running the last attempt stopped.")
+        execute(task, queued.args, queued.kwargs, queued.attempts, queued.run_after)
+    except Exception:
+        error = traceback.format_exc()
+        if task is not None and queued.attempts < queued.max_attempts:
+            updated = _claimed(queued).update(
+                status=QueuedTask.QUEUED,
+                run_after=timezone.now()
+                + timedelta(seconds=task.backoff(queued.attempts)),
+                last_error=error,
+            )
+        else:
+            updated = _claimed(queued).update(
+                status=QueuedTask.FAILED, finished_at=timezone.now(), last_error=error
+            )
+    else:
+        updated = _claimed(queued).update(
+            status=QueuedTask.DONE, finished_at=timezone.now()
+        )
+    if not updated:
+        logger.warning(
+            "Task %s #%s attempt %s was claimed again before it finished",
+            queued.name,
+            queued.id,
+            queued.attempts,
+        )
+
+
+def _milliseconds(duration):
+    return round(duration.total_seconds() * 1000, 2) if duration is not None else None
+
+
+def queue_metrics(window=timedelta(hours=1)):
+    """Tasks per status, age of the oldest due one and recent latency."""
+    now = timezone.now()
+    counts = dict(
+        QueuedTask.objects.order_by()
+        .values_list("status")
+        .annotate(count=Count("id"))
+        .values_list("status", "count")
+    )
+    oldest_due = QueuedTask.objects.filter(
+        status=QueuedTask.QUEUED, run_after__lte=now
+    ).aggregate(oldest=Min("run_after"))["oldest"]
+    recent = QueuedTask.objects.filter(
+        status=QueuedTask.DONE, finished_at__gte=now - window
+    ).aggregate(
+        wait=Avg(
+            ExpressionWrapper(
+                F("started_at") - F("run_after"), output_field=DurationField()
+            )
+        ),
+        run=Avg(
+            ExpressionWrapper(
+                F("finished_at") - F("started_at"), output_field=DurationField()
+            )
+        ),
+    )
+    return {
+        "queued": counts.get(QueuedTask.QUEUED, 0),
+        "running": counts.get(QueuedTask.RUNNING, 0),
+        "done": counts.get(QueuedTask.DONE, 0),
+        "failed": counts.get(QueuedTask.FAILED, 0),
+        "oldest_due_seconds": (
+            round((now - oldest_due).total_seconds(), 3) if oldest_due else None
+        ),
+        "avg_wait_ms": _milliseconds(recent["wait"]),
+        "avg_run_ms": _milliseconds(recent["run"]),
+    }
+
+
+def prune_finished(older_than, batch_size=5000):
+    """Delete done and failed tasks finished before `older_than`, in batches."""
+    finished = QueuedTask.objects.filter(
+        status__in=(QueuedTask.DONE, QueuedTask.FAILED), finished_at__lt=older_than
+    )
+    pruned = 0
+    while ids := list(finished.values_list("id", flat=True)[:batch_size]):
+        pruned += QueuedTask.objects.filter(id__in=ids).delete()[0]
+    return pruned
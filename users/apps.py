@@ -4,3 +4,11 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from django.core.checks import Tags, register
+
+        from users import receivers  # noqa: F401
+        from utils.checks import shared_cache_check
+
+        register(shared_cache_check, Tags.caches, deploy=True)
@@ -0,0 +1,83 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.hashers import make_password, verify_password
+
+# Hashing releases the GIL, the pool size caps the CPU and memory used by logins
+hashing_pool = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASHING_WORKERS,
+    thread_name_prefix="password-hashing",
+)
+
+
+class PooledHashingBackend(ModelBackend):
+    """
+    ModelBackend that hashes passwords in a bounded thread pool. Database
+    queries stay on the calling thread, async callers await the pool instead
+    of blocking the event loop.
+
+    Hashes made by a hasher other than the preferred one, or with outdated
+    parameters, are replaced after a successful login.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        username = self._get_username(username, kwargs)
+        if username is None or password is None:
+            return None
+
+        UserModel = get_user_model()
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash anyway so nonexistent users take as long as wrong passwords
+            hashing_pool.submit(make_password, password).result()
+            return None
+
+        is_correct, must_update = hashing_pool.submit(
+            verify_password, password, user.password
+        ).result()
+        if is_correct and must_update:
+            user.password = hashing_pool.submit(make_password, password).result()
+            user.save(update_fields=["password"])
+
+        if is_correct and self.user_can_authenticate(user):
+            return user
+        return None
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        username = self._get_username(username, kwargs)
+        if username is None or password is None:
+            return None
+
+        loop = asyncio.get_running_loop()
+        UserModel = get_user_model()
+        try:
+            user = await sync_to_async(UserModel._default_manager.get_by_natural_key)(
+                username
+            )
+        except UserModel.DoesNotExist:
+            await loop.run_in_executor(hashing_pool, make_password, password)
+            return None
+
+        is_correct, must_update = await loop.run_in_executor(
+            hashing_pool, verify_password, password, user.password
+        )
+        if is_correct and must_update:
+            user.password = await loop.run_in_executor(
+                hashing_pool, make_password, password
+            )
+            await user.asave(update_fields=["password"])
+
+        if is_correct and self.user_can_authenticate(user):
+            return user
+        return None
+
+    @staticmethod
+    def _get_username(username, credentials):
+        if username is None:
+            return credentials.get(get_user_model().USERNAME_FIELD)
+        return username
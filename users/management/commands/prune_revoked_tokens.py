@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from users.tokens import prune_expired
+
+
+class Command(BaseCommand):
+    """Django command to delete revoked tokens that have expired anyway."""
+
+    help = "Delete expired entries from the revoked token table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=5000,
+            help="Entries deleted per query.",
+        )
+
+    def handle(self, *args, **options):
+        pruned = prune_expired(options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Pruned {pruned} revoked tokens."))
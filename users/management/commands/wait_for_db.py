@@ -6,14 +6,48 @@ from django.core.management.base import BaseCommand
 
 class Command(BaseCommand):
     """Django command to pause execution until the database is available."""
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--warm-pool",
+            action="store_true",
+            help=(
+                "Open the connection pool and wait until it holds min_size connections. "
+                "Only the pool of the process running the command is warmed."
+            ),
+        )
+        parser.add_argument(
+            "--pool-timeout",
+            type=float,
+            default=30.0,
+            help="Seconds to wait for the pool to fill up.",
+        )
+
     def handle(self, *args, **options):
         self.stdout.write("Waiting for database...")
-        db_conn = None
-        while not db_conn:
+        db_conn = connections["default"]
+        while True:
             try:
-                db_conn = connections["default"]
-                db_conn.cursor()
+                db_conn.ensure_connection()
+                break
             except OperationalError:
                 self.stdout.write("Database unavailable, waiting 1 second...")
                 time.sleep(1)
         self.stdout.write(self.style.SUCCESS("Database available!"))
+
+        if options["warm_pool"]:
+            self.warm_pool(db_conn, options["pool_timeout"])
+        # Give the connection back, to the pool when there is one
+        db_conn.close()
+
+    def warm_pool(self, db_conn, timeout):
+        pool = getattr(db_conn, "pool", None)
+        if pool is None:
+            self.stdout.write("Connection pooling is disabled, nothing to warm.")
+            return
+
+        pool.open(wait=True, timeout=timeout)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Connection pool ready with {pool.get_stats()['pool_size']} connections."
+            )
+        )
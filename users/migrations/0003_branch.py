@@ -0,0 +1,27 @@
+# Generated by Django 5.1.7 on 2026-10-19 10:03
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("branches", "0001_initial"),
+        ("users", "0002_revokedtoken"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="branch",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="Home branch of the reader.",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="readers",
+                to="branches.branch",
+            ),
+        ),
+    ]
@@ -0,0 +1,103 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import django
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+
+
+# Hashes passwords for the bulk endpoint, forking a web worker is unsafe
+provisioning_pool = ThreadPoolExecutor(
+    max_workers=settings.PROVISIONING_HASHING_WORKERS,
+    thread_name_prefix="provisioning-hashing",
+)
+
+
+def _init_worker():
+    # Forked workers inherit the configured Django, spawned ones set it up
+    if not apps.ready:
+        django.setup()
+
+
+def hashing_processes(workers=None):
+    """A process pool for hashing, hashes are CPU bound and scale with cores."""
+    return ProcessPoolExecutor(
+        max_workers=workers or os.cpu_count(), initializer=_init_worker
+    )
+
+
+def hash_passwords(passwords, executor=None):
+    """
+    Hash passwords in order with the preferred hasher, using the executor's
+    workers when given. None gives an unusable password and isn't sent.
+    """
+    to_hash = [password for password in passwords if password is not None]
+    if executor is None:
+        results = map(make_password, to_hash)
+    else:
+        # Few round trips to the workers, small enough to keep them all busy
+        chunksize = max(1, len(to_hash) // ((os.cpu_count() or 1) * 4))
+        results = executor.map(make_password, to_hash, chunksize=chunksize)
+    return [
+        make_password(None) if password is None else next(results)
+        for password in passwords
+    ]
+
+
+def provision_users(rows, executor=None, branch=None, batch_size=1000):
+    """
+    Create users from dicts with an email and an optional password,
+    first_name and last_name, skipping emails that are taken or repeated.
+    Passwords are hashed by the executor, the users inserted with
+    bulk_create; an email registered meanwhile is skipped by the database
+    and reported as skipped. Return the created and the skipped emails.
+    """
+    User = get_user_model()
+    manager = User._default_manager
+
+    new, skipped = {}, []
+    for row in rows:
+        email = manager.normalize_email(row["email"])
+        if email in new:
+            skipped.append(email)
+        else:
+            new[email] = row
+
+    emails = list(new)
+    for start in range(0, len(emails), batch_size):
+        taken = manager.filter(
+            email__in=emails[start : start + batch_size]
+        ).values_list("email", flat=True)
+        for email in taken:
+            del new[email]
+            skipped.append(email)
+
+    hashes = hash_passwords([row.get("password") for row in new.values()], executor)
+    users = [
+        User(
+            email=email,
+            password=encoded,
+            first_name=row.get("first_name", ""),
+            last_name=row.get("last_name", ""),
+            branch=branch,
+        )
+        for (email, row), encoded in zip(new.items(), hashes)
+    ]
+    created = []
+    for start in range(0, len(users), batch_size):
+        batch = users[start : start + batch_size]
+        manager.bulk_create(batch, ignore_conflicts=True)
+        # Hashes are salted, a row holding another one was registered meanwhile
+        stored = dict(
+            manager.filter(email__in=[user.email for user in batch]).values_list(
+                "email", "password"
+            )
+        )
+        for user in batch:
+            if stored.get(user.email) == user.password:
+                created.append(user.email)
+            else:
+                skipped.append(user.email)
+    return created, skipped
@@ -0,0 +1,15 @@
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from users.models import User
+
+ME_CACHE_KEY = "users-me:{pk}"
+
+
+# `/api/users/me/` is cached, any write to the user drops it. Bulk updates
+# with QuerySet.update() don't send signals and are visible after the timeout.
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    cache.delete(ME_CACHE_KEY.format(pk=instance.pk))
@@ -1,5 +1,13 @@
 from django.contrib.auth import get_user_model
 from rest_framework import serializers
+from rest_framework_simplejwt import serializers as jwt_serializers
+
+from branches.models import Branch
+from users.tokens import RevocableRefreshToken
+
+# Users created per request to the bulk endpoint, small enough to be hashed
+# well within the request timeout, use the command for more
+MAX_PROVISIONED_USERS = 100
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -22,3 +30,34 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class ProvisionedUserSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    password = serializers.CharField(min_length=5, required=False, write_only=True)
+    first_name = serializers.CharField(max_length=150, required=False)
+    last_name = serializers.CharField(max_length=150, required=False)
+
+
+class UserProvisioningSerializer(serializers.Serializer):
+    """Accounts to create; without a password a user can't log in until one is set."""
+
+    users = ProvisionedUserSerializer(many=True, max_length=MAX_PROVISIONED_USERS)
+    branch = serializers.PrimaryKeyRelatedField(
+        queryset=Branch.objects.all(), required=False, allow_null=True
+    )
+
+
+class UserProvisioningResultSerializer(serializers.Serializer):
+    created = serializers.ListField(child=serializers.EmailField())
+    skipped = serializers.ListField(
+        child=serializers.EmailField(), help_text="Emails taken or repeated."
+    )
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RevocableRefreshToken
+
+
+class TokenRevokeSerializer(jwt_serializers.TokenBlacklistSerializer):
+    token_class = RevocableRefreshToken
@@ -0,0 +1,8 @@
+from tasks.schedule import periodic
+from users.tokens import prune_expired
+
+
+@periodic("0 3 * * *")
+def prune_revoked_tokens():
+    """Delete revoked tokens that have expired anyway."""
+    prune_expired()
@@ -1,3 +1,336 @@
-from django.test import TestCase
+import tempfile
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connections
+from django.db.utils import OperationalError
+from django.utils import timezone
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from users.backends import PooledHashingBackend
+from users.models import RevokedToken
+from users.provisioning import hash_passwords, provision_users
+from users.serializers import MAX_PROVISIONED_USERS
+from users.tokens import is_revoked, revoke
+from utils.checks import shared_cache_check
+
+TOKEN_URL = reverse("users:token_obtain_pair")
+TOKEN_REFRESH_URL = reverse("users:token_refresh")
+TOKEN_REVOKE_URL = reverse("users:token_revoke")
+ME_URL = reverse("users:manage")
+BULK_URL = reverse("users:bulk")
+
+
+@patch("django.db.backends.base.base.BaseDatabaseWrapper.ensure_connection")
+class WaitForDbCommandTests(SimpleTestCase):
+    def test_wait_for_db_ready(self, mock_ensure_connection):
+        """Test waiting for the database when it is available."""
+        call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(mock_ensure_connection.call_count, 1)
+
+    @patch("time.sleep")
+    def test_wait_for_db_retries(self, mock_sleep, mock_ensure_connection):
+        """Test waiting for the database retries until it is available."""
+        mock_ensure_connection.side_effect = [OperationalError] * 3 + [None]
+
+        call_command("wait_for_db", stdout=StringIO())
+
+        self.assertEqual(mock_ensure_connection.call_count, 4)
+        self.assertEqual(mock_sleep.call_count, 3)
+
+    def test_warm_pool_without_pooling(self, mock_ensure_connection):
+        """Test that warming is skipped when pooling is disabled."""
+        out = StringIO()
+
+        call_command("wait_for_db", "--warm-pool", stdout=out)
+
+        self.assertIn("nothing to warm", out.getvalue())
+
+    def test_connection_closed_after_check(self, mock_ensure_connection):
+        """Test that the checked connection is given back when the command ends."""
+        with patch.object(connections["default"], "close") as mock_close:
+            call_command("wait_for_db", "--warm-pool", stdout=StringIO())
+
+        mock_close.assert_called_once()
+
+
+class PasswordHashingTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com")
+        self.user.password = make_password("testpass", hasher="pbkdf2_sha256")
+        self.user.save()
+
+    def test_new_passwords_use_preferred_hasher(self):
+        """Test that new users get a scrypt hash."""
+        user = get_user_model().objects.create_user("new@test.com", "testpass")
+
+        self.assertTrue(user.password.startswith("scrypt$"))
+
+    def test_legacy_hash_upgraded_on_login(self):
+        """Test that a PBKDF2 hash is replaced after a successful login."""
+        res = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("scrypt$"))
+        self.assertTrue(self.user.check_password("testpass"))
+
+    def test_legacy_hash_kept_on_failed_login(self):
+        """Test that a wrong password doesn't touch the stored hash."""
+        res = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "wrongpass"}
+        )
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith("pbkdf2_sha256$"))
+
+    async def test_async_authenticate(self):
+        """Test that async authentication checks the password in the pool."""
+        backend = PooledHashingBackend()
+
+        user = await backend.aauthenticate(
+            None, email="test@test.com", password="testpass"
+        )
+        missing = await backend.aauthenticate(
+            None, email="missing@test.com", password="testpass"
+        )
+
+        self.assertEqual(user, self.user)
+        self.assertIsNone(missing)
+
+
+class RefreshTokenRotationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        get_user_model().objects.create_user("test@test.com", "testpass")
+        res = self.client.post(
+            TOKEN_URL, {"email": "test@test.com", "password": "testpass"}
+        )
+        self.refresh = res.data["refresh"]
+
+    def test_refresh_rotates_token(self):
+        """Test that a refresh returns a new refresh token and revokes the old."""
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": self.refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(res.data["refresh"], self.refresh)
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+        reused = self.client.post(TOKEN_REFRESH_URL, {"refresh": self.refresh})
+        self.assertEqual(reused.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_revoked_token_rejected_after_cache_loss(self):
+        """Test that the table still rejects a revoked token the cache forgot."""
+        self.client.post(TOKEN_REFRESH_URL, {"refresh": self.refresh})
+        cache.clear()
+
+        with self.assertNumQueries(1):
+            res = self.client.post(TOKEN_REFRESH_URL, {"refresh": self.refresh})
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_unrevoked_token_cached(self):
+        """Test that a token found unrevoked is checked in the cache next time."""
+        self.assertFalse(is_revoked("unknown"))
+
+        with self.assertNumQueries(0):
+            self.assertFalse(is_revoked("unknown"))
+
+        revoke("unknown", timezone.now() + timedelta(hours=1))
+        self.assertTrue(is_revoked("unknown"))
+
+    def test_revoke_endpoint(self):
+        """Test that a revoked refresh token can't be used to refresh."""
+        res = self.client.post(TOKEN_REVOKE_URL, {"refresh": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.post(TOKEN_REFRESH_URL, {"refresh": self.refresh})
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_prune_expired_tokens(self):
+        """Test that pruning deletes only entries that have expired."""
+        now = timezone.now()
+        RevokedToken.objects.create(jti="expired", expires_at=now - timedelta(hours=1))
+        RevokedToken.objects.create(jti="current", expires_at=now + timedelta(hours=1))
+
+        call_command("prune_revoked_tokens", stdout=StringIO())
+
+        self.assertEqual(
+            list(RevokedToken.objects.values_list("jti", flat=True)), ["current"]
+        )
+
+
+class ManageUserCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {AccessToken.for_user(self.user)}"
+        )
+
+    def test_me_served_from_cache(self):
+        """Test that repeated reads of /me/ don't query the database."""
+        self.client.get(ME_URL)
+
+        with self.assertNumQueries(0):
+            res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(res.data["email"], "test@test.com")
+
+    def test_update_invalidates_cache(self):
+        """Test that an update is visible on the next read."""
+        self.client.get(ME_URL)
+
+        res = self.client.patch(ME_URL, {"email": "new@test.com"})
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+
+        res = self.client.get(ME_URL)
+        self.assertEqual(res.data["email"], "new@test.com")
+
+    def test_deactivated_user_rejected(self):
+        """Test that a deactivated user can't read /me/ from the cache."""
+        self.client.get(ME_URL)
+        self.user.is_active = False
+        self.user.save()
+
+        res = self.client.get(ME_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_deploy_check_requires_shared_cache(self):
+        """Test that the deploy check fails on a per-process cache."""
+        local = {
+            "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}
+        }
+        shared = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+
+        with override_settings(CACHES=local):
+            self.assertEqual(
+                [error.id for error in shared_cache_check(None)],
+                ["library_service.E001"],
+            )
+        with override_settings(CACHES=shared):
+            self.assertEqual(shared_cache_check(None), [])
+
+
+class ProvisionUsersTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.admin = get_user_model().objects.create_user(
+            "admin@test.com", "testpass", is_staff=True
+        )
+        self.client.force_authenticate(self.admin)
+
+    def test_provision_users(self):
+        """Test that accounts are created and taken or repeated emails skipped."""
+        payload = {
+            "users": [
+                {"email": "one@test.com", "password": "secret1", "first_name": "One"},
+                {"email": "two@test.com"},
+                {"email": "one@test.com", "password": "other"},
+                {"email": "admin@test.com", "password": "secret3"},
+            ]
+        }
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(res.data["created"], ["one@test.com", "two@test.com"])
+        self.assertEqual(res.data["skipped"], ["one@test.com", "admin@test.com"])
+        one = get_user_model().objects.get(email="one@test.com")
+        self.assertTrue(one.check_password("secret1"))
+        self.assertEqual(one.first_name, "One")
+        two = get_user_model().objects.get(email="two@test.com")
+        self.assertFalse(two.has_usable_password())
+
+    def test_provision_invalid_user_rejected(self):
+        """Test that one invalid account rejects the whole request."""
+        payload = {"users": [{"email": "one@test.com"}, {"email": "not an email"}]}
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(get_user_model().objects.filter(email="one@test.com"))
+
+    def test_provision_email_registered_meanwhile(self):
+        """Test that an email registered during hashing is reported as skipped."""
+
+        def register_then_hash(passwords, executor=None):
+            get_user_model().objects.create_user("late@test.com", "theirs")
+            return hash_passwords(passwords, executor)
+
+        with patch("users.provisioning.hash_passwords", register_then_hash):
+            created, skipped = provision_users(
+                [
+                    {"email": "late@test.com", "password": "mine"},
+                    {"email": "new@test.com"},
+                ]
+            )
+
+        self.assertEqual(created, ["new@test.com"])
+        self.assertEqual(skipped, ["late@test.com"])
+        late = get_user_model().objects.get(email="late@test.com")
+        self.assertTrue(late.check_password("theirs"))
+
+    def test_provision_limit(self):
+        """Test that a request over MAX_PROVISIONED_USERS is rejected."""
+        payload = {
+            "users": [
+                {"email": f"user{index}@test.com"}
+                for index in range(MAX_PROVISIONED_USERS + 1)
+            ]
+        }
+
+        res = self.client.post(BULK_URL, payload, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_provision_admin_only(self):
+        """Test that regular users can't provision accounts."""
+        user = get_user_model().objects.create_user("test@test.com", "testpass")
+        self.client.force_authenticate(user)
+
+        res = self.client.post(BULK_URL, {"users": []}, format="json")
+
+        self.assertEqual(res.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_provision_command(self):
+        """Test that the command creates users from a CSV file in a process pool."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv") as file:
+            file.write(
+                "email,password,first_name\n"
+                "one@test.com,secret1,One\n"
+                "two@test.com,,\n"
+                "invalid,secret2,\n"
+                "admin@test.com,secret3,\n"
+            )
+            file.flush()
+            out, err = StringIO(), StringIO()
+
+            call_command(
+                "provision_users", file.name, "--workers", "2", stdout=out, stderr=err
+            )
+
+        self.assertIn("Created 2 users, skipped 1", out.getvalue())
+        self.assertIn("1 invalid rows", out.getvalue())
+        self.assertIn("Line 4", err.getvalue())
+        self.assertTrue(
+            get_user_model().objects.get(email="one@test.com").check_password("secret1")
+        )
@@ -0,0 +1,85 @@
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from users.models import RevokedToken
+
+REVOKED_CACHE_KEY = "revoked-token:{jti}"
+# Tokens found unrevoked are remembered this long, revoking one overwrites it
+NOT_REVOKED_CACHE_SECONDS = 60
+
+
+def _cache_revoked(jti, expires_at):
+    seconds = (expires_at - timezone.now()).total_seconds()
+    if seconds > 0:
+        cache.set(REVOKED_CACHE_KEY.format(jti=jti), True, seconds)
+
+
+def is_revoked(jti):
+    """Check the cache first, then the table's unique index on jti."""
+    key = REVOKED_CACHE_KEY.format(jti=jti)
+    revoked = cache.get(key)
+    if revoked is not None:
+        return revoked
+
+    expires_at = (
+        RevokedToken.objects.filter(jti=jti)
+        .values_list("expires_at", flat=True)
+        .first()
+    )
+    if expires_at is None:
+        # add, so a revocation cached meanwhile isn't overwritten
+        cache.add(key, False, NOT_REVOKED_CACHE_SECONDS)
+        return False
+
+    _cache_revoked(jti, expires_at)
+    return True
+
+
+def revoke(jti, expires_at):
+    """Revoke a token, return False when it already was revoked."""
+    try:
+        with transaction.atomic():
+            RevokedToken.objects.create(jti=jti, expires_at=expires_at)
+    except IntegrityError:
+        return False
+    finally:
+        _cache_revoked(jti, expires_at)
+    return True
+
+
+def prune_expired(batch_size=5000):
+    """Delete revoked tokens that have expired anyway, return how many."""
+    expired = RevokedToken.objects.filter(expires_at__lt=timezone.now())
+
+    pruned = 0
+    while ids := list(expired.values_list("id", flat=True)[:batch_size]):
+        pruned += RevokedToken.objects.filter(id__in=ids).delete()[0]
+    return pruned
+
+
+class RevocableRefreshToken(RefreshToken):
+    """
+    Refresh token checked against the revocation store. Simplejwt calls
+    `blacklist()` on the old token when rotating it; two refreshes with the
+    same token race on the unique jti, so only one of them gets a new token.
+    """
+
+    def verify(self):
+        super().verify()
+        if is_revoked(self[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is revoked"))
+
+    def outstand(self):
+        # Only revoked tokens are stored, not every issued one
+        return None
+
+    def blacklist(self):
+        expires_at = datetime_from_epoch(self["exp"])
+        if not revoke(self[api_settings.JTI_CLAIM], expires_at):
+            raise TokenError(_("Token is revoked"))
@@ -1,16 +1,20 @@
 from django.urls import path
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
+from users.views import (
+    CreateUserView,
+    ManageUserView,
+    ProvisionUsersView,
+    ThrottledTokenObtainPairView,
+    ThrottledTokenRefreshView,
+    ThrottledTokenRevokeView,
 )
 
-from users.views import CreateUserView, ManageUserView
-
 urlpatterns = [
     path("", CreateUserView.as_view(), name="create"),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
+    path("token/", ThrottledTokenObtainPairView.as_view(), name="token_obtain_pair"),
+    path("token/refresh/", ThrottledTokenRefreshView.as_view(), name="token_refresh"),
+    path("token/revoke/", ThrottledTokenRevokeView.as_view(), name="token_revoke"),
     path("me/", ManageUserView.as_view(), name="manage"),
+    path("bulk/", ProvisionUsersView.as_view(), name="bulk"),
 ]
 
 app_name = "users"
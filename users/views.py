@@ -1,18 +1,91 @@
-from rest_framework import generics
-from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework import generics, status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from rest_framework_simplejwt.views import (
+    TokenBlacklistView,
+    TokenObtainPairView,
+    TokenRefreshView,
+)
 
-from users.serializers import UserSerializer
+from users.provisioning import provision_users, provisioning_pool
+from users.receivers import ME_CACHE_KEY
+from users.serializers import (
+    UserProvisioningResultSerializer,
+    UserProvisioningSerializer,
+    UserSerializer,
+)
+from utils.cache_control import CacheControlMixin
+from utils.schema import extend_schema
 
 
 class CreateUserView(generics.CreateAPIView):
     serializer_class = UserSerializer
 
 
-class ManageUserView(generics.RetrieveUpdateAPIView):
+# Authenticated from the token alone: reads come from the cache without a
+# user query, the user is loaded (and must be active) on a cache miss or write.
+@extend_schema(auth=[{"jwtAuth": []}])
+class ManageUserView(CacheControlMixin, generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (JWTStatelessUserAuthentication,)
     permission_classes = (IsAuthenticated,)
+    cache_control_policy = "private"
 
     def get_object(self):
-        return self.request.user
+        user = (
+            get_user_model()
+            .objects.filter(pk=self.request.user.pk, is_active=True)
+            .first()
+        )
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        return user
+
+    def retrieve(self, request, *args, **kwargs):
+        key = ME_CACHE_KEY.format(pk=request.user.pk)
+        data = cache.get(key)
+        if data is None:
+            data = self.get_serializer(self.get_object()).data
+            cache.set(key, data, settings.USER_CACHE_SECONDS)
+        return Response(data)
+
+
+class ProvisionUsersView(generics.GenericAPIView):
+    """Create many accounts at once, e.g. to onboard a school or a company."""
+
+    serializer_class = UserProvisioningSerializer
+    permission_classes = (IsAdminUser,)
+
+    @extend_schema(responses={201: UserProvisioningResultSerializer})
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        created, skipped = provision_users(
+            serializer.validated_data["users"],
+            executor=provisioning_pool,
+            branch=serializer.validated_data.get("branch"),
+        )
+        result = UserProvisioningResultSerializer(
+            {"created": created, "skipped": skipped}
+        )
+        return Response(result.data, status=status.HTTP_201_CREATED)
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_scope = "token"
+
+
+class ThrottledTokenRefreshView(TokenRefreshView):
+    throttle_scope = "token"
+
+
+class ThrottledTokenRevokeView(TokenBlacklistView):
+    """Takes a refresh token and revokes it, e.g. on logout."""
+
+    throttle_scope = "token"
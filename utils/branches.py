@@ -0,0 +1,36 @@
+from rest_framework.exceptions import ValidationError
+
+from library_service.db_router import using_branch
+from utils.schema import OpenApiParameter, OpenApiTypes
+
+BRANCH_PARAMETER = OpenApiParameter(
+    "branch",
+    type=OpenApiTypes.INT,
+    description="Only show data of this branch id, read from its database. Use ?branch=1",
+)
+
+
+# Scope a view to the branch given in `?branch=`: querysets passed through
+# `filter_by_branch` only return its rows, and books and borrowings without
+# an instance at hand are routed to the branch's database for the request.
+class BranchScopedMixin:
+    branch_id = None
+
+    def dispatch(self, request, *args, **kwargs):
+        branch = request.GET.get("branch", "").strip()
+        # isdigit() accepts digits such as "²" that int() rejects
+        self.branch_id = (
+            int(branch) if branch.isascii() and branch.isdecimal() else None
+        )
+        with using_branch(self.branch_id):
+            return super().dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.query_params.get("branch", "").strip() and self.branch_id is None:
+            raise ValidationError({"branch": "Branch must be a positive integer id."})
+
+    def filter_by_branch(self, queryset):
+        if self.branch_id is None:
+            return queryset
+        return queryset.filter(branch_id=self.branch_id)
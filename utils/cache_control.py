@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from rest_framework.permissions import SAFE_METHODS
+
+
+# Set Cache-Control and Vary on successful safe-method responses of a view.
+# The view names one of settings.CACHE_CONTROL_POLICIES in `cache_control_policy`,
+# each policy has directives for anonymous and authenticated requests.
+# (A comment rather than a docstring: view docstrings end up in the API docs.)
+class CacheControlMixin:
+    cache_control_policy = None
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+
+        if (
+            self.cache_control_policy is None
+            or request.method not in SAFE_METHODS
+            or response.status_code != 200
+        ):
+            return response
+
+        policy = settings.CACHE_CONTROL_POLICIES[self.cache_control_policy]
+        audience = "authenticated" if request.user.is_authenticated else "anonymous"
+        patch_cache_control(response, **policy[audience])
+        patch_vary_headers(response, policy.get("vary", ()))
+        return response
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.core.checks import Error
+
+LOCAL_CACHE_BACKENDS = ("django.core.cache.backends.locmem.LocMemCache",)
+
+
+def shared_cache_check(app_configs, **kwargs):
+    """
+    Deploy check: cached data is invalidated in the cache it was written to,
+    with several worker processes a per-process cache serves stale copies.
+    """
+    backend = settings.CACHES["default"]["BACKEND"]
+    if backend not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [
+        Error(
+            "The default cache is local to each process.",
+            hint=(
+                "Set CACHE_BACKEND and CACHE_LOCATION to a cache shared by every "
+                "process, e.g. Redis, so that invalidating /api/users/me/, the "
+                "analytics dashboards warmed by the scheduler and the notification "
+                "rate limits reach all of them."
+            ),
+            id="library_service.E001",
+        )
+    ]
@@ -0,0 +1,46 @@
+import gzip
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional
+    zstandard = None
+
+
+def compress_gzip(content, level):
+    return gzip.compress(content, compresslevel=level, mtime=0)
+
+
+def compress_brotli(content, level):
+    return brotli.compress(content, quality=level)
+
+
+def compress_zstd(content, level):
+    return zstandard.ZstdCompressor(level=level).compress(content)
+
+
+# Content-Encoding -> (compressor, whether its library is installed)
+COMPRESSORS = {
+    "br": (compress_brotli, brotli is not None),
+    "zstd": (compress_zstd, zstandard is not None),
+    "gzip": (compress_gzip, True),
+}
+
+
+def available_encodings(preferred):
+    """Filter the preferred encodings down to the ones that can be produced."""
+    return [
+        encoding
+        for encoding in preferred
+        if encoding in COMPRESSORS and COMPRESSORS[encoding][1]
+    ]
+
+
+def compress(content, encoding, level):
+    """Compress content with the given Content-Encoding."""
+    compressor, _ = COMPRESSORS[encoding]
+    return compressor(content, level)
@@ -0,0 +1,101 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from utils.schema import OpenApiParameter, OpenApiTypes
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+IDEMPOTENCY_KEY_PARAMETER = OpenApiParameter(
+    IDEMPOTENCY_HEADER,
+    type=OpenApiTypes.STR,
+    location=OpenApiParameter.HEADER,
+    description=(
+        "Unique key of this request. Retrying with the same key returns "
+        "the stored response instead of repeating the action."
+    ),
+)
+
+
+def _fingerprint(request):
+    body = json.dumps(request.data, sort_keys=True, default=str)
+    return hashlib.sha256(
+        f"{request.method} {request.path} {body}".encode()
+    ).hexdigest()
+
+
+def _replay(stored, fingerprint):
+    if stored["fingerprint"] != fingerprint:
+        return Response(
+            {"detail": f"{IDEMPOTENCY_HEADER} was already used for another request."},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+    return Response(
+        stored["data"], status=stored["status"], headers={REPLAYED_HEADER: "true"}
+    )
+
+
+def idempotent(view_method):
+    """
+    Make a view method safe to retry with an `Idempotency-Key` header.
+
+    The first response (unless a server error) is stored per user and key for
+    IDEMPOTENCY_KEY_TTL seconds and replayed for retries of the same request.
+    A duplicate arriving while the first is running gets 409, a reused key
+    with a different method, path or body gets 422.
+    """
+
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        key = request.headers.get(IDEMPOTENCY_HEADER)
+        if key is None:
+            return view_method(self, request, *args, **kwargs)
+        if not key or len(key) > 255:
+            return Response(
+                {"detail": f"{IDEMPOTENCY_HEADER} must be 1 to 255 characters."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        scope = hashlib.sha256(f"{request.user.pk}:{key}".encode()).hexdigest()
+        cache_key = f"idempotency:{scope}"
+        lock_key = f"{cache_key}:lock"
+        fingerprint = _fingerprint(request)
+
+        stored = cache.get(cache_key)
+        if stored is not None:
+            return _replay(stored, fingerprint)
+
+        if not cache.add(lock_key, True, settings.IDEMPOTENCY_LOCK_SECONDS):
+            return Response(
+                {"detail": "A request with this key is still in progress."},
+                status=status.HTTP_409_CONFLICT,
+                headers={"Retry-After": "1"},
+            )
+        try:
+            # The first request may have finished between the get and the add
+            stored = cache.get(cache_key)
+            if stored is not None:
+                return _replay(stored, fingerprint)
+
+            response = view_method(self, request, *args, **kwargs)
+            if response.status_code < 500:
+                cache.set(
+                    cache_key,
+                    {
+                        "fingerprint": fingerprint,
+                        "status": response.status_code,
+                        "data": response.data,
+                    },
+                    settings.IDEMPOTENCY_KEY_TTL,
+                )
+            return response
+        finally:
+            cache.delete(lock_key)
+
+    return wrapper
@@ -0,0 +1,123 @@
+import copy
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from django.conf import settings
+from django.db import connections
+
+# Attributes every LogRecord has, anything else came in through `extra`
+RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {
+    "message",
+    "asctime",
+}
+
+slow_query_logger = logging.getLogger("library_service.db.slow")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the `extra` fields of the record."""
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class QueueStreamHandler(QueueHandler):
+    """
+    Put records on an in-memory queue; a listener thread formats them and
+    writes them to `stream`, so request threads never wait on log I/O.
+    """
+
+    def __init__(self, stream=None):
+        super().__init__(queue.SimpleQueue())
+        self.target = logging.StreamHandler(stream)
+        self.listener = None
+        self.pid = None
+        self.listener_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Formatting happens on the listener thread
+        self.target.setFormatter(fmt)
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        # Threads don't survive a fork, start a listener in every worker
+        if self.pid != os.getpid():
+            self.start_listener()
+        super().enqueue(record)
+
+    def start_listener(self):
+        with self.listener_lock:
+            if self.pid == os.getpid():
+                return
+            self.listener = QueueListener(self.queue, self.target)
+            self.listener.start()
+            self.pid = os.getpid()
+
+    def close(self):
+        # Called by logging.shutdown() at exit, writes out what is queued
+        with self.listener_lock:
+            if self.listener is not None and self.pid == os.getpid():
+                self.listener.stop()
+            self.listener = None
+            self.pid = None
+        super().close()
+
+
+class QueryLogger:
+    """
+    Count the queries run on every connection while active and log the
+    ones slower than SLOW_QUERY_MS.
+    """
+
+    def __init__(self):
+        self.count = 0
+
+    def __enter__(self):
+        self.connections = list(connections.all())
+        for connection in self.connections:
+            connection.execute_wrappers.append(self)
+        return self
+
+    def __exit__(self, *exc_info):
+        for connection in self.connections:
+            connection.execute_wrappers.remove(self)
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if duration_ms >= settings.SLOW_QUERY_MS:
+                slow_query_logger.warning(
+                    "Slow query",
+                    extra={
+                        "database": context["connection"].alias,
+                        "sql": sql,
+                        "duration_ms": round(duration_ms, 2),
+                        "many": many,
+                    },
+                )
@@ -0,0 +1,236 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimited(Exception):
+    """The channel refused a message, retry after `retry_after` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"Rate limited, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class Transport:
+    """Channel that delivers a notification text, subclasses implement `send`."""
+
+    # Longest message the channel accepts, None for no limit
+    max_length = None
+
+    def send(self, text):
+        raise NotImplementedError
+
+
+class TelegramTransport(Transport):
+    max_length = 4096
+
+    def __init__(self, token, chat_id, api_url="https://api.telegram.org", timeout=5):
+        self.url = f"{api_url}/bot{token}/sendMessage"
+        self.chat_id = chat_id
+        self.timeout = timeout
+
+    def send(self, text):
+        # requests is slow to import, only load it when a message is sent
+        import requests
+
+        # Plain text: emails and titles often break Markdown parsing
+        response = requests.post(
+            self.url, json={"chat_id": self.chat_id, "text": text}, timeout=self.timeout
+        )
+        if response.status_code == 429:
+            retry_after = response.json().get("parameters", {}).get("retry_after", 1)
+            raise RateLimited(retry_after)
+        response.raise_for_status()
+
+
+class WebhookTransport(Transport):
+    """POST `{"text": ...}` as JSON to a URL, e.g. a Slack-compatible hook."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, text):
+        import requests
+
+        response = requests.post(self.url, json={"text": text}, timeout=self.timeout)
+        if response.status_code == 429:
+            raise RateLimited(float(response.headers.get("Retry-After", 1)))
+        response.raise_for_status()
+
+
+class LogTransport(Transport):
+    def __init__(self, logger_name="library_service.notifications"):
+        self.logger = logging.getLogger(logger_name)
+
+    def send(self, text):
+        self.logger.info(text)
+
+
+class SharedRateLimit:
+    """
+    Allow `rate` messages per `per` seconds across every process, with the
+    sliding-window counter of utils.throttling kept in the default cache:
+    one counter per fixed window, the previous window's count weighted by
+    how much of it the sliding window still covers. Without a shared cache
+    each process gets the whole rate.
+    """
+
+    def __init__(self, name, rate, per=60.0, clock=time.time):
+        self.key = f"notifier-rate:{name}"
+        self.rate = rate
+        self.per = per
+        self.clock = clock
+
+    def acquire(self):
+        """Count a message, or return the seconds until one may be sent."""
+        window, elapsed = divmod(self.clock() / self.per, 1)
+        current_key = f"{self.key}:{int(window)}"
+
+        # Both windows must outlive the next one, which reads this as previous
+        if cache.add(current_key, 1, self.per * 2):
+            current = 1
+        else:
+            current = cache.incr(current_key)
+        previous = cache.get(f"{self.key}:{int(window) - 1}", 0)
+
+        estimate = previous * (1 - elapsed) + current
+        if estimate <= self.rate:
+            return 0
+
+        # Messages that have to wait don't use up the rate
+        cache.decr(current_key)
+        remaining = self.per * (1 - elapsed)
+        if not previous:
+            return remaining
+        return min(remaining, (estimate - self.rate) / previous * self.per)
+
+
+def build_digest(events, max_length=None):
+    """Join events into as few messages as fit in max_length characters."""
+    if len(events) == 1:
+        parts = list(events)
+    else:
+        parts = [f"{len(events)} new notifications:", *events]
+
+    messages = []
+    for part in parts:
+        if max_length:
+            part = part[:max_length]
+        if messages and (
+            not max_length or len(messages[-1]) + 2 + len(part) <= max_length
+        ):
+            messages[-1] = f"{messages[-1]}\n\n{part}"
+        else:
+            messages.append(part)
+    return messages
+
+
+class Notifier:
+    """
+    Collect events for `window` seconds, then send them as one digest to
+    every channel. A channel may have a SharedRateLimit: sending waits until
+    the rate allows a message, and events arriving meanwhile go into the
+    next digest. Each process sends its own digests, the rate limit counts
+    the messages of every process.
+    """
+
+    def __init__(self, channels, window):
+        self.channels = channels  # (transport, rate limit or None) pairs
+        self.window = window
+        self.events = []
+        self.lock = threading.Lock()
+        self.sending = threading.Lock()
+        self.timer = None
+
+    def notify(self, text):
+        if not self.channels:
+            return
+        with self.lock:
+            self.events.append(text)
+            if self.timer is None:
+                self.timer = threading.Timer(self.window, self.flush)
+                self.timer.daemon = True
+                self.timer.start()
+
+    def flush(self):
+        """Send the collected events now, one digest at a time."""
+        with self.sending:
+            with self.lock:
+                events, self.events = self.events, []
+                if self.timer is not None:
+                    self.timer.cancel()
+                    self.timer = None
+            if not events:
+                return
+
+            for transport, limit in self.channels:
+                for message in build_digest(events, transport.max_length):
+                    self._send(transport, limit, message)
+
+    def _send(self, transport, limit, message, attempts=2):
+        for _ in range(attempts):
+            while limit is not None and (wait := limit.acquire()):
+                time.sleep(wait)
+            try:
+                transport.send(message)
+                return
+            except RateLimited as exc:
+                time.sleep(exc.retry_after)
+            except Exception:
+                logger.exception(
+                    "Sending a notification via %s failed", type(transport).__name__
+                )
+                return
+        logger.error(
+            "Dropped a notification, %s kept rate limiting", type(transport).__name__
+        )
+
+
+def notifier_from_settings():
+    channels = []
+    for name in settings.NOTIFICATION_CHANNELS:
+        if name == "telegram":
+            transport = TelegramTransport(
+                settings.TELEGRAM_BOT_TOKEN, settings.TELEGRAM_CHAT_ID
+            )
+            channels.append(
+                (
+                    transport,
+                    SharedRateLimit("telegram", settings.TELEGRAM_MESSAGES_PER_MINUTE),
+                )
+            )
+        elif name == "webhook":
+            transport = WebhookTransport(settings.NOTIFICATION_WEBHOOK_URL)
+            channels.append(
+                (
+                    transport,
+                    SharedRateLimit("webhook", settings.WEBHOOK_MESSAGES_PER_MINUTE),
+                )
+            )
+        elif name == "log":
+            channels.append((LogTransport(), None))
+        else:
+            raise ValueError(f"Unknown notification channel: {name}")
+    return Notifier(channels, settings.NOTIFICATION_DIGEST_SECONDS)
+
+
+_notifier = None
+_notifier_lock = threading.Lock()
+
+
+def notify(text):
+    """Queue a notification for admins, sent with the next digest."""
+    global _notifier
+    with _notifier_lock:
+        if _notifier is None:
+            _notifier = notifier_from_settings()
+            # Don't lose the last events when the process exits
+            atexit.register(_notifier.flush)
+    _notifier.notify(text)
@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator for big tables: an unfiltered Postgres queryset is counted
+    from the planner's row estimate instead of a full COUNT(*).
+    """
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None or query.where:
+            return super().count
+
+        connection = connections[self.object_list.db]
+        if connection.vendor != "postgresql":
+            return super().count
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [self.object_list.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+
+        # Small or never analyzed (-1) tables are cheap enough to count
+        estimate = row[0] if row else -1
+        if estimate < settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+            return super().count
+        return estimate
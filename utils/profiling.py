@@ -0,0 +1,179 @@
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.db import connections
+
+SPEEDSCOPE_SCHEMA = "https://www.speedscope.app/file-format-schema.json"
+
+
+class StackSampler:
+    """
+    Sample the call stack of one thread every `interval` seconds from a
+    background thread, so the profiled code runs without instrumentation.
+    """
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = []  # (stack as root-first frame tuple, seconds) pairs
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        last = time.perf_counter()
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            now = time.perf_counter()
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_name, code.co_filename, code.co_firstlineno))
+                frame = frame.f_back
+            self.samples.append((tuple(reversed(stack)), now - last))
+            last = now
+
+
+class QueryTimeline:
+    """Record every SQL query run while active, with its start and duration."""
+
+    def __init__(self, started):
+        self.started = started
+        self.queries = []  # (alias, sql, start, duration) in seconds
+
+    def __enter__(self):
+        self._wrappers = []
+        for connection in connections.all():
+            wrapper = self._wrapper(connection.alias)
+            connection.execute_wrappers.append(wrapper)
+            self._wrappers.append((connection, wrapper))
+        return self
+
+    def __exit__(self, *exc_info):
+        for connection, wrapper in self._wrappers:
+            connection.execute_wrappers.remove(wrapper)
+
+    def _wrapper(self, alias):
+        def record(execute, sql, params, many, context):
+            start = time.perf_counter()
+            try:
+                return execute(sql, params, many, context)
+            finally:
+                end = time.perf_counter()
+                self.queries.append((alias, sql, start - self.started, end - start))
+
+        return record
+
+
+class RequestProfile:
+    """Sampled stacks and SQL timeline of the code run inside the block."""
+
+    def __init__(self, name, interval):
+        self.name = name
+        self.interval = interval
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        self.sampler = StackSampler(threading.get_ident(), self.interval)
+        self.timeline = QueryTimeline(self.started).__enter__()
+        self.sampler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.sampler.stop()
+        self.timeline.__exit__(*exc_info)
+        self.duration = time.perf_counter() - self.started
+
+    def collapsed(self):
+        """Stacks in the collapsed format of flamegraph.pl, one per line."""
+        counts = Counter()
+        for stack, _ in self.sampler.samples:
+            counts[
+                ";".join(f"{name} ({file}:{line})" for name, file, line in stack)
+            ] += 1
+        return "".join(f"{stack} {count}\n" for stack, count in counts.items())
+
+    def speedscope(self):
+        """A speedscope file with a CPU profile and a SQL query timeline."""
+        frames, index = [], {}
+
+        def frame_id(name, file=None, line=None):
+            key = (name, file, line)
+            if key not in index:
+                index[key] = len(frames)
+                frames.append({"name": name, "file": file, "line": line})
+            return index[key]
+
+        samples = [
+            [frame_id(*frame) for frame in stack] for stack, _ in self.sampler.samples
+        ]
+        events = []
+        for alias, sql, start, duration in self.timeline.queries:
+            frame = frame_id(f"[{alias}] {sql[:300]}")
+            events.append({"type": "O", "frame": frame, "at": start * 1000})
+            events.append(
+                {"type": "C", "frame": frame, "at": (start + duration) * 1000}
+            )
+
+        end = self.duration * 1000
+        return {
+            "$schema": SPEEDSCOPE_SCHEMA,
+            "name": self.name,
+            "exporter": "library_service",
+            "shared": {"frames": frames},
+            "profiles": [
+                {
+                    "type": "sampled",
+                    "name": f"{self.name} (CPU)",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": end,
+                    "samples": samples,
+                    "weights": [seconds * 1000 for _, seconds in self.sampler.samples],
+                },
+                {
+                    "type": "evented",
+                    "name": f"{self.name} (SQL, {len(self.timeline.queries)} queries)",
+                    "unit": "milliseconds",
+                    "startValue": 0,
+                    "endValue": end,
+                    "events": events,
+                },
+            ],
+        }
+
+    def save(self, directory, max_files):
+        """
+        Write `<stem>.speedscope.json` and `<stem>.collapsed.txt`, then delete
+        the oldest profiles beyond max_files. Return the stem.
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        now = time.time_ns()
+        stem = time.strftime("%Y%m%d-%H%M%S", time.localtime(now // 10**9))
+        stem = f"{stem}-{now % 10**9:09d}"  # sorts by time
+
+        (directory / f"{stem}.speedscope.json").write_text(
+            json.dumps(self.speedscope())
+        )
+        (directory / f"{stem}.collapsed.txt").write_text(self.collapsed())
+
+        profiles = sorted(directory.glob("*.speedscope.json"))
+        for old in profiles[: max(len(profiles) - max_files, 0)]:
+            old_stem = old.name.removesuffix(".speedscope.json")
+            old.unlink(missing_ok=True)
+            (directory / f"{old_stem}.collapsed.txt").unlink(missing_ok=True)
+        return stem
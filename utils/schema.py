@@ -0,0 +1,46 @@
+"""
+The drf_spectacular annotations used by the views. drf_spectacular is slow
+to import, so with API_DOCS_ENABLED=False it isn't imported at all and the
+annotations below leave the views untouched.
+"""
+
+from django.conf import settings
+
+if settings.API_DOCS_ENABLED:
+    from drf_spectacular.types import OpenApiTypes
+    from drf_spectacular.utils import (
+        OpenApiParameter,
+        extend_schema,
+        extend_schema_view,
+        inline_serializer,
+    )
+else:
+
+    def extend_schema(*args, **kwargs):
+        return lambda view: view
+
+    def extend_schema_view(**kwargs):
+        return lambda view: view
+
+    def inline_serializer(*args, **kwargs):
+        return None
+
+    class OpenApiParameter:
+        QUERY, PATH, HEADER, COOKIE = "query", "path", "header", "cookie"
+
+        def __init__(self, *args, **kwargs):
+            pass
+
+    class _AnyType:
+        def __getattr__(self, name):
+            return name
+
+    OpenApiTypes = _AnyType()
+
+__all__ = [
+    "OpenApiParameter",
+    "OpenApiTypes",
+    "extend_schema",
+    "extend_schema_view",
+    "inline_serializer",
+]
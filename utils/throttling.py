@@ -0,0 +1,77 @@
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Sliding-window counter: instead of a list of timestamps per client, keep
+    one counter per fixed window and weight the previous window's count by
+    how much of it still overlaps the sliding window.
+
+    Memory is two integers per client and counting is an atomic cache
+    `add`/`incr`, so concurrent workers can't lose each other's requests.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.now = self.timer()
+        window, self.elapsed = divmod(self.now / self.duration, 1)
+        current_key = f"{self.key}:{int(window)}"
+
+        # Both windows must outlive the next one, which reads this as previous
+        if self.cache.add(current_key, 1, self.duration * 2):
+            current = 1
+        else:
+            current = self.cache.incr(current_key)
+        self.previous = self.cache.get(f"{self.key}:{int(window) - 1}", 0)
+
+        self.estimate = self.previous * (1 - self.elapsed) + current
+        if self.estimate > self.num_requests:
+            # Rejected requests don't use up the client's allowance
+            self.cache.decr(current_key)
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def wait(self):
+        """Seconds until the previous window has slid out far enough."""
+        remaining_duration = self.duration * (1 - self.elapsed)
+        if not self.previous:
+            return remaining_duration
+
+        excess = self.estimate - self.num_requests
+        return min(remaining_duration, excess / self.previous * self.duration)
+
+
+class ScopedThrottle(ScopedRateThrottle, SlidingWindowThrottle):
+    """Own bucket per `throttle_scope` of the view, e.g. catalog or borrow."""
+
+
+class AnonThrottle(AnonRateThrottle, SlidingWindowThrottle):
+    """Anonymous requests to views without a `throttle_scope`."""
+
+    def get_cache_key(self, request, view):
+        if getattr(view, ScopedThrottle.scope_attr, None):
+            return None
+        return super().get_cache_key(request, view)
+
+
+class UserThrottle(UserRateThrottle, SlidingWindowThrottle):
+    """Authenticated requests to views without a `throttle_scope`."""
+
+    def get_cache_key(self, request, view):
+        if getattr(view, ScopedThrottle.scope_attr, None):
+            return None
+        return super().get_cache_key(request, view)